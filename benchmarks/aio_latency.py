@@ -0,0 +1,112 @@
+"""Measure event loop responsiveness and small-request latency while an asyncio service parses mixed file sizes.
+
+Small requests arrive at a steady rate while a burst of large files is uploaded. Each strategy is measured by the lag
+of a heartbeat coroutine, i.e. how long the event loop was blocked, and by the latency of the small requests.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.aio_latency``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from benchmarks.corpus import build_source
+from tree_sitter_language_pack import AsyncParseExecutor, get_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from tree_sitter import Tree
+
+    Parse = Callable[[bytes], Awaitable[Tree]]
+
+HEARTBEAT_INTERVAL = 0.001
+
+
+async def parse_blocking(source: bytes) -> Tree:
+    """Parse on the event loop thread, as a coroutine calling the parser directly does."""
+    return get_parser("python").parse(source)
+
+
+async def parse_to_thread(source: bytes) -> Tree:
+    """Parse on the default executor of the event loop, with a new parser per request."""
+    return await asyncio.to_thread(lambda: get_parser("python").parse(source))
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes a coroutine that sleeps for a fixed interval."""
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(perf_counter() - start - HEARTBEAT_INTERVAL)
+
+
+async def run_workload(parse: Parse, small: bytes, large: bytes, args: argparse.Namespace) -> tuple[list[float], ...]:
+    """Run the workload with a parse strategy.
+
+    Returns:
+        The heartbeat lags and the latencies of the small requests, in seconds.
+    """
+    lags: list[float] = []
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(lags, stop))
+
+    async def small_request(start: float) -> None:
+        await parse(small)
+        latencies.append(perf_counter() - start)
+
+    large_requests = [asyncio.create_task(parse(large)) for _ in range(args.large_files)]
+    small_requests = []
+    for _ in range(args.small_requests):
+        small_requests.append(asyncio.create_task(small_request(perf_counter())))
+        await asyncio.sleep(args.interval)
+    await asyncio.gather(*small_requests, *large_requests)
+
+    stop.set()
+    await heartbeat_task
+    return lags, latencies
+
+
+def percentiles(values: list[float]) -> str:
+    """Format the p50, p99 and maximum of a list of durations in milliseconds."""
+    cuts = quantiles(values, n=100)
+    return f"{cuts[49] * 1000:>7.2f} {cuts[98] * 1000:>8.2f} {max(values) * 1000:>8.2f}"
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark event loop responsiveness of async parsing.")
+    parser.add_argument("--small-size", type=int, default=4 * 1024, help="Size of the small files in bytes")
+    parser.add_argument("--large-size", type=int, default=4 * 1024 * 1024, help="Size of the large files in bytes")
+    parser.add_argument("--large-files", type=int, default=8, help="Number of large files uploaded in a burst")
+    parser.add_argument("--small-requests", type=int, default=200, help="Number of small requests")
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between small requests")
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads of the AsyncParseExecutor")
+    args = parser.parse_args()
+
+    small = build_source("python", args.small_size)
+    large = build_source("python", args.large_size)
+    executor = AsyncParseExecutor(workers=args.workers, large_source_bytes=args.large_size // 2)
+    strategies: dict[str, Parse] = {
+        "blocking": parse_blocking,
+        "to_thread": parse_to_thread,
+        "AsyncParseExecutor": lambda source: executor.parse("python", source),
+    }
+
+    print(f"{'':<20} {'loop lag (ms)':^26} {'small request latency (ms)':^26}")
+    print(f"{'strategy':<20} {'p50':>7} {'p99':>8} {'max':>8} {'p50':>7} {'p99':>8} {'max':>8} {'total':>8}")
+    for name, parse in strategies.items():
+        start = perf_counter()
+        lags, latencies = asyncio.run(run_workload(parse, small, large, args))
+        elapsed = perf_counter() - start
+        print(f"{name:<20} {percentiles(lags)} {percentiles(latencies)} {elapsed:>7.2f}s")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
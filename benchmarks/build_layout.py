@@ -0,0 +1,100 @@
+"""Measure the size and first-load latency of the built language bindings.
+
+Build the extensions with ``TSLP_BUILD_MODE=split`` (the default) or ``TSLP_BUILD_MODE=combined`` and run
+``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.build_layout`` after each build to compare the layouts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+from statistics import median
+
+import tree_sitter_language_pack
+
+bindings_directory = Path(tree_sitter_language_pack.__file__).parent / "bindings"
+
+LOAD_SCRIPT = """
+import json, sys
+from time import perf_counter
+start = perf_counter()
+from tree_sitter_language_pack import get_language
+import_time = perf_counter() - start
+for name in sys.argv[1:]:
+    get_language(name)
+print(json.dumps({"import": import_time, "load": perf_counter() - start - import_time, "languages": len(sys.argv) - 1}))
+"""
+
+
+def measure_first_load(language_names: list[str], runs: int) -> dict[str, float]:
+    """Measure the time to import the package and load the given languages in a fresh interpreter.
+
+    Args:
+        language_names: The names of the languages to load.
+        runs: The number of interpreters to start. The median is reported.
+
+    Returns:
+        The median import and load times in milliseconds and the number of loaded languages.
+    """
+    samples = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", LOAD_SCRIPT, *language_names], capture_output=True, check=True, text=True
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return {
+        "import_ms": median(sample["import"] for sample in samples) * 1000,
+        "load_ms": median(sample["load"] for sample in samples) * 1000,
+        "languages": samples[0]["languages"],
+    }
+
+
+def available_languages() -> list[str]:
+    """Get the names of the languages that can be loaded from the built bindings.
+
+    Returns:
+        The language names.
+    """
+    language_names = []
+    for language_name in tree_sitter_language_pack.SupportedLanguage.__args__:  # type: ignore[attr-defined]
+        try:
+            tree_sitter_language_pack.get_binding(language_name)
+        except LookupError:
+            continue
+        language_names.append(language_name)
+    return language_names
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Measure the size and load latency of the built bindings.")
+    parser.add_argument("--runs", type=int, default=10, help="Number of fresh interpreters for the load measurement")
+    args = parser.parse_args()
+
+    binaries = sorted(path for path in bindings_directory.iterdir() if path.suffix in {".so", ".pyd"})
+    if not binaries:
+        sys.exit("No built bindings found, build the extensions first")
+
+    on_disk = sum(path.stat().st_size for path in binaries)
+    # Wheels are zip archives with deflate compression, so this approximates the contribution to the wheel size.
+    compressed = sum(len(zlib.compress(path.read_bytes(), 6)) for path in binaries)
+    combined = any(path.name.startswith("_combined.") for path in binaries)
+    load = measure_first_load(available_languages(), args.runs)
+
+    print(f"layout:               {'combined' if combined else 'split'}")
+    print(f"shared objects:       {len(binaries)}")
+    print(f"on-disk size:         {on_disk / 1024 / 1024:.2f} MB")
+    print(f"compressed size:      {compressed / 1024 / 1024:.2f} MB")
+    print(f"package import:       {load['import_ms']:.2f} ms")
+    print(f"first load (all):     {load['load_ms']:.2f} ms for {load['languages']} languages")
+    print(f"first load (per lang) {load['load_ms'] / max(1, load['languages']):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
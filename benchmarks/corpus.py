@@ -0,0 +1,246 @@
+"""Small representative source snippets used to build benchmark corpora."""
+
+from __future__ import annotations
+
+from itertools import cycle, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from tree_sitter_language_pack import SupportedLanguage
+
+SNIPPETS: dict[SupportedLanguage, bytes] = {
+    "python": b'''import os
+
+
+class Greeter:
+    """Greets people."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def greet(self, times: int = 1) -> list[str]:
+        return [f"Hello, {self.name}!" for _ in range(times)]
+
+
+def main() -> None:
+    greeter = Greeter(os.environ.get("USER", "world"))
+    for line in greeter.greet(3):
+        print(line)
+''',
+    "javascript": b"""import { readFile } from "node:fs/promises";
+
+export class Greeter {
+  constructor(name) {
+    this.name = name;
+  }
+
+  greet(times = 1) {
+    return Array.from({ length: times }, () => `Hello, ${this.name}!`);
+  }
+}
+
+async function main() {
+  const config = JSON.parse(await readFile("config.json", "utf8"));
+  for (const line of new Greeter(config.user ?? "world").greet(3)) {
+    console.log(line);
+  }
+}
+
+main().catch((error) => console.error(error));
+""",
+    "go": b"""package main
+
+import (
+\t"fmt"
+\t"os"
+)
+
+type Greeter struct {
+\tName string
+}
+
+func (g Greeter) Greet(times int) []string {
+\tlines := make([]string, 0, times)
+\tfor i := 0; i < times; i++ {
+\t\tlines = append(lines, fmt.Sprintf("Hello, %s!", g.Name))
+\t}
+\treturn lines
+}
+
+func main() {
+\tfor _, line := range (Greeter{Name: os.Getenv("USER")}).Greet(3) {
+\t\tfmt.Println(line)
+\t}
+}
+""",
+    "json": b"""{
+  "name": "example",
+  "version": "1.0.0",
+  "dependencies": {"left-pad": "^1.3.0", "lodash": "^4.17.21"},
+  "scripts": {"build": "tsc -p .", "test": "jest --coverage"},
+  "keywords": ["example", "benchmark", "tree-sitter"],
+  "private": true,
+  "workspaces": [{"path": "packages/a", "enabled": true}, {"path": "packages/b", "enabled": false}]
+}
+""",
+    "css": b"""@media (max-width: 600px) {
+  .container > .item:hover {
+    color: #336699;
+    margin: 0 auto !important;
+  }
+}
+
+:root {
+  --accent: rgb(10 20 30 / 50%);
+}
+
+body {
+  font-family: "Inter", sans-serif;
+  background: linear-gradient(to right, var(--accent), white);
+}
+""",
+    "yaml": b"""name: CI
+on:
+  push:
+    branches: [main]
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    strategy:
+      matrix:
+        python: ["3.10", "3.11", "3.12"]
+    steps:
+      - uses: actions/checkout@v4
+      - name: Run tests
+        run: |
+          uv sync
+          uv run pytest
+""",
+    "csharp": b"""using System;
+using System.Collections.Generic;
+
+namespace Example
+{
+    public sealed class Greeter
+    {
+        public Greeter(string name) => Name = name;
+
+        public string Name { get; }
+
+        public IEnumerable<string> Greet(int times = 1)
+        {
+            for (var i = 0; i < times; i++)
+            {
+                yield return $"Hello, {Name}!";
+            }
+        }
+    }
+}
+""",
+}
+
+
+CORPORA_DIR = Path(__file__).parent / "corpora"
+"""Representative sources of further languages, one ``<language>.txt`` file per language."""
+
+
+def corpus_languages() -> list[SupportedLanguage]:
+    """Get the languages that have a snippet, either above or in ``CORPORA_DIR``.
+
+    Returns:
+        The names of the languages, sorted.
+    """
+    return sorted({*SNIPPETS, *(cast("SupportedLanguage", path.stem) for path in CORPORA_DIR.glob("*.txt"))})
+
+
+def get_snippet(language_name: SupportedLanguage) -> bytes:
+    """Get the snippet of a language.
+
+    Args:
+        language_name: The name of the language.
+
+    Raises:
+        KeyError: If the language has no snippet.
+
+    Returns:
+        The snippet.
+    """
+    snippet = SNIPPETS.get(language_name)
+    if snippet is not None:
+        return snippet
+    path = CORPORA_DIR / f"{language_name}.txt"
+    if not path.is_file():
+        raise KeyError(language_name)
+    return path.read_bytes()
+
+
+def build_source(language_name: SupportedLanguage, size: int) -> bytes:
+    """Build a source of roughly the given size by repeating the language's snippet.
+
+    Args:
+        language_name: The name of the language.
+        size: The minimum size of the source in bytes.
+
+    Returns:
+        The source.
+    """
+    snippet = get_snippet(language_name)
+    return snippet * max(1, -(-size // len(snippet)))
+
+
+def mixed_corpus(
+    language_names: list[SupportedLanguage], files: int, size: int
+) -> list[tuple[SupportedLanguage, bytes]]:
+    """Build a corpus that cycles through the given languages.
+
+    Args:
+        language_names: The names of the languages to include.
+        files: The number of files in the corpus.
+        size: The approximate size of each file in bytes.
+
+    Returns:
+        The ``(language, source)`` pairs of the corpus.
+    """
+    sources = {language_name: build_source(language_name, size) for language_name in language_names}
+    return [(language_name, sources[language_name]) for language_name in islice(cycle(language_names), files)]
+
+
+LARGE_INPUT_ROWS: dict[SupportedLanguage, tuple[bytes, bytes, bytes]] = {
+    "csv": (b"id,name,email,amount,created_at\n", b'{i},user{i},"user{i}@example.com",{i}.50,2024-01-01\n', b""),
+    "json": (
+        b"[\n",
+        b'  {"id": {i}, "name": "user{i}", "tags": ["a", "b"], "active": true, "score": {i}.5},\n',
+        b"  {}\n]\n",
+    ),
+    "sql": (
+        b"CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, amount NUMERIC);\n",
+        b"INSERT INTO users (id, name, email, amount) VALUES ({i}, 'user{i}', 'user{i}@example.com', {i}.50);\n",
+        b"",
+    ),
+    "javascript": (b"const rows = [\n", b'  { id: {i}, name: "user{i}", tags: ["a", "b"], score: {i}.5 },\n', b"];\n"),
+}
+"""The header, row template and footer of large generated inputs, such as data dumps and minified bundles."""
+
+
+def build_large_source(language_name: SupportedLanguage, size: int) -> bytes:
+    """Build a large generated source, such as a data dump, of roughly the given size.
+
+    Args:
+        language_name: The name of the language, one of the keys of ``LARGE_INPUT_ROWS``.
+        size: The minimum size of the source in bytes.
+
+    Returns:
+        The source.
+    """
+    header, row, footer = LARGE_INPUT_ROWS[language_name]
+    chunks = [header]
+    length = len(header)
+    i = 0
+    while length < size:
+        chunk = row.replace(b"{i}", str(i).encode())
+        chunks.append(chunk)
+        length += len(chunk)
+        i += 1
+    chunks.append(footer)
+    return b"".join(chunks)
@@ -0,0 +1,55 @@
+"""Measure the latency of single-keystroke edits to a large open document against parsing it from scratch.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.document_edit``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from statistics import median, quantiles
+from time import perf_counter
+from typing import cast
+
+from benchmarks.corpus import SNIPPETS, build_source
+from tree_sitter_language_pack import Document, SupportedLanguage, get_parser
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark incremental re-parsing of single-keystroke edits.")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of corpus languages (default: all)")
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="Approximate size of the document in bytes")
+    parser.add_argument("--edits", type=int, default=200, help="Number of keystrokes to measure")
+    args = parser.parse_args()
+
+    language_names = cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(SNIPPETS)
+    rng = random.Random(0)
+
+    print(f"{'language':<12} {'full parse':>11} {'p50 edit':>10} {'p95 edit':>10} {'max edit':>10}")
+    for language_name in language_names:
+        source = build_source(language_name, args.size)
+        start = perf_counter()
+        get_parser(language_name).parse(source)
+        full_parse = perf_counter() - start
+
+        document = Document(language_name, source)
+        document.reparse()
+
+        # Type at a random line, one character at a time, re-parsing after every keystroke
+        latencies = []
+        line = rng.randrange(source.count(b"\n"))
+        for column in range(args.edits):
+            start = perf_counter()
+            document.edit((line, column), (line, column), "x")
+            document.reparse()
+            latencies.append(perf_counter() - start)
+
+        print(
+            f"{language_name:<12} {full_parse * 1000:>9.2f}ms {median(latencies) * 1000:>8.3f}ms "
+            f"{quantiles(latencies, n=20)[-1] * 1000:>8.3f}ms {max(latencies) * 1000:>8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
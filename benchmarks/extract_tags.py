@@ -0,0 +1,160 @@
+"""Compare extract_tags with a hand-written Python walk over every node, the way symbol indexers are often written.
+
+By default the corpus is built from the benchmark snippets. Pass ``--path`` to index a real checkout instead, e.g. a
+monorepo; files are detected with ``detect_language`` and files of languages without a naive walker are skipped.
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.extract_tags``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from time import perf_counter
+from typing import TYPE_CHECKING, cast
+
+from benchmarks.corpus import mixed_corpus
+from tree_sitter_language_pack import (
+    SupportedLanguage,
+    available_languages,
+    detect_language,
+    extract_tags,
+    extract_tags_many,
+    get_parser,
+    has_tags,
+)
+
+if TYPE_CHECKING:
+    from tree_sitter import Node, Parser
+
+NAIVE_RULES: dict[SupportedLanguage, dict[str, tuple[str, str]]] = {
+    "python": {
+        "class_definition": ("definition.class", "name"),
+        "function_definition": ("definition.function", "name"),
+        "call": ("reference.call", "function"),
+    },
+    "javascript": {
+        "class_declaration": ("definition.class", "name"),
+        "function_declaration": ("definition.function", "name"),
+        "method_definition": ("definition.method", "name"),
+        "call_expression": ("reference.call", "function"),
+        "new_expression": ("reference.class", "constructor"),
+    },
+    "go": {
+        "function_declaration": ("definition.function", "name"),
+        "method_declaration": ("definition.method", "name"),
+        "type_spec": ("definition.type", "name"),
+        "call_expression": ("reference.call", "function"),
+    },
+}
+"""The node type, tag kind and name field of the definitions and references found by the naive walk."""
+
+QUALIFIED_NAME_TYPES = {"attribute", "member_expression", "selector_expression"}
+
+
+def naive_tags(language_name: SupportedLanguage, source: bytes, parsers: dict[SupportedLanguage, Parser]) -> int:
+    """Parse a source and collect its tags by recursing over every node in Python.
+
+    Args:
+        language_name: The name of the language.
+        source: The source.
+        parsers: Parsers by language name.
+
+    Returns:
+        The number of tags found.
+    """
+    rules = NAIVE_RULES[language_name]
+    tree = parsers[language_name].parse(source)
+    tags: list[tuple[str, str, int, int]] = []
+
+    def visit(node: Node) -> None:
+        rule = rules.get(node.type)
+        if rule is not None:
+            name_node = node.child_by_field_name(rule[1])
+            if name_node is not None and name_node.type in QUALIFIED_NAME_TYPES and name_node.named_child_count:
+                name_node = name_node.named_children[-1]
+            if name_node is not None:
+                name = source[name_node.start_byte : name_node.end_byte].decode("utf-8", "replace")
+                tags.append((rule[0], name, node.start_byte, node.end_byte))
+        for child in node.children:
+            visit(child)
+
+    visit(tree.root_node)
+    return len(tags)
+
+
+def load_checkout(path: str) -> list[tuple[SupportedLanguage, bytes]]:
+    """Read the files of a checkout whose languages have a naive walker.
+
+    Args:
+        path: The root directory of the checkout.
+
+    Returns:
+        The ``(language, source)`` pairs of the files.
+    """
+    corpus: list[tuple[SupportedLanguage, bytes]] = []
+    for directory, directory_names, file_names in os.walk(path):
+        directory_names[:] = [name for name in directory_names if not name.startswith(".") and name != "node_modules"]
+        for file_name in file_names:
+            file_path = os.path.join(directory, file_name)  # noqa: PTH118
+            if (language_name := detect_language(file_path)) in NAIVE_RULES:
+                with open(file_path, "rb") as file:  # noqa: PTH123
+                    corpus.append((cast("SupportedLanguage", language_name), file.read()))
+    return corpus
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark extract_tags against a naive Python node walk.")
+    parser.add_argument("--path", type=str, help="Index the files of this directory instead of a generated corpus")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of corpus languages (default: all)")
+    parser.add_argument("--files", type=int, default=600, help="Number of files in the generated corpus")
+    parser.add_argument("--size", type=int, default=16 * 1024, help="Approximate size of each generated file in bytes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker threads of the batch mode")
+    args = parser.parse_args()
+
+    language_names = [
+        language_name
+        for language_name in (
+            cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(NAIVE_RULES)
+        )
+        if language_name in available_languages() and has_tags(language_name)
+    ]
+    corpus = load_checkout(args.path) if args.path else mixed_corpus(language_names, args.files, args.size)
+    corpus = [(language_name, source) for language_name, source in corpus if language_name in language_names]
+    total_mb = sum(len(source) for _, source in corpus) / 1024 / 1024
+    print(f"corpus: {len(corpus)} files, {total_mb:.1f} MB, languages: {', '.join(language_names)}")
+
+    parsers = {language_name: get_parser(language_name) for language_name in language_names}
+    for language_name in language_names:
+        # Compile the tags queries up front, they are cached after the first use
+        extract_tags(language_name, b"")
+
+    def report(label: str, elapsed: float, tag_count: int, baseline: float | None = None) -> None:
+        speedup = f" {baseline / elapsed:>6.2f}x" if baseline else ""
+        print(
+            f"{label:<22} {elapsed:>7.2f}s {len(corpus) / elapsed:>9.0f} files/s {total_mb / elapsed:>7.1f} MB/s "
+            f"{tag_count:>9} tags{speedup}"
+        )
+
+    start = perf_counter()
+    tag_count = sum(naive_tags(language_name, source, parsers) for language_name, source in corpus)
+    baseline = perf_counter() - start
+    report("naive walk", baseline, tag_count)
+
+    start = perf_counter()
+    tag_count = sum(
+        len(extract_tags(language_name, source, parser=parsers[language_name])) for language_name, source in corpus
+    )
+    report("extract_tags", perf_counter() - start, tag_count, baseline)
+
+    start = perf_counter()
+    tag_count = 0
+    for result in extract_tags_many(corpus, workers=args.workers, ordered=False):
+        if result.tags is None:
+            raise cast("Exception", result.error)
+        tag_count += len(result.tags)
+    report(f"extract_tags_many x{args.workers}", perf_counter() - start, tag_count, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare computing per-file metrics by walking Node objects with computing them from a flattened tree.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.flatten_tree``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from time import perf_counter
+from typing import TYPE_CHECKING, cast
+
+from benchmarks.corpus import SNIPPETS, build_source
+from tree_sitter_language_pack import (
+    ERROR_KIND_ID,
+    NodeFlag,
+    SupportedLanguage,
+    flatten_tree,
+    get_kind_names,
+    get_parser,
+)
+
+if TYPE_CHECKING:
+    from tree_sitter import Node, Tree
+
+    from tree_sitter_language_pack import FlatTree
+
+
+def node_walk_metrics(tree: Tree) -> tuple[Counter[str], int, int]:
+    """Count the node kinds, the named nodes and the error nodes by recursing over Node objects.
+
+    Args:
+        tree: The tree.
+
+    Returns:
+        The node kind histogram, the number of named nodes and the number of error nodes.
+    """
+    kinds: Counter[str] = Counter()
+    named = 0
+    errors = 0
+
+    def visit(node: Node) -> None:
+        nonlocal named, errors
+        kinds[node.type] += 1
+        named += node.is_named
+        errors += node.is_error
+        for child in node.children:
+            visit(child)
+
+    visit(tree.root_node)
+    return kinds, named, errors
+
+
+def flat_tree_metrics(flat_tree: FlatTree, language_name: SupportedLanguage) -> tuple[Counter[str], int, int]:
+    """Count the node kinds, the named nodes and the error nodes from a flattened tree.
+
+    The aggregations run in C over the arrays, with ``Counter`` and ``map``, like they would with NumPy.
+
+    Args:
+        flat_tree: The flattened tree.
+        language_name: The name of the language of the tree.
+
+    Returns:
+        The node kind histogram, the number of named nodes and the number of error nodes.
+    """
+    kind_names = get_kind_names(language_name)
+    kinds = Counter(
+        {
+            kind_names[kind_id] if kind_id != ERROR_KIND_ID else "ERROR": count
+            for kind_id, count in Counter(flat_tree.kind_ids).items()
+        }
+    )
+    named = sum(map(int(NodeFlag.NAMED).__and__, flat_tree.flags))
+    errors = sum(map(int(NodeFlag.ERROR).__and__, flat_tree.flags)) // NodeFlag.ERROR
+    return kinds, named, errors
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark metrics over Node objects against a flattened tree.")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of corpus languages (default: all)")
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="Approximate size of each source in bytes")
+    args = parser.parse_args()
+
+    language_names = cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(SNIPPETS)
+    print(f"{'language':<12} {'nodes':>9} {'node walk':>10} {'flatten':>9} {'metrics':>9} {'speedup':>8}")
+    for language_name in language_names:
+        tree = get_parser(language_name).parse(build_source(language_name, args.size))
+
+        start = perf_counter()
+        expected = node_walk_metrics(tree)
+        node_walk = perf_counter() - start
+
+        start = perf_counter()
+        flat_tree = flatten_tree(tree)
+        flatten = perf_counter() - start
+        start = perf_counter()
+        actual = flat_tree_metrics(flat_tree, language_name)
+        metrics = perf_counter() - start
+
+        if actual != expected:
+            raise RuntimeError(f"{language_name}: the metrics of the flattened tree differ")
+        print(
+            f"{language_name:<12} {len(flat_tree):>9} {node_walk:>9.2f}s {flatten:>8.2f}s {metrics:>8.2f}s "
+            f"{node_walk / (flatten + metrics):>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare parsing embedded languages region by region with a `LayeredDocument`, on JavaScript with CSS templates.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.injections``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from statistics import median
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from tree_sitter import QueryCursor
+
+from tree_sitter_language_pack import LayeredDocument, get_parser, get_query
+
+if TYPE_CHECKING:
+    from tree_sitter import Tree
+
+COMPONENT = """export const Button{index} = css`
+  display: flex;
+  color: ${{(props) => props.color}};
+  margin: {index}px {index}px;
+`;
+
+"""
+
+
+def parse_region_by_region(source: bytes) -> list[Tree]:
+    """Parse a document, then create a parser for each embedded region and parse the region on its own.
+
+    Args:
+        source: The source of the document.
+
+    Returns:
+        The tree of the document followed by the trees of the regions.
+    """
+    trees = [get_parser("javascript").parse(source)]
+    for _, captures in QueryCursor(get_query("javascript", "injections")).matches(trees[0].root_node):
+        language_nodes = captures.get("injection.language")
+        if not language_nodes or language_nodes[0].text != b"css":
+            continue
+        for node in captures["injection.content"]:
+            parser = get_parser("css")
+            parser.included_ranges = [node.range]
+            trees.append(parser.parse(source))
+    return trees
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark region-by-region parsing against a LayeredDocument.")
+    parser.add_argument("--components", type=int, default=2000, help="Number of components with a CSS template")
+    parser.add_argument("--edits", type=int, default=50, help="Number of keystrokes to measure")
+    args = parser.parse_args()
+
+    source = "".join(COMPONENT.format(index=index) for index in range(args.components)).encode()
+
+    start = perf_counter()
+    region_trees = parse_region_by_region(source)
+    region_by_region = perf_counter() - start
+
+    start = perf_counter()
+    document = LayeredDocument("javascript", source)
+    layers = document.layers
+    layered = perf_counter() - start
+
+    # Type into the CSS of a component in the middle of the document, re-parsing after every keystroke
+    latencies = []
+    offset = source.index(b"display", len(source) // 2)
+    for keystroke in range(args.edits):
+        start = perf_counter()
+        document.edit_bytes(offset + keystroke, offset + keystroke, "x")
+        document.reparse()
+        latencies.append(perf_counter() - start)
+
+    print(f"{len(source)} bytes, {len(region_trees) - 1} CSS regions, {len(layers) - 1} injected layers")
+    print(f"region by region: {region_by_region * 1000:>8.2f}ms per parse")
+    print(f"layered:          {layered * 1000:>8.2f}ms first parse, {median(latencies) * 1000:>8.2f}ms p50 keystroke")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Measure the cost of get_language with a cold versus a warm language cache.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.language_cache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from time import perf_counter_ns
+from typing import cast
+
+from tree_sitter_language_pack import SupportedLanguage, clear_cache, get_language
+
+
+def measure(language_name: SupportedLanguage, iterations: int) -> tuple[float, float, float]:
+    """Measure the load cost of a language.
+
+    Args:
+        language_name: The name of the language.
+        iterations: The number of uncached and cached lookups to average over.
+
+    Returns:
+        The first load, uncached and cached lookup times in microseconds.
+    """
+    clear_cache()
+    start = perf_counter_ns()
+    get_language(language_name)
+    first_load = perf_counter_ns() - start
+
+    uncached = 0
+    for _ in range(iterations):
+        clear_cache()
+        start = perf_counter_ns()
+        get_language(language_name)
+        uncached += perf_counter_ns() - start
+
+    get_language(language_name)
+    start = perf_counter_ns()
+    for _ in range(iterations):
+        get_language(language_name)
+    cached = perf_counter_ns() - start
+
+    return first_load / 1000, uncached / iterations / 1000, cached / iterations / 1000
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark cold versus warm get_language calls.")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of languages to measure (default: all)")
+    parser.add_argument("--iterations", type=int, default=1000, help="Number of lookups per measurement")
+    args = parser.parse_args()
+
+    language_names = (
+        cast("list[SupportedLanguage]", args.languages.split(","))
+        if args.languages
+        else list(SupportedLanguage.__args__)  # type: ignore[attr-defined]
+    )
+
+    print(f"{'language':<20} {'first load (us)':>16} {'uncached (us)':>14} {'cached (us)':>12} {'speedup':>8}")
+    for language_name in language_names:
+        try:
+            first_load, uncached, cached = measure(language_name, args.iterations)
+        except LookupError:
+            print(f"{language_name:<20} {'not available':>16}")
+            continue
+        print(f"{language_name:<20} {first_load:>16.1f} {uncached:>14.2f} {cached:>12.3f} {uncached / cached:>7.0f}x")
+
+    clear_cache()
+
+
+if __name__ == "__main__":
+    main()
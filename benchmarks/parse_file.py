@@ -0,0 +1,121 @@
+"""Compare the peak memory of parsing large files read into bytes with parse_file's memory-mapped parsing.
+
+Each measurement runs in a fresh interpreter, so the peak resident set size of one run does not carry over to the
+next. Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.parse_file``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import cast
+
+from benchmarks.corpus import LARGE_INPUT_ROWS, build_large_source
+from tree_sitter_language_pack import SupportedLanguage, available_languages, get_parser, parse_file, preload
+
+MODES = ("read", "mmap")
+
+
+def measure(language_name: SupportedLanguage, path: Path, mode: str) -> dict[str, float]:
+    """Parse a file once and measure the time and memory it took.
+
+    Args:
+        language_name: The name of the language.
+        path: The path of the file.
+        mode: ``read`` to parse the file contents read into bytes, ``mmap`` to use `parse_file`.
+
+    Returns:
+        The elapsed seconds, the growth of private memory during the parse and the peak resident set size in MB.
+    """
+    preload([language_name])
+    parser = get_parser(language_name)
+
+    baseline = get_private_memory()
+    start = perf_counter()
+    if mode == "read":
+        # Keep the source alive while measuring, as it is while the parser runs
+        source = path.read_bytes()
+        tree = parser.parse(source)
+    else:
+        tree = parse_file(language_name, path, parser=parser)
+    elapsed = perf_counter() - start
+    private_memory = get_private_memory() - baseline
+
+    if tree.root_node.has_error:
+        raise RuntimeError(f"{path} did not parse cleanly")
+
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss = max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+    return {"seconds": elapsed, "private_mb": private_memory, "peak_rss_mb": peak_rss}
+
+
+def get_private_memory() -> float:
+    """Get the anonymous (private, not file-backed) resident memory of the current process.
+
+    Memory-mapped file pages count towards the resident set size but not towards anonymous memory, since the
+    operating system can drop them at any time. This is only available on Linux.
+
+    Returns:
+        The anonymous resident memory in MB, or NaN if it is not available.
+    """
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return math.nan
+    match = re.search(r"^RssAnon:\s+(\d+) kB$", status, re.MULTILINE)
+    return int(match.group(1)) / 1024 if match else math.nan
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the peak memory of parse_file against read + parse.")
+    parser.add_argument(
+        "--languages", type=str, help="Comma-separated list of languages (default: csv,json,sql,javascript)"
+    )
+    parser.add_argument("--size", type=int, default=64, help="Size of each generated file in MB")
+    parser.add_argument("--measure", nargs=3, metavar=("LANGUAGE", "PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        language_name, path, mode = args.measure
+        print(json.dumps(measure(language_name, Path(path), mode)))
+        return
+
+    language_names = (
+        cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(LARGE_INPUT_ROWS)
+    )
+    if missing_languages := set(language_names) - set(available_languages()):
+        print(f"skipping languages missing from this build: {', '.join(sorted(missing_languages))}")
+        language_names = [language_name for language_name in language_names if language_name not in missing_languages]
+
+    print(f"{'language':<12} {'mode':<6} {'seconds':>8} {'private MB':>11} {'peak RSS MB':>12}")
+    with TemporaryDirectory() as directory:
+        for language_name in language_names:
+            path = Path(directory) / f"large.{language_name}"
+            path.write_bytes(build_large_source(language_name, args.size * 1024 * 1024))
+
+            for mode in MODES:
+                result = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.parse_file", "--measure", language_name, str(path), mode],
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                )
+                stats = json.loads(result.stdout)
+                print(
+                    f"{language_name:<12} {mode:<6} {stats['seconds']:>8.2f} {stats['private_mb']:>11.1f} "
+                    f"{stats['peak_rss_mb']:>12.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare sequential parsing with parse_many over a mixed-language corpus.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.parse_many``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from time import perf_counter
+from typing import cast
+
+from benchmarks.corpus import SNIPPETS, mixed_corpus
+from tree_sitter_language_pack import SupportedLanguage, get_parser, parse_many, preload
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark parse_many against a sequential parse loop.")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of corpus languages (default: all)")
+    parser.add_argument("--files", type=int, default=2000, help="Number of files in the corpus")
+    parser.add_argument("--size", type=int, default=16 * 1024, help="Approximate size of each file in bytes")
+    parser.add_argument("--workers", type=str, help="Comma-separated worker counts to measure (default: 1,2,4,N)")
+    args = parser.parse_args()
+
+    language_names = cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(SNIPPETS)
+    cpu_count = os.cpu_count() or 1
+    worker_counts = (
+        [int(workers) for workers in args.workers.split(",")] if args.workers else sorted({1, 2, 4, cpu_count})
+    )
+
+    corpus = mixed_corpus(language_names, args.files, args.size)
+    total_mb = sum(len(source) for _, source in corpus) / 1024 / 1024
+    preload(language_names)
+    print(f"corpus: {len(corpus)} files, {total_mb:.1f} MB, {len(language_names)} languages, {cpu_count} CPUs")
+
+    parsers = {language_name: get_parser(language_name) for language_name in language_names}
+    start = perf_counter()
+    for language_name, source in corpus:
+        parsers[language_name].parse(source)
+    baseline = perf_counter() - start
+    print(f"{'sequential':<20} {baseline:>8.2f}s {total_mb / baseline:>8.1f} MB/s")
+
+    for workers in worker_counts:
+        for ordered in (True, False):
+            start = perf_counter()
+            for result in parse_many(corpus, workers=workers, ordered=ordered):
+                if result.error:
+                    raise result.error
+            elapsed = perf_counter() - start
+            label = f"workers={workers}{'' if ordered else ' unordered'}"
+            print(f"{label:<20} {elapsed:>8.2f}s {total_mb / elapsed:>8.1f} MB/s {baseline / elapsed:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare extracting flat trees in-process with parse_files over worker processes.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.process_pool``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import cast
+
+from benchmarks.corpus import SNIPPETS, mixed_corpus
+from tree_sitter_language_pack import SupportedLanguage, flatten_tree, get_parser, parse_files
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark parse_files against an in-process loop.")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of corpus languages (default: all)")
+    parser.add_argument("--files", type=int, default=500, help="Number of files in the corpus")
+    parser.add_argument("--size", type=int, default=16 * 1024, help="Approximate size of each file in bytes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    args = parser.parse_args()
+
+    language_names = cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(SNIPPETS)
+
+    with TemporaryDirectory() as directory:
+        files: list[tuple[SupportedLanguage, Path]] = []
+        for index, (language_name, source) in enumerate(mixed_corpus(language_names, args.files, args.size)):
+            path = Path(directory) / f"{index}.{language_name}"
+            path.write_bytes(source)
+            files.append((language_name, path))
+        total_mb = sum(path.stat().st_size for _, path in files) / 1024 / 1024
+        print(f"corpus: {len(files)} files, {total_mb:.1f} MB, {len(language_names)} languages")
+
+        parsers = {language_name: get_parser(language_name) for language_name in language_names}
+        start = perf_counter()
+        for language_name, path in files:
+            flatten_tree(parsers[language_name].parse(path.read_bytes()))
+        baseline = perf_counter() - start
+        print(f"{'in-process':<20} {baseline:>8.2f}s {total_mb / baseline:>8.1f} MB/s")
+
+        start = perf_counter()
+        transferred = 0
+        for result in parse_files(files, languages=language_names, workers=args.workers):
+            if result.error:
+                raise result.error
+            transferred += len(pickle.dumps(result.value))
+        elapsed = perf_counter() - start
+        label = f"workers={args.workers}"
+        print(f"{label:<20} {elapsed:>8.2f}s {total_mb / elapsed:>8.1f} MB/s {baseline / elapsed:>6.2f}x")
+        print(f"pickled results: {transferred / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Measure the load time, parse throughput, peak memory and incremental re-parse latency of every grammar.
+
+``run`` measures each language in a fresh process, so that load times are cold and peak memory is not shared between
+languages, and writes the results to a JSON file. Languages without a corpus in ``benchmarks/corpus.py`` or
+``benchmarks/corpora`` are only loaded, and are listed in the results and at the end of the summary. Peak memory is
+measured with ``resource``, so it is not available on Windows. ``compare`` compares two result files, e.g. from before and after a vendor
+bump in ``sources/language_definitions.json``, and exits with status 1 if a metric regressed beyond the threshold.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.suite run --output results.json`` and
+``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.suite compare baseline.json results.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, cast
+
+from tree_sitter import Parser
+
+from benchmarks.corpus import build_source, corpus_languages
+from tree_sitter_language_pack import SupportedLanguage, available_languages, get_language, language_info
+
+if sys.platform != "win32":
+    import resource
+
+METRICS = {
+    "load_ms": (False, 1.0),
+    "parse_mb_per_s": (True, 0.0),
+    "peak_memory_bytes": (False, 1024 * 1024),
+    "reparse_ms": (False, 0.5),
+}
+"""The metrics compared between result files, mapped to whether higher values are better and the smallest absolute
+change that is not treated as noise."""
+
+
+def peak_rss() -> int | None:
+    """Get the peak resident set size of the current process in bytes, or None if it is not available."""
+    if sys.platform == "win32":
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_reparse(parser: Parser, source: bytes, edits: int) -> float:
+    """Measure the median latency of incremental re-parses after typing and deleting a space in the middle of a source.
+
+    Args:
+        parser: The parser.
+        source: The source.
+        edits: The number of edits.
+
+    Returns:
+        The median re-parse latency in milliseconds.
+    """
+    tree = parser.parse(source)
+    # Insert before a line break, where a space is insignificant in almost every language
+    offset = source.find(b"\n", len(source) // 2)
+    if offset < 0:
+        offset = len(source)
+    point = (source.count(b"\n", 0, offset), offset - source.rfind(b"\n", 0, offset) - 1)
+    edited = source[:offset] + b" " + source[offset:]
+
+    latencies = []
+    for edit in range(edits):
+        inserting = edit % 2 == 0
+        tree.edit(
+            start_byte=offset,
+            old_end_byte=offset + (not inserting),
+            new_end_byte=offset + inserting,
+            start_point=point,
+            old_end_point=(point[0], point[1] + (not inserting)),
+            new_end_point=(point[0], point[1] + inserting),
+        )
+        start = perf_counter()
+        tree = parser.parse(edited if inserting else source, tree)
+        latencies.append(perf_counter() - start)
+    return median(latencies) * 1000
+
+
+def measure_language(language_name: SupportedLanguage, size: int, repeat: int, edits: int) -> dict[str, Any]:
+    """Measure a language. Runs in a fresh worker process.
+
+    Args:
+        language_name: The name of the language.
+        size: The approximate size of the parsed source in bytes.
+        repeat: The number of parses to take the best throughput of.
+        edits: The number of incremental re-parses to take the median latency of.
+
+    Returns:
+        The metrics of the language.
+    """
+    try:
+        rev = language_info(language_name).rev
+    except LookupError:
+        rev = None
+
+    start = perf_counter()
+    parser = Parser(get_language(language_name))
+    result: dict[str, Any] = {"rev": rev, "load_ms": (perf_counter() - start) * 1000}
+    if language_name not in corpus_languages():
+        return result
+
+    source = build_source(language_name, size)
+    baseline = peak_rss()
+    tree = parser.parse(source)
+    peak = peak_rss()
+    result["peak_memory_bytes"] = None if peak is None or baseline is None else max(0, peak - baseline)
+    result["has_errors"] = tree.root_node.has_error
+    del tree
+
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        parser.parse(source)
+        durations.append(perf_counter() - start)
+    result["source_bytes"] = len(source)
+    result["parse_mb_per_s"] = len(source) / min(durations) / 1e6
+    result["reparse_ms"] = measure_reparse(parser, source, edits)
+    return result
+
+
+def measure_in_worker(arguments: tuple[SupportedLanguage, int, int, int]) -> tuple[SupportedLanguage, dict[str, Any]]:
+    """Measure a language, reporting a failure as an ``error`` entry."""
+    language_name = arguments[0]
+    try:
+        return language_name, measure_language(*arguments)
+    except Exception as e:  # noqa: BLE001
+        return language_name, {"error": f"{type(e).__name__}: {e}"}
+
+
+def package_version(name: str) -> str | None:
+    """Get the installed version of a distribution, if any."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def run(args: argparse.Namespace) -> int:
+    """Measure the languages and write the results to a JSON file."""
+    language_names = (
+        cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else available_languages()
+    )
+    results: dict[str, dict[str, Any]] = {}
+    with_corpus = set(corpus_languages())
+    # Only loaded, so their parse metrics are missing from the results rather than regressed
+    without_corpus = sorted(language_name for language_name in language_names if language_name not in with_corpus)
+
+    print(f"{'language':<20} {'load (ms)':>10} {'parse (MB/s)':>13} {'peak memory (MB)':>17} {'re-parse (ms)':>14}")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        tasks = [(language_name, args.size, args.repeat, args.edits) for language_name in language_names]
+        for language_name, result in pool.imap(measure_in_worker, tasks):
+            results[language_name] = result
+            if "error" in result:
+                print(f"{language_name:<20} {result['error']}")
+                continue
+            parse = f"{result['parse_mb_per_s']:>13.2f}" if "parse_mb_per_s" in result else f"{'no corpus':>13}"
+            if "peak_memory_bytes" not in result:
+                memory = f"{'':>17}"
+            elif result["peak_memory_bytes"] is None:
+                memory = f"{'unavailable':>17}"
+            else:
+                memory = f"{result['peak_memory_bytes'] / 1e6:>17.1f}"
+            reparse = f"{result['reparse_ms']:>14.3f}" if "reparse_ms" in result else ""
+            errors = "  (corpus has syntax errors)" if result.get("has_errors") else ""
+            print(f"{language_name:<20} {result['load_ms']:>10.2f} {parse} {memory} {reparse}{errors}")
+
+    document = {
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tree_sitter": package_version("tree-sitter"),
+            "tree_sitter_language_pack": package_version("tree-sitter-language-pack"),
+            "size": args.size,
+            "repeat": args.repeat,
+            "edits": args.edits,
+        },
+        "languages": results,
+        "languages_without_corpus": without_corpus,
+    }
+    Path(args.output).write_text(json.dumps(document, indent=2) + "\n")
+    if without_corpus:
+        print(f"{len(without_corpus)} of {len(language_names)} languages have no corpus and were only loaded:")
+        print(", ".join(without_corpus))
+    print(f"wrote {len(results)} languages to {args.output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare two result files and report the metrics that changed by more than the threshold.
+
+    Returns:
+        1 if a metric regressed beyond the threshold, otherwise 0.
+    """
+    baseline = json.loads(Path(args.baseline).read_text())["languages"]
+    current = json.loads(Path(args.current).read_text())["languages"]
+
+    regressions = 0
+    print(f"{'language':<20} {'metric':<18} {'baseline':>12} {'current':>12} {'change':>8}")
+    for language_name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[language_name], current[language_name]
+        rev_changed = old.get("rev") != new.get("rev")
+        for metric, (higher_is_better, noise_floor) in METRICS.items():
+            if not old.get(metric) or new.get(metric) is None or abs(new[metric] - old[metric]) <= noise_floor:
+                continue
+            change = new[metric] / old[metric] - 1
+            regressed = -change > args.threshold if higher_is_better else change > args.threshold
+            improved = change > args.threshold if higher_is_better else -change > args.threshold
+            if not regressed and not improved:
+                continue
+            regressions += regressed
+            status = "REGRESSION" if regressed else "improvement"
+            note = f" (grammar {old.get('rev')} -> {new.get('rev')})" if rev_changed else ""
+            print(
+                f"{language_name:<20} {metric:<18} {old[metric]:>12.3f} {new[metric]:>12.3f} {change:>+7.0%} "
+                f"{status}{note}"
+            )
+
+    for language_name in sorted(baseline.keys() ^ current.keys()):
+        print(f"{language_name:<20} only in {'baseline' if language_name in baseline else 'current'} results")
+    for language_name in sorted(baseline.keys() & current.keys()):
+        if "error" in current[language_name] and "error" not in baseline[language_name]:
+            regressions += 1
+            print(f"{language_name:<20} failed: {current[language_name]['error']}")
+
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark every grammar and track regressions between runs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Measure the languages and write the results to a JSON file")
+    run_parser.add_argument("--languages", type=str, help="Comma-separated list of languages (default: all available)")
+    run_parser.add_argument("--size", type=int, default=256 * 1024, help="Approximate size of each source in bytes")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Number of parses per language")
+    run_parser.add_argument("--edits", type=int, default=20, help="Number of incremental re-parses per language")
+    run_parser.add_argument("--output", type=str, default="benchmark-results.json", help="Path of the JSON results")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=str, help="Path of the baseline results")
+    compare_parser.add_argument("current", type=str, help="Path of the current results")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Relative change to report, e.g. 0.25 for 25%% (default: 0.25)"
+    )
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare computing tree metrics with a straightforward TreeCursor walk with `tree_stats`.
+
+Run with ``PROJECT_ROOT=. uv run --no-sync python -m benchmarks.tree_stats``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from time import perf_counter
+from typing import TYPE_CHECKING, cast
+
+from benchmarks.corpus import SNIPPETS, build_source
+from tree_sitter_language_pack import ERROR_KIND_ID, SupportedLanguage, get_kind_names, get_parser, tree_stats
+
+if TYPE_CHECKING:
+    from tree_sitter import Tree
+
+
+def cursor_walk_stats(tree: Tree) -> tuple[Counter[str], int, int, int, int]:
+    """Compute the node kind histogram, depth and error metrics by inspecting every node during a cursor walk.
+
+    Args:
+        tree: The tree.
+
+    Returns:
+        The node kind histogram, the maximum depth, the number of error nodes, the number of missing nodes and the
+        number of bytes covered by error nodes.
+    """
+    kinds: Counter[str] = Counter()
+    max_depth = errors = missing = error_bytes = 0
+    # The depth of the outermost error node around the current node, if any
+    error_depth: int | None = None
+    cursor = tree.walk()
+    while True:
+        node = cursor.node
+        if node is not None:
+            depth = cursor.depth
+            if error_depth is not None and depth <= error_depth:
+                error_depth = None
+            kinds[node.type] += 1
+            max_depth = max(depth, max_depth)
+            missing += node.is_missing
+            if node.is_error:
+                errors += 1
+                if error_depth is None:
+                    error_depth = depth
+                    error_bytes += node.end_byte - node.start_byte
+
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return kinds, max_depth, errors, missing, error_bytes
+
+
+def main() -> None:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark a TreeCursor walk against tree_stats.")
+    parser.add_argument("--languages", type=str, help="Comma-separated list of corpus languages (default: all)")
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="Approximate size of each source in bytes")
+    parser.add_argument(
+        "--corrupt", type=int, default=0, help="Truncate every Nth byte range of 4 KiB to introduce syntax errors"
+    )
+    args = parser.parse_args()
+
+    language_names = cast("list[SupportedLanguage]", args.languages.split(",")) if args.languages else list(SNIPPETS)
+    print(f"{'language':<12} {'nodes':>9} {'errors':>7} {'cursor walk':>12} {'tree_stats':>11} {'speedup':>8}")
+    for language_name in language_names:
+        source = build_source(language_name, args.size)
+        if args.corrupt:
+            source = b"".join(
+                source[offset : offset + (4096 if (offset // 4096) % args.corrupt else 4000)]
+                for offset in range(0, len(source), 4096)
+            )
+        tree = get_parser(language_name).parse(source)
+
+        start = perf_counter()
+        expected = cursor_walk_stats(tree)
+        cursor_walk = perf_counter() - start
+
+        start = perf_counter()
+        stats = tree_stats(tree)
+        elapsed = perf_counter() - start
+
+        kind_names = get_kind_names(language_name)
+        # Several kind ids can share a name, e.g. aliased nodes
+        kinds: Counter[str] = Counter()
+        for kind_id, count in stats.kind_counts.items():
+            kinds[kind_names[kind_id] if kind_id != ERROR_KIND_ID else "ERROR"] += count
+        actual = (kinds, stats.max_depth, stats.error_count, stats.missing_count, stats.error_bytes)
+        if actual != expected:
+            raise RuntimeError(f"{language_name}: the metrics of tree_stats differ")
+        print(
+            f"{language_name:<12} {stats.node_count:>9} {stats.error_count:>7} {cursor_walk:>11.3f}s "
+            f"{elapsed:>10.3f}s {cursor_walk / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
 import os
 import platform
 import re
 import sys
 from functools import partial
-from json import loads
+from hashlib import sha256
+from json import dumps, loads
 from pathlib import Path
-from shutil import move, rmtree, which
+from shutil import copytree, ignore_patterns, move, rmtree, which
+from tempfile import mkdtemp
+from time import perf_counter
 
 from anyio import Path as AsyncPath
 from anyio import run_process
@@ -18,6 +22,13 @@ from typing_extensions import NotRequired, TypedDict
 
 vendor_directory = Path(__file__).parent.parent / "vendor"
 parsers_directory = Path(__file__).parent.parent / "parsers"
+vendor_cache_directory = Path(os.environ.get("TSLP_VENDOR_CACHE", Path(__file__).parent.parent / ".vendor_cache"))
+
+CACHE_COMPLETE_MARKER = ".complete"
+MANIFEST_FILE_NAME = "manifest.json"
+# Bumped whenever the files vendored for a grammar change, so that --incremental re-vendors all grammars. Version 2
+# added the queries folders.
+VENDOR_FORMAT = 2
 
 COMMON_RE_PATTERN = re.compile(r"\.\.[/\\](?:\.\.[/\\])*common[/\\]")
 
@@ -45,37 +56,174 @@ def get_language_definitions() -> tuple[dict[str, LanguageDict], list[str]]:
     return language_definitions, language_names
 
 
-async def clone_repository(repo_url: str, branch: str | None, language_name: str, rev: str | None = None) -> None:
-    """Clone a repository.
+class CloneReport(TypedDict):
+    """The outcome of fetching a single grammar repository."""
+
+    language_name: str
+    bytes_transferred: int
+    seconds: float
+    cached: bool
+
+
+def get_cache_directory(repo_url: str, rev: str, sparse_paths: list[str] | None) -> Path:
+    """Get the vendor cache entry of a repository revision.
 
     Args:
         repo_url: The repository URL.
-        branch: The branch to clone.
+        rev: The pinned revision.
+        sparse_paths: The sparse-checkout patterns of the entry, or None for a full checkout.
+
+    Returns:
+        Path: The directory holding the cached checkout.
+    """
+    repo_directory = vendor_cache_directory / sha256(repo_url.encode()).hexdigest()[:16]
+    if sparse_paths is None:
+        return repo_directory / rev
+    # Grammars in different directories of a repository check out different paths at the same revision
+    paths_hash = sha256("\n".join(sorted(sparse_paths)).encode()).hexdigest()[:16]
+    return repo_directory / f"{rev}-sparse-{paths_hash}"
+
+
+def store_in_cache(checkout: Path, cache_directory: Path) -> None:
+    """Copy a checkout into the vendor cache.
+
+    The checkout is copied next to the cache entry and renamed into place once complete, so concurrent fetches of the
+    same revision never expose a partially copied entry. If another fetch stored the entry first, the copy is discarded.
+
+    Args:
+        checkout: The checked out working tree.
+        cache_directory: The cache entry to store it as.
+    """
+    if cache_directory.exists() and not (cache_directory / CACHE_COMPLETE_MARKER).exists():
+        # Left behind by an interrupted run of an older version, which copied into the entry directly
+        rmtree(cache_directory, ignore_errors=True)
+
+    cache_directory.parent.mkdir(parents=True, exist_ok=True)
+    temporary_directory = Path(mkdtemp(prefix=f".{cache_directory.name}-", dir=cache_directory.parent))
+    try:
+        copytree(checkout, temporary_directory, ignore=ignore_patterns(".git"), dirs_exist_ok=True)
+        (temporary_directory / CACHE_COMPLETE_MARKER).touch()
+        try:
+            temporary_directory.rename(cache_directory)
+        except OSError:
+            if not (cache_directory / CACHE_COMPLETE_MARKER).exists():
+                raise
+    finally:
+        rmtree(temporary_directory, ignore_errors=True)
+
+
+def get_sparse_paths(directory: str | None) -> list[str]:
+    """Get the paths checked out for a grammar that is not generated.
+
+    Args:
+        directory: The grammar directory inside the repository, if it is not the repository root.
+
+    Returns:
+        list[str]: Non-cone sparse-checkout patterns.
+    """
+    paths = ["/src/", "/common/", "/queries/"]
+    if directory:
+        paths.extend([f"/{directory}/src/", f"/{directory}/common/", f"/{directory}/queries/"])
+    return paths
+
+
+def get_directory_size(path: Path) -> int:
+    """Get the total size of the files in a directory tree.
+
+    Args:
+        path: The directory.
+
+    Returns:
+        int: The size in bytes.
+    """
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def fetch_revision(repo_url: str, target: Path, ref: str, sparse_paths: list[str] | None) -> int:
+    """Fetch a single revision of a repository into a fresh working tree, without its history.
+
+    Args:
+        repo_url: The repository URL.
+        target: The directory to check the revision out into.
+        ref: The commit SHA or branch to fetch.
+        sparse_paths: Sparse-checkout patterns limiting the checked out files, or None to check out everything.
+
+    Returns:
+        int: The number of bytes written to the object database, as an estimate of the bytes transferred.
+    """
+    repo = Repo.init(target)
+    repo.create_remote("origin", repo_url)
+
+    fetch_args = ["--depth=1", "--no-tags"]
+    if sparse_paths:
+        repo.git.sparse_checkout("set", "--no-cone", *sparse_paths)
+        # Only download the blobs of the sparse paths, on servers that support partial clones
+        fetch_args.append("--filter=blob:none")
+
+    repo.git.fetch(*fetch_args, "origin", ref)
+    repo.git.checkout("--detach", "FETCH_HEAD")
+    return get_directory_size(target / ".git" / "objects")
+
+
+async def clone_repository(  # noqa: PLR0913
+    repo_url: str,
+    branch: str | None,
+    language_name: str,
+    rev: str | None = None,
+    directory: str | None = None,
+    sparse: bool = False,
+) -> CloneReport:
+    """Fetch a grammar repository at its pinned revision.
+
+    Only the pinned commit is fetched (shallow fetch by SHA), optionally limited to the paths needed to build the
+    grammar. Pinned revisions are stored in the vendor cache, so later runs copy them instead of fetching again.
+
+    Args:
+        repo_url: The repository URL.
+        branch: The branch to fetch if no revision is pinned.
         language_name: The name of the repository.
-        rev: The revision to clone.  If passed, perform  a non-shallow clone.
+        rev: The revision to check out.
+        directory: The grammar directory inside the repository, used for the sparse checkout.
+        sparse: Whether to only check out the source directories of the grammar.
 
     Raises:
         RuntimeError: If cloning fails
 
     Returns:
-        Repo: The cloned repository.
+        CloneReport: The bytes transferred and the time spent.
     """
-    print(f"Cloning {repo_url}")
-    kwargs = {"url": repo_url, "to_path": vendor_directory / language_name}
-    if branch:
-        kwargs["branch"] = branch
-    if not rev:
-        kwargs["depth"] = 1
-
+    target = vendor_directory / language_name
+    start = perf_counter()
+    sparse_paths = get_sparse_paths(directory) if sparse else None
+
+    if rev:
+        # A full checkout also satisfies a sparse request
+        for cache_directory in {
+            get_cache_directory(repo_url, rev, None),
+            get_cache_directory(repo_url, rev, sparse_paths),
+        }:
+            if await AsyncPath(cache_directory / CACHE_COMPLETE_MARKER).exists():
+                await run_sync(
+                    partial(copytree, cache_directory, target, ignore=ignore_patterns(CACHE_COMPLETE_MARKER))
+                )
+                print(f"Restored {repo_url}@{rev} from the vendor cache")
+                return CloneReport(
+                    language_name=language_name, bytes_transferred=0, seconds=perf_counter() - start, cached=True
+                )
+
+    print(f"Fetching {repo_url}@{rev or branch or 'HEAD'}")
     try:
-        repo = await run_sync(partial(Repo.clone_from, **kwargs))  # type: ignore[arg-type]
-        print(f"Cloned {repo_url} successfully")
-        if rev:
-            await run_sync(lambda: repo.git.checkout(rev))
-            print(f"Checked out {rev}")
+        bytes_transferred = await run_sync(fetch_revision, repo_url, target, rev or branch or "HEAD", sparse_paths)
     except Exception as e:
         raise RuntimeError(f"failed to clone repo {repo_url} error: {e}") from e
 
+    if rev:
+        await run_sync(store_in_cache, target, get_cache_directory(repo_url, rev, sparse_paths))
+
+    seconds = perf_counter() - start
+    print(f"Fetched {repo_url} ({bytes_transferred / 1024:.0f} KiB in {seconds:.1f}s)")
+    return CloneReport(language_name=language_name, bytes_transferred=bytes_transferred, seconds=seconds, cached=False)
+
 
 async def handle_generate(language_name: str, directory: str | None, abi_version: int) -> None:
     """Handle the generation of a language.
@@ -111,7 +259,7 @@ async def handle_generate(language_name: str, directory: str | None, abi_version
 
 
 async def move_src_folder(language_name: str, directory: str | None) -> None:
-    """Move the src folder to the parsers directory.
+    """Move the src folder, and the common and queries folders if present, to the parsers directory.
 
     Args:
         language_name: The name of the language.
@@ -148,58 +296,246 @@ async def move_src_folder(language_name: str, directory: str | None) -> None:
             file_contents = COMMON_RE_PATTERN.sub(replacement_path, file_contents)
             await AsyncPath(file).write_text(file_contents)
 
+    # Grammars in a subdirectory of a repository may have their own queries or share the ones at the repository root
+    queries_source_dirs = [vendor_directory / language_name / "queries"]
+    if directory:
+        queries_source_dirs.insert(0, vendor_directory / language_name / directory / "queries")
+    for queries_source_dir in queries_source_dirs:
+        if await AsyncPath(queries_source_dir).is_dir():
+            print(f"Moving {language_name} query files")
+            await run_sync(move, queries_source_dir, target_source_dir / "queries")
+            break
+
+
+class StageSemaphores(TypedDict):
+    """Semaphores bounding the number of grammars in each vendoring stage at the same time."""
+
+    clone: asyncio.Semaphore
+    generate: asyncio.Semaphore
+    move: asyncio.Semaphore
 
-async def process_repo(language_name: str, language_definition: LanguageDict) -> None:
-    """Process a repository.
+
+class ManifestEntry(TypedDict):
+    """The language definition fields a vendored parser was produced from."""
+
+    repo: str
+    rev: str | None
+    branch: str | None
+    directory: str | None
+    generate: bool
+    abi_version: int | None
+    vendor_format: int
+
+
+def get_manifest_entry(language_definition: LanguageDict) -> ManifestEntry:
+    """Get the manifest entry of a language definition.
 
     Args:
-        language_name: The name of the language.
         language_definition: The language definition.
 
     Returns:
-        None
+        ManifestEntry: The fields of the definition that determine the vendored parser files, and the vendoring format.
     """
-    await clone_repository(
-        repo_url=language_definition["repo"],
-        branch=language_definition.get("branch"),
-        language_name=language_name,
+    generate = language_definition.get("generate", False)
+    return ManifestEntry(
+        repo=language_definition["repo"],
         rev=language_definition.get("rev"),
+        branch=language_definition.get("branch"),
+        directory=language_definition.get("directory"),
+        generate=generate,
+        abi_version=language_definition.get("abi_version", 14) if generate else None,
+        vendor_format=VENDOR_FORMAT,
     )
-    if language_definition.get("generate", False):
-        await handle_generate(
+
+
+def load_manifest() -> dict[str, ManifestEntry]:
+    """Load the manifest of the vendored parsers.
+
+    Returns:
+        dict[str, ManifestEntry]: The manifest entries by language name, empty if there is no manifest.
+    """
+    manifest_path = parsers_directory / MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return {}
+    manifest: dict[str, ManifestEntry] = loads(manifest_path.read_text())
+    return manifest
+
+
+def write_manifest(manifest: dict[str, ManifestEntry]) -> None:
+    """Write the manifest of the vendored parsers.
+
+    Args:
+        manifest: The manifest entries by language name.
+    """
+    (parsers_directory / MANIFEST_FILE_NAME).write_text(dumps(dict(sorted(manifest.items())), indent=2) + "\n")
+
+
+def get_stale_languages(
+    language_definitions: dict[str, LanguageDict], manifest: dict[str, ManifestEntry]
+) -> tuple[list[str], list[str]]:
+    """Compare the language definitions against the manifest of the vendored parsers.
+
+    Args:
+        language_definitions: The language definitions.
+        manifest: The manifest entries by language name.
+
+    Returns:
+        tuple[list[str], list[str]]: The languages that need to be vendored because they are new, their definition
+            changed or their parser files are missing, and the vendored languages that are no longer defined.
+    """
+    changed = [
+        language_name
+        for language_name, language_definition in language_definitions.items()
+        if manifest.get(language_name) != get_manifest_entry(language_definition)
+        or not (parsers_directory / language_name).is_dir()
+    ]
+    removed = sorted(manifest.keys() - language_definitions.keys())
+    return changed, removed
+
+
+async def process_repo(
+    language_name: str, language_definition: LanguageDict, semaphores: StageSemaphores
+) -> CloneReport:
+    """Process a repository.
+
+    Each stage acquires its own semaphore, so slow fetches do not hold back code generation and vice versa.
+
+    Args:
+        language_name: The name of the language.
+        language_definition: The language definition.
+        semaphores: The semaphores bounding the concurrency of each stage.
+
+    Returns:
+        CloneReport: The fetch report of the repository.
+    """
+    await run_sync(partial(rmtree, vendor_directory / language_name, ignore_errors=True))
+    await run_sync(partial(rmtree, parsers_directory / language_name, ignore_errors=True))
+
+    async with semaphores["clone"]:
+        report = await clone_repository(
+            repo_url=language_definition["repo"],
+            branch=language_definition.get("branch"),
             language_name=language_name,
+            rev=language_definition.get("rev"),
             directory=language_definition.get("directory"),
-            abi_version=language_definition.get("abi_version", 14),
+            # Generating a parser needs the grammar sources, so only grammars with committed parsers are fetched
+            # sparsely
+            sparse=not language_definition.get("generate", False),
         )
-    await move_src_folder(language_name=language_name, directory=language_definition.get("directory"))
+    if language_definition.get("generate", False):
+        async with semaphores["generate"]:
+            await handle_generate(
+                language_name=language_name,
+                directory=language_definition.get("directory"),
+                abi_version=language_definition.get("abi_version", 14),
+            )
+    async with semaphores["move"]:
+        await move_src_folder(language_name=language_name, directory=language_definition.get("directory"))
+    return report
 
 
-async def main() -> None:
-    """Main function."""
-    parsers_directory.mkdir(exist_ok=True, parents=True)
+def print_clone_reports(reports: list[CloneReport]) -> None:
+    """Print the bytes transferred and the time spent per grammar.
+
+    Args:
+        reports: The fetch reports.
+    """
+    print(f"{'language':<24} {'KiB':>10} {'seconds':>8}")
+    for report in sorted(reports, key=lambda report: report["bytes_transferred"], reverse=True):
+        source = "cached" if report["cached"] else f"{report['bytes_transferred'] / 1024:.0f}"
+        print(f"{report['language_name']:<24} {source:>10} {report['seconds']:>8.1f}")
 
+    total = sum(report["bytes_transferred"] for report in reports)
+    cached = sum(report["cached"] for report in reports)
+    print(f"Fetched {len(reports) - cached} repositories ({total / 1024 / 1024:.1f} MiB), restored {cached} from cache")
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Main function.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Raises:
+        RuntimeError: If any grammar failed to vendor.
+    """
     language_definitions, language_names = get_language_definitions()
-    await asyncio.gather(
+
+    if args.incremental:
+        manifest = load_manifest()
+        language_names, removed_languages = get_stale_languages(language_definitions, manifest)
+        for language_name in removed_languages:
+            print(f"Removing {language_name}, which is no longer defined")
+            rmtree(parsers_directory / language_name, ignore_errors=True)
+            del manifest[language_name]
+        print(f"{len(language_names)} of {len(language_definitions)} grammars changed since the last run")
+    else:
+        manifest = {}
+        for directory in (vendor_directory, parsers_directory):
+            if directory.exists():
+                print(f"{directory.name} directory already exists, removing")
+                rmtree(directory)
+
+    parsers_directory.mkdir(exist_ok=True, parents=True)
+
+    semaphores = StageSemaphores(
+        clone=asyncio.Semaphore(args.clone_jobs),
+        generate=asyncio.Semaphore(args.generate_jobs),
+        move=asyncio.Semaphore(args.move_jobs),
+    )
+    results = await asyncio.gather(
         *[
             process_repo(
                 language_name=language_name,
                 language_definition=language_definitions[language_name],
+                semaphores=semaphores,
             )
             for language_name in language_names
-        ]
+        ],
+        return_exceptions=True,
     )
 
+    reports: list[CloneReport] = []
+    failures: dict[str, BaseException] = {}
+    for language_name, result in zip(language_names, results, strict=True):
+        if isinstance(result, BaseException):
+            failures[language_name] = result
+            manifest.pop(language_name, None)
+        else:
+            reports.append(result)
+            manifest[language_name] = get_manifest_entry(language_definitions[language_name])
+
+    # The manifest is written even if some grammars failed, so an incremental re-run only retries the failures
+    write_manifest(manifest)
+    print_clone_reports(reports)
+
+    if failures:
+        for language_name, error in failures.items():
+            print(f"Failed to vendor {language_name}: {error}")
+        raise RuntimeError(f"failed to vendor {len(failures)} grammars: {', '.join(failures)}")
+
 
 if __name__ == "__main__":
     if not which("tree-sitter"):
         sys.exit("tree-sitter is a required system dependency. Please install it with 'npm i -g tree-sitter-cli'")
 
-    if vendor_directory.exists():
-        print("vendor directory already exists, removing")
-        rmtree(vendor_directory)
-
-    if parsers_directory.exists():
-        print("parsers directory already exists, removing")
-        rmtree(parsers_directory)
+    parser = argparse.ArgumentParser(description="Fetch the tree-sitter grammars and vendor their parser sources.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-vendor grammars whose definition changed since the last run (default: re-vendor everything)",
+    )
+    parser.add_argument(
+        "--clone-jobs", type=int, default=8, help="Maximum number of repositories fetched at once (default: 8)"
+    )
+    parser.add_argument(
+        "--generate-jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Maximum number of parsers generated at once (default: CPU count)",
+    )
+    parser.add_argument(
+        "--move-jobs", type=int, default=8, help="Maximum number of parsers moved into place at once (default: 8)"
+    )
 
-    asyncio.run(main())
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import sys
+from json import loads
+from pathlib import Path
+from typing import get_args
+
+from typing_extensions import NotRequired, TypedDict
+
+from tree_sitter_language_pack import SupportedLanguage
+
+definitions_path = Path(__file__).parent.parent / "sources" / "language_detection.json"
+index_path = Path(__file__).parent.parent / "tree_sitter_language_pack" / "_detection_index.py"
+
+HEADER = """# This file is generated by scripts/generate_detection_index.py from sources/language_detection.json. Do not edit.
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+"""
+
+INDEX_DESCRIPTIONS = {
+    "FILENAMES": "Exact file names, matched case-sensitively.",
+    "EXTENSIONS": "Lowercase file extensions without the leading dot, possibly with several parts such as ``d.ts``.",
+    "INTERPRETERS": "Lowercase interpreter names found in shebang lines.",
+    "MODELINE_NAMES": "Lowercase language names and aliases found in Emacs and Vim modelines.",
+}
+
+
+class DetectionDict(TypedDict):
+    """Detection rules of a single language."""
+
+    extensions: NotRequired[list[str]]
+    filenames: NotRequired[list[str]]
+    interpreters: NotRequired[list[str]]
+    aliases: NotRequired[list[str]]
+
+
+def add_entry(index: dict[str, str], key: str, language_name: str, index_name: str) -> None:
+    """Add an entry to an index.
+
+    Args:
+        index: The index to add the entry to.
+        key: The key to add.
+        language_name: The language the key maps to.
+        index_name: The name of the index, used in error messages.
+
+    Raises:
+        ValueError: If the key already maps to another language.
+    """
+    if (existing := index.setdefault(key, language_name)) != language_name:
+        raise ValueError(f"{index_name} entry {key!r} is claimed by both {existing} and {language_name}")
+
+
+def build_indexes(definitions: dict[str, DetectionDict]) -> dict[str, dict[str, str]]:
+    """Build the lookup indexes from the detection rules.
+
+    Args:
+        definitions: The detection rules by language name.
+
+    Raises:
+        ValueError: If a language is not supported or two languages claim the same key.
+
+    Returns:
+        dict[str, dict[str, str]]: The indexes by constant name, each sorted by key.
+    """
+    supported_languages = set(get_args(SupportedLanguage))
+    if unknown_languages := definitions.keys() - supported_languages:
+        raise ValueError(f"Unsupported languages in {definitions_path.name}: {', '.join(sorted(unknown_languages))}")
+
+    indexes: dict[str, dict[str, str]] = {name: {} for name in INDEX_DESCRIPTIONS}
+    for language_name in sorted(supported_languages):
+        add_entry(indexes["MODELINE_NAMES"], language_name, language_name, "MODELINE_NAMES")
+
+    for language_name, definition in definitions.items():
+        for filename in definition.get("filenames", []):
+            add_entry(indexes["FILENAMES"], filename, language_name, "FILENAMES")
+        for extension in definition.get("extensions", []):
+            add_entry(indexes["EXTENSIONS"], extension.lower(), language_name, "EXTENSIONS")
+        for interpreter in definition.get("interpreters", []):
+            add_entry(indexes["INTERPRETERS"], interpreter.lower(), language_name, "INTERPRETERS")
+        for alias in definition.get("aliases", []):
+            add_entry(indexes["MODELINE_NAMES"], alias.lower(), language_name, "MODELINE_NAMES")
+
+    return {name: dict(sorted(index.items())) for name, index in indexes.items()}
+
+
+def render_index() -> str:
+    """Render the detection index module.
+
+    Returns:
+        str: The source of the module.
+    """
+    definitions: dict[str, DetectionDict] = loads(definitions_path.read_text())
+    lines = [HEADER]
+    for name, index in build_indexes(definitions).items():
+        lines.append(f"{name}: Final[Mapping[str, SupportedLanguage]] = MappingProxyType(")
+        lines.append("    {")
+        lines.extend(f'        "{key}": "{language_name}",' for key, language_name in index.items())
+        lines.append("    }")
+        lines.append(")")
+        lines.append(f'"""{INDEX_DESCRIPTIONS[name]}"""')
+        lines.append("")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    source = render_index()
+    if "--check" in sys.argv[1:]:
+        if index_path.read_text() != source:
+            sys.exit(f"{index_path} is out of date, run scripts/generate_detection_index.py")
+        print(f"{index_path} is up to date")
+    else:
+        index_path.write_text(source)
+        print(f"Wrote {index_path}")
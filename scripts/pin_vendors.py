@@ -4,140 +4,213 @@ import argparse
 import asyncio
 import json
 import os
-import shutil
-import tempfile
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from time import perf_counter, sleep
 from typing import Any
 
-from git import Repo
+from git import Git, GitCommandError
+from typing_extensions import TypedDict
 
+definitions_path = Path(__file__).parent.parent / "sources" / "language_definitions.json"
 
-def get_latest_commit_hash(repo_url: str, branch: str | None = None) -> str | None:
-    """Get the latest commit hash from a repository.
+
+class PinResult(TypedDict):
+    """The outcome of resolving the latest revision of a single language repository."""
+
+    language_name: str
+    old_rev: str | None
+    new_rev: str | None
+    seconds: float
+    attempts: int
+
+
+def resolve_remote_ref(repo_url: str, branch: str | None = None) -> str:
+    """Resolve a branch of a remote repository to a commit hash without downloading any objects.
 
     Args:
         repo_url: The repository URL.
-        branch: The branch to checkout.
+        branch: The branch to resolve. Defaults to the remote HEAD, i.e. the default branch.
+
+    Raises:
+        ValueError: If the remote does not have the branch.
 
     Returns:
-        str: The latest commit hash.
+        str: The commit hash the branch points to.
     """
-    print(f"Fetching latest commit for {repo_url} on branch {branch or 'default'}")
-
-    temp_dir = tempfile.mkdtemp()
-
-    try:
-        clone_kwargs = {}
-        if branch:
-            clone_kwargs["branch"] = branch
-
-        temp_repo = Repo.clone_from(url=repo_url, to_path=temp_dir)
+    ref = f"refs/heads/{branch}" if branch else "HEAD"
+    output = str(Git().ls_remote(repo_url, ref))
+    for line in output.splitlines():
+        commit_hash, _, name = line.partition("\t")
+        if name == ref:
+            return commit_hash
+    raise ValueError(f"{repo_url} has no ref {ref}")
+
+
+def get_latest_commit_hash(
+    repo_url: str, branch: str | None = None, *, retries: int = 2, backoff: float = 1.0
+) -> tuple[str | None, int]:
+    """Get the latest commit hash from a repository.
 
-        latest_commit = temp_repo.head.commit.hexsha
-        print(f"Latest commit for {repo_url}: {latest_commit}")
-        return latest_commit
+    Args:
+        repo_url: The repository URL.
+        branch: The branch to resolve. Defaults to the default branch of the repository.
+        retries: The number of times a failed lookup is retried.
+        backoff: The number of seconds to wait before the first retry, doubled for every further retry.
 
-    except (ValueError, OSError, RuntimeError) as e:
-        print(f"Error fetching commit for {repo_url}: {e}")
-        return None
+    Returns:
+        tuple[str | None, int]: The latest commit hash, or None if it could not be resolved, and the number of
+            attempts made.
+    """
+    print(f"Fetching latest commit for {repo_url} on branch {branch or 'default'}")
 
-    finally:
+    for attempt in range(retries + 1):
         try:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        except (PermissionError, OSError) as e:
-            print(f"Warning: could not clean up temporary directory {temp_dir}: {e}")
+            latest_commit = resolve_remote_ref(repo_url, branch)
+        except ValueError as e:  # noqa: PERF203
+            # A missing branch will not appear by retrying
+            print(f"Error fetching commit for {repo_url}: {e}")
+            return None, attempt + 1
+        except (GitCommandError, OSError) as e:
+            print(f"Error fetching commit for {repo_url} (attempt {attempt + 1} of {retries + 1}): {e}")
+            if attempt < retries:
+                sleep(backoff * 2**attempt)
+        else:
+            print(f"Latest commit for {repo_url}: {latest_commit}")
+            return latest_commit, attempt + 1
+
+    return None, retries + 1
 
 
 async def process_language(
-    language_name: str, language_def: dict[str, Any], max_workers: int
-) -> tuple[str, dict[str, Any]]:
+    language_name: str,
+    language_def: dict[str, Any],
+    executor: ThreadPoolExecutor,
+    *,
+    only_missing: bool = False,
+    retries: int = 2,
+) -> PinResult:
     """Process a language repository to get its latest commit.
 
     Args:
         language_name: The name of the language.
         language_def: The language definition.
-        max_workers: The maximum number of concurrent workers.
+        executor: The worker pool shared by all languages that runs the remote lookups.
+        only_missing: Whether to skip languages that already have a revision pinned.
+        retries: The number of times a failed lookup is retried.
 
     Returns:
-        tuple: The language name and updated definition.
+        PinResult: The current and the latest revision of the language.
     """
-    repo_url = language_def["repo"]
-    branch = language_def.get("branch")
-    language_def_copy = language_def.copy()
-
-    if args.only_missing and "rev" in language_def_copy:
+    old_rev = language_def.get("rev")
+    if only_missing and old_rev:
         print(f"Skipping {language_name} as it already has a revision pinned")
-        return language_name, language_def_copy
+        return PinResult(language_name=language_name, old_rev=old_rev, new_rev=old_rev, seconds=0.0, attempts=0)
 
-    try:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            loop = asyncio.get_event_loop()
-            latest_commit = await loop.run_in_executor(executor, get_latest_commit_hash, repo_url, branch)
+    start = perf_counter()
+    loop = asyncio.get_running_loop()
+    latest_commit, attempts = await loop.run_in_executor(
+        executor, lambda: get_latest_commit_hash(language_def["repo"], language_def.get("branch"), retries=retries)
+    )
+    seconds = perf_counter() - start
 
-        if latest_commit:
-            language_def_copy["rev"] = latest_commit
-            print(f"✓ Updated {language_name} to commit {latest_commit}")
-        else:
-            print(f"✗ Failed to get commit for {language_name}")
+    if latest_commit:
+        print(f"✓ Resolved {language_name} to commit {latest_commit} in {seconds:.1f}s")
+    else:
+        print(f"✗ Failed to get commit for {language_name} after {attempts} attempts")
 
-    except (ValueError, OSError, RuntimeError) as e:
-        print(f"✗ Failed to update {language_name}: {e}")
+    return PinResult(
+        language_name=language_name, old_rev=old_rev, new_rev=latest_commit, seconds=seconds, attempts=attempts
+    )
 
-    return language_name, language_def_copy
 
+def print_changes(results: list[PinResult]) -> None:
+    """Print the revisions that changed, the languages that failed and the slowest lookups.
 
-async def main(args: argparse.Namespace) -> None:
-    """Main function."""
+    Args:
+        results: The results of all processed languages.
+    """
+    changed = [result for result in results if result["new_rev"] and result["new_rev"] != result["old_rev"]]
+    failed = [result for result in results if not result["new_rev"]]
+
+    for result in changed:
+        print(f"  {result['language_name']}: {result['old_rev'] or '(unpinned)'} -> {result['new_rev']}")
+    for result in failed:
+        print(f"  {result['language_name']}: failed, keeping {result['old_rev'] or '(unpinned)'}")
+
+    slowest = sorted(results, key=lambda result: result["seconds"], reverse=True)[:5]
+    print(
+        "Slowest lookups: " + ", ".join(f"{result['language_name']} ({result['seconds']:.1f}s)" for result in slowest)
+    )
+    print(f"{len(changed)} revisions changed, {len(failed)} failed, {len(results)} languages processed")
+
+
+async def main(args: argparse.Namespace) -> list[PinResult]:
+    """Main function.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        list[PinResult]: The results of all processed languages.
+    """
     max_workers = args.workers if args.workers else min(32, (os.cpu_count() or 4) * 2)
     print(f"Using up to {max_workers} concurrent workers")
 
-    definitions_path = Path(__file__).parent.parent / "sources" / "language_definitions.json"
     print(f"Loading language definitions from {definitions_path}")
+    language_definitions: dict[str, dict[str, Any]] = json.loads(await asyncio.to_thread(definitions_path.read_text))
 
-    language_definitions = json.loads(await asyncio.to_thread(lambda: Path(definitions_path).read_text()))
-
+    selected_definitions = language_definitions
     if args.languages:
         requested_languages = args.languages.split(",")
-        language_definitions = {k: v for k, v in language_definitions.items() if k in requested_languages}
-        print(f"Processing {len(language_definitions)} specified languages: {', '.join(language_definitions.keys())}")
+        selected_definitions = {k: v for k, v in language_definitions.items() if k in requested_languages}
+        print(f"Processing {len(selected_definitions)} specified languages: {', '.join(selected_definitions.keys())}")
     else:
-        print(f"Processing all {len(language_definitions)} languages")
+        print(f"Processing all {len(selected_definitions)} languages")
 
-    semaphore = asyncio.Semaphore(max_workers)
-    tasks = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pin-vendors") as executor:
+        results = await asyncio.gather(
+            *[
+                process_language(
+                    language_name, language_def, executor, only_missing=args.only_missing, retries=args.retries
+                )
+                for language_name, language_def in selected_definitions.items()
+            ]
+        )
 
-    async def process_with_semaphore(language_name: str, language_def: dict[str, Any]) -> tuple[str, dict[str, Any]]:
-        async with semaphore:
-            return await process_language(language_name, language_def, 1)
+    print_changes(results)
 
-    for language_name, language_def in language_definitions.items():
-        tasks.append(process_with_semaphore(language_name, language_def))
+    if args.dry_run:
+        print("Dry run, not writing the language definitions")
+        return results
 
-    results = await asyncio.gather(*tasks)
-
-    updated_definitions = dict(results)
-
-    if args.languages:
-        all_definitions = json.loads(await asyncio.to_thread(lambda: Path(definitions_path).read_text()))
-
-        for lang_name, lang_def in updated_definitions.items():
-            all_definitions[lang_name] = lang_def
-
-        updated_definitions = all_definitions
+    for result in results:
+        if result["new_rev"]:
+            language_definitions[result["language_name"]]["rev"] = result["new_rev"]
 
     print(f"Writing updated language definitions to {definitions_path}")
-    await asyncio.to_thread(lambda: Path(definitions_path).write_text(json.dumps(updated_definitions, indent=2)))
+    await asyncio.to_thread(definitions_path.write_text, json.dumps(language_definitions, indent=2))
 
-    print(f"Done! Updated {len(updated_definitions)} language definitions.")
+    print(f"Done! Updated {len(language_definitions)} language definitions.")
+    return results
 
 
-if __name__ == "__main__":
+def get_argument_parser() -> argparse.ArgumentParser:
+    """Get the command line argument parser.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+    """
     parser = argparse.ArgumentParser(description="Pin tree-sitter language repositories to their latest commits.")
     parser.add_argument("--languages", type=str, help="Comma-separated list of languages to process (default: all)")
     parser.add_argument("--workers", type=int, help="Maximum number of concurrent workers (default: CPU count * 2)")
     parser.add_argument("--only-missing", action="store_true", help="Only update languages without an existing rev")
+    parser.add_argument("--retries", type=int, default=2, help="Number of retries for a failed lookup (default: 2)")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the revisions that would change without writing them"
+    )
+    return parser
 
-    args = parser.parse_args()
 
-    asyncio.run(main(args))
+if __name__ == "__main__":
+    asyncio.run(main(get_argument_parser().parse_args()))
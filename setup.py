@@ -1,63 +1,158 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
 from itertools import chain
-from os import environ, getcwd, listdir
+from json import dumps, loads
+from logging import INFO
+from os import cpu_count, environ, getcwd, listdir
 from pathlib import Path
 from platform import machine, system
+from shutil import copy2, rmtree
+from time import perf_counter
 
 from setuptools import Extension, find_packages, setup
 from setuptools.command.bdist_wheel import bdist_wheel
 from setuptools.command.build_ext import build_ext
+from setuptools.command.build_py import build_py
 
 MIN_PYTHON_VERSION = 310
+# "split" builds one extension module per language, "combined" links all languages into a single extension module.
+BUILD_MODE = environ.get("TSLP_BUILD_MODE", "split")
+COMBINED_EXTENSION_NAME = "_combined"
+EXTERNAL_LANGUAGES = {"csharp", "embeddedtemplate", "yaml"}
+
+# Patterns of the lines of a generated parser.c that carry the metadata of the grammar
+DEFINE_RE = re.compile(r"#define (\w+) (\d+)$")
+ENUM_ENTRY_RE = re.compile(r"\s*(\w+) = (\d+),?$")
+NAMES_ARRAY_RE = re.compile(r"static const char \* ?const (ts_symbol_names|ts_field_names)\[\] = \{$")
+NAMES_ENTRY_RE = re.compile(r'\s*\[(\w+)\] = (?:NULL|"((?:[^"\\]|\\.)*)"),?$')
+C_ESCAPE_RE = re.compile(r"\\(.)")
+C_ESCAPES = {"0": "\0", "a": "\a", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+if BUILD_MODE not in {"split", "combined"}:
+    raise ValueError(f"Invalid TSLP_BUILD_MODE {BUILD_MODE!r}, expected 'split' or 'combined'")
+
+
+def get_selected_languages() -> set[str] | None:
+    """Get the languages selected for the build through TSLP_LANGUAGES and TSLP_PROFILES.
+
+    TSLP_LANGUAGES is a comma-separated list of language names, and TSLP_PROFILES a comma-separated list of profile
+    names defined in sources/language_profiles.json. The selection is the union of both.
+
+    Raises:
+        ValueError: If an unknown profile is requested.
+
+    Returns:
+        set[str] | None: The selected language names, or None if all languages should be built.
+    """
+    languages = {name.strip() for name in environ.get("TSLP_LANGUAGES", "").split(",") if name.strip()}
+    profile_names = {name.strip() for name in environ.get("TSLP_PROFILES", "").split(",") if name.strip()}
+
+    if profile_names:
+        profiles_file = Path(environ.get("PROJECT_ROOT", getcwd())).resolve() / "sources" / "language_profiles.json"  # noqa: PTH109
+        profiles: dict[str, list[str]] = loads(profiles_file.read_text())
+        if unknown_profiles := profile_names - profiles.keys():
+            raise ValueError(
+                f"Unknown profiles in TSLP_PROFILES: {', '.join(sorted(unknown_profiles))}. "
+                f"Available profiles: {', '.join(sorted(profiles))}"
+            )
+        for profile_name in profile_names:
+            languages.update(profiles[profile_name])
+
+    return languages or None
 
 
 def get_mapped_parsers() -> dict[str, Path]:
-    """Get the language definitions."""
+    """Get the language definitions.
+
+    Raises:
+        ValueError: If a selected language has no parser.
+    """
     parsers_dir = Path(environ.get("PROJECT_ROOT", getcwd())).resolve() / "parsers"  # noqa: PTH109
-    return {dir_name: (parsers_dir / dir_name) for dir_name in listdir(parsers_dir)}  # noqa: PTH208
+    # Skip files such as the vendoring manifest written by scripts/clone_vendors.py
+    mapped_parsers = {
+        dir_name: (parsers_dir / dir_name)
+        for dir_name in listdir(parsers_dir)  # noqa: PTH208
+        if (parsers_dir / dir_name).is_dir()
+    }
 
+    selected_languages = get_selected_languages()
+    if selected_languages is None:
+        return mapped_parsers
 
-def create_extension(*, language_name: str) -> Extension:
-    """Create an extension for the given language.
+    # These languages are provided by third-party packages and are always available at runtime
+    selected_languages -= EXTERNAL_LANGUAGES
+    if unknown_languages := selected_languages - mapped_parsers.keys():
+        raise ValueError(f"No parsers found for the selected languages: {', '.join(sorted(unknown_languages))}")
 
-    Args:
-        language_name: The name of the language.
+    return {language_name: mapped_parsers[language_name] for language_name in sorted(selected_languages)}
+
+
+def get_compile_args() -> list[str]:
+    """Get the compiler arguments for the current platform.
 
     Returns:
-        Extension: The extension for the language.
+        list[str]: The compiler arguments.
     """
     is_msys2 = "MSYSTEM" in environ
     is_windows = system() == "Windows"
 
     if is_windows and not is_msys2:
         # Windows with MSVC
-        compile_args = [
+        return [
             "/std:c11",
             "/utf-8",
             "/wd4244",  # Suppress warnings about integer type conversion
             "/wd4566",  # Suppress warnings about character representation
             "/wd4819",  # Suppress warnings about source files with encoding issues
         ]
-    else:
-        # Unix-like systems or MSYS2
-        compile_args = [
-            "-fvisibility=hidden",
-            "-std=c11",
-        ]
 
-    define_macros = [
+    # Unix-like systems or MSYS2
+    return [
+        "-fvisibility=hidden",
+        "-std=c11",
+    ]
+
+
+def get_define_macros(*, language_name: str | None = None) -> list[tuple[str, str | None]]:
+    """Get the preprocessor macros for the current platform.
+
+    Args:
+        language_name: The name of the language, for extensions that wrap a single language.
+
+    Returns:
+        list[tuple[str, str | None]]: The preprocessor macros.
+    """
+    define_macros: list[tuple[str, str | None]] = [
         ("PY_SSIZE_T_CLEAN", None),
         ("TREE_SITTER_HIDE_SYMBOLS", None),
-        ("TS_LANGUAGE_NAME", language_name),
     ]
 
-    if is_windows:
+    if language_name:
+        define_macros.append(("TS_LANGUAGE_NAME", language_name))
+
+    if system() == "Windows":
         define_macros.append(("Py_LIMITED_API", "0x030A0000"))  # Python 3.10+
 
+    return define_macros
+
+
+def create_extension(*, language_name: str) -> Extension:
+    """Create an extension for the given language.
+
+    Args:
+        language_name: The name of the language, or COMBINED_EXTENSION_NAME for the extension bundling all languages.
+
+    Returns:
+        Extension: The extension for the language.
+    """
     return Extension(
         name=f"tree_sitter_language_pack.bindings.{language_name}",
         py_limited_api=True,
-        define_macros=define_macros,
-        extra_compile_args=compile_args,
+        define_macros=get_define_macros(
+            language_name=None if language_name == COMBINED_EXTENSION_NAME else language_name
+        ),
+        extra_compile_args=get_compile_args(),
         sources=[],
     )
 
@@ -65,7 +160,11 @@ def create_extension(*, language_name: str) -> Extension:
 # Get the mapped parsers
 mapped_parsers = get_mapped_parsers()
 # Create extensions for all languages defined in the JSON file
-extensions = [create_extension(language_name=language_name) for language_name in mapped_parsers]
+extensions = (
+    [create_extension(language_name=COMBINED_EXTENSION_NAME)]
+    if BUILD_MODE == "combined"
+    else [create_extension(language_name=language_name) for language_name in mapped_parsers]
+)
 # Add the data files for the parsers
 data_files = [
     str(value)
@@ -74,12 +173,218 @@ data_files = [
 ]
 
 
+def copy_query_files() -> None:
+    """Copy the queries/*.scm files of the selected grammars into the package.
+
+    The files are copied to tree_sitter_language_pack/query_files/<language>/ in the source tree, like the extensions
+    built in place, so that editable installs and in-place builds find them too.
+    """
+    query_files_dir = Path(getcwd()) / "tree_sitter_language_pack" / "query_files"  # noqa: PTH109
+    rmtree(query_files_dir, ignore_errors=True)
+    for language_name, parser_dir in mapped_parsers.items():
+        for query_file in sorted((parser_dir / "queries").glob("*.scm")):
+            target = query_files_dir / language_name / query_file.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            copy2(query_file, target)
+
+
+def read_grammar_metadata(parser_dir: Path) -> dict[str, object]:  # noqa: C901
+    """Read the metadata of a grammar from its generated parser.c, without compiling or loading it.
+
+    Only the header of parser.c is read, up to the symbol and field names, so this is cheap even for grammars whose
+    parse tables span hundreds of megabytes.
+
+    Args:
+        parser_dir: The directory of the grammar.
+
+    Raises:
+        ValueError: If parser.c does not declare the symbol names.
+
+    Returns:
+        dict[str, object]: The ABI version, the node kind names and field names indexed by id, whether the grammar has
+            an external scanner and the size of the C sources compiled into its extension.
+    """
+    src_dir = parser_dir / "src"
+    defines: dict[str, int] = {}
+    enum_values = {"ts_builtin_sym_end": 0}
+    names_arrays: dict[str, dict[int, str]] = {}
+    current_array: dict[int, str] | None = None
+    in_enum = False
+
+    with (src_dir / "parser.c").open(encoding="utf-8") as parser_file:
+        for line in parser_file:
+            if in_enum:
+                if line.startswith("};"):
+                    in_enum = False
+                elif match := ENUM_ENTRY_RE.match(line):
+                    enum_values[match[1]] = int(match[2])
+            elif current_array is not None:
+                if line.startswith("};"):
+                    current_array = None
+                    # Grammars without fields do not declare ts_field_names
+                    if "ts_symbol_names" in names_arrays and (
+                        "ts_field_names" in names_arrays or not defines.get("FIELD_COUNT")
+                    ):
+                        break
+                elif (match := NAMES_ENTRY_RE.match(line)) and match[2] is not None:
+                    key = match[1]
+                    name = C_ESCAPE_RE.sub(lambda escape: C_ESCAPES.get(escape[1], escape[1]), match[2])
+                    # Names are C strings, so an escaped NUL ends them
+                    current_array[int(key) if key.isdigit() else enum_values[key]] = name.partition("\0")[0]
+            elif line.startswith("enum"):
+                in_enum = True
+            elif match := NAMES_ARRAY_RE.match(line):
+                current_array = names_arrays[match[1]] = {}
+            elif match := DEFINE_RE.match(line):
+                defines[match[1]] = int(match[2])
+
+    if "ts_symbol_names" not in names_arrays:
+        raise ValueError(f"No symbol names found in {src_dir / 'parser.c'}")
+
+    symbol_names = names_arrays["ts_symbol_names"]
+    field_names = names_arrays.get("ts_field_names", {})
+    return {
+        "abi_version": defines["LANGUAGE_VERSION"],
+        "kind_names": [
+            symbol_names.get(kind_id, "") for kind_id in range(defines["SYMBOL_COUNT"] + defines["ALIAS_COUNT"])
+        ],
+        "field_names": [field_names.get(field_id, "") for field_id in range(defines.get("FIELD_COUNT", 0) + 1)],
+        "has_external_scanner": any(src_dir.glob("scanner.c*")),
+        "source_bytes": sum(path.stat().st_size for path in src_dir.glob("*.c")),
+    }
+
+
+def write_language_index() -> None:
+    """Write the metadata of the selected grammars to tree_sitter_language_pack/language_index.json.
+
+    The index lets the package describe its languages without loading their extensions. Each entry combines the
+    metadata read from the generated parser with the repository and revision from sources/language_definitions.json.
+    """
+    project_root = Path(environ.get("PROJECT_ROOT", getcwd())).resolve()  # noqa: PTH109
+    definitions: dict[str, dict[str, str]] = loads((project_root / "sources" / "language_definitions.json").read_text())
+    with ThreadPoolExecutor() as executor:
+        metadata = dict(zip(mapped_parsers, executor.map(read_grammar_metadata, mapped_parsers.values()), strict=True))
+
+    index = {
+        language_name: {
+            "repo": definitions.get(language_name, {}).get("repo"),
+            "rev": definitions.get(language_name, {}).get("rev"),
+            **metadata[language_name],
+        }
+        for language_name in sorted(mapped_parsers)
+    }
+    index_path = Path(getcwd()) / "tree_sitter_language_pack" / "language_index.json"  # noqa: PTH109
+    index_path.write_text(dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
 class BuildExt(build_ext):
-    """Custom build extension to handle tree-sitter language repositories."""
+    """Custom build extension to handle tree-sitter language repositories.
+
+    Extensions are built concurrently (TSLP_BUILD_JOBS, defaults to the number of CPUs) and cached by a hash of their
+    sources and compiler settings in TSLP_BUILD_CACHE (defaults to build/extension-cache, "off" disables the cache),
+    so unchanged grammars are not recompiled.
+    """
+
+    def finalize_options(self) -> None:
+        """Finalize the command options."""
+        super().finalize_options()
+        if not self.parallel:
+            self.parallel = int(environ.get("TSLP_BUILD_JOBS", cpu_count() or 1))
+
+        cache_setting = environ.get("TSLP_BUILD_CACHE", "")
+        self.cache_dir: Path | None = (
+            None
+            if cache_setting.lower() == "off"
+            else Path(cache_setting or Path(self.build_temp).parent / "extension-cache").resolve()
+        )
+        self.timings: dict[str, tuple[float, bool]] = {}
+
+    def build_extensions(self) -> None:
+        """Build all extensions and report where the build time went."""
+        copy_query_files()
+        write_language_index()
+        start = perf_counter()
+        super().build_extensions()
+        elapsed = perf_counter() - start
+
+        built = sorted(
+            ((duration, name) for name, (duration, cached) in self.timings.items() if not cached), reverse=True
+        )
+        cached_count = len(self.timings) - len(built)
+        self.announce(
+            f"Built {len(built)} and restored {cached_count} cached extensions in {elapsed:.1f}s "
+            f"using {self.parallel} jobs",
+            level=INFO,
+        )
+        for duration, name in built[:10]:
+            self.announce(f"  {name}: {duration:.1f}s", level=INFO)
 
     def build_extension(self, ext: Extension) -> None:
-        """Build the extension."""
+        """Build the extension, or restore it from the build cache if its inputs are unchanged."""
         language_name = ext.name.split(".")[-1]
+        ext_path = Path(self.get_ext_fullpath(ext.name))
+        cache_path = self.get_cache_path(ext, language_name)
+
+        start = perf_counter()
+        cached = cache_path is not None and cache_path.is_file()
+        if cache_path is not None and cached:
+            ext_path.parent.mkdir(parents=True, exist_ok=True)
+            copy2(cache_path, ext_path)
+        else:
+            if language_name == COMBINED_EXTENSION_NAME:
+                self.build_combined_extension(ext)
+            else:
+                self.build_language_extension(ext, language_name)
+
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                copy2(ext_path, cache_path)
+
+        duration = perf_counter() - start
+        self.timings[language_name] = (duration, cached)
+        self.announce(f"{language_name}: {'restored from cache' if cached else 'built'} in {duration:.1f}s", level=INFO)
+
+    def get_cache_path(self, ext: Extension, language_name: str) -> Path | None:
+        """Get the build cache entry of the extension.
+
+        The key covers the content of every file the extension is built from, the extension settings, the compiler
+        command and the extension filename, which encodes the Python ABI.
+
+        Args:
+            ext: The extension.
+            language_name: The name of the language, or COMBINED_EXTENSION_NAME.
+
+        Returns:
+            Path | None: The path of the cache entry, or None if the cache is disabled.
+        """
+        if self.cache_dir is None:
+            return None
+
+        cwd = Path(getcwd())  # noqa: PTH109
+        language_names = sorted(mapped_parsers) if language_name == COMBINED_EXTENSION_NAME else [language_name]
+        input_files = [cwd / "sources" / "language_extension.c", cwd / "sources" / "combined_extension.c"]
+        for name in language_names:
+            input_files.extend(sorted(path for path in mapped_parsers[name].rglob("*") if path.is_file()))
+
+        digest = sha256()
+        for value in (
+            ext.name,
+            self.get_ext_filename(ext.name),
+            repr(ext.define_macros),
+            repr(ext.extra_compile_args),
+            repr(getattr(self.compiler, "compiler_so", type(self.compiler).__name__)),
+        ):
+            digest.update(value.encode())
+        for input_file in input_files:
+            digest.update(str(input_file.relative_to(cwd)).encode())
+            digest.update(input_file.read_bytes())
+
+        return (
+            self.cache_dir / f"{language_name}-{digest.hexdigest()[:32]}{Path(self.get_ext_filename(ext.name)).suffix}"
+        )
+
+    def build_language_extension(self, ext: Extension, language_name: str) -> None:
+        """Build the extension of a single language."""
         cwd = Path(getcwd())  # noqa: PTH109
 
         # Add the language extension source file
@@ -98,6 +403,58 @@ class BuildExt(build_ext):
 
         super().build_extension(ext)
 
+    def build_combined_extension(self, ext: Extension) -> None:
+        """Build a single extension that links the parsers of all languages.
+
+        Each grammar ships its own tree_sitter/parser.h, so the parser sources are compiled per language with their
+        own include directory, concurrently, and then linked together with a generated dispatch table.
+        """
+        cwd = Path(getcwd())  # noqa: PTH109
+
+        combined_extension = (cwd / "sources" / "combined_extension.c").resolve()
+        if not combined_extension.is_file():
+            raise FileNotFoundError(f"Combined extension file not found: {combined_extension}")
+
+        build_temp = Path(self.build_temp).resolve()
+        build_temp.mkdir(parents=True, exist_ok=True)
+        language_names = sorted(mapped_parsers)
+        (build_temp / "combined_languages.h").write_text(
+            "".join(f"TS_LANGUAGE({language_name})\n" for language_name in language_names)
+        )
+
+        def compile_language(language_name: str) -> list[str]:
+            start = perf_counter()
+            parser_src_dir = mapped_parsers[language_name] / "src"
+            objects = self.compiler.compile(
+                [str(src_file_path.relative_to(cwd)) for src_file_path in parser_src_dir.glob("*.c")],
+                output_dir=self.build_temp,
+                macros=get_define_macros(language_name=language_name),
+                include_dirs=[str(parser_src_dir)],
+                debug=self.debug,
+                extra_postargs=get_compile_args(),
+            )
+            self.announce(f"{language_name}: compiled in {perf_counter() - start:.1f}s", level=INFO)
+            return objects
+
+        with ThreadPoolExecutor(max_workers=int(self.parallel)) as executor:
+            objects = list(chain.from_iterable(executor.map(compile_language, language_names)))
+
+        ext.sources = [str(combined_extension.relative_to(cwd))]
+        ext.include_dirs = [str(build_temp)]
+        ext.extra_objects = objects
+
+        super().build_extension(ext)
+
+
+class BuildPy(build_py):
+    """Custom build_py command that bundles the query files and the metadata index of the grammars with the package."""
+
+    def run(self) -> None:
+        """Copy the query files and the metadata index into the package and build it."""
+        copy_query_files()
+        write_language_index()
+        super().run()
+
 
 class BdistWheel(bdist_wheel):
     """Custom bdist_wheel command to handle Python 3.10+ ABI tag."""
@@ -126,12 +483,13 @@ class BdistWheel(bdist_wheel):
 
 setup(
     packages=find_packages(include=["tree_sitter_language_pack", "tree_sitter_language_pack.bindings"]),
-    package_data={"tree_sitter_language_pack": ["py.typed"]},
+    package_data={"tree_sitter_language_pack": ["py.typed", "query_files/*/*.scm", "language_index.json"]},
     data_files=[("parsers", data_files)],
     ext_modules=extensions,
     include_package_data=True,
     cmdclass={
         "build_ext": BuildExt,
+        "build_py": BuildPy,
         "bdist_wheel": BdistWheel,
     },
     options={"build_ext": {"inplace": True}},
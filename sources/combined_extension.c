@@ -0,0 +1,85 @@
+#include <Python.h>
+#include <stdlib.h>
+#include <string.h>
+
+typedef struct TSLanguage TSLanguage;
+
+// combined_languages.h is generated by setup.py and contains one TS_LANGUAGE(<language_name>) line per language,
+// sorted by language name.
+#define TS_LANGUAGE(name) TSLanguage *tree_sitter_##name(void);
+#include "combined_languages.h"
+#undef TS_LANGUAGE
+
+typedef struct {
+    const char *name;
+    TSLanguage *(*function)(void);
+} LanguageEntry;
+
+// Dispatch table mapping each language name to its tree_sitter_<language_name> function, sorted by name
+static const LanguageEntry languages[] = {
+#define TS_LANGUAGE(name) {#name, tree_sitter_##name},
+#include "combined_languages.h"
+#undef TS_LANGUAGE
+};
+
+#define LANGUAGE_COUNT (sizeof(languages) / sizeof(languages[0]))
+
+static int compare_language_entry(const void *key, const void *entry) {
+    return strcmp((const char *)key, ((const LanguageEntry *)entry)->name);
+}
+
+// Python method that looks up a language by name and returns a pointer to its TSLanguage struct
+static PyObject *language(PyObject *Py_UNUSED(self), PyObject *name) {
+    const char *language_name = PyUnicode_AsUTF8AndSize(name, NULL);
+    if (language_name == NULL) {
+        return NULL;
+    }
+
+    const LanguageEntry *entry =
+        bsearch(language_name, languages, LANGUAGE_COUNT, sizeof(LanguageEntry), compare_language_entry);
+    if (entry == NULL) {
+        PyErr_Format(PyExc_LookupError, "Could not find language library for %s", language_name);
+        return NULL;
+    }
+
+    return PyCapsule_New(entry->function(), "tree_sitter.Language", NULL);
+}
+
+// Python method that returns the names of all languages in the dispatch table
+static PyObject *language_names(PyObject *Py_UNUSED(self), PyObject *Py_UNUSED(args)) {
+    PyObject *names = PyTuple_New(LANGUAGE_COUNT);
+    if (names == NULL) {
+        return NULL;
+    }
+
+    for (size_t i = 0; i < LANGUAGE_COUNT; i++) {
+        PyObject *name = PyUnicode_FromString(languages[i].name);
+        if (name == NULL || PyTuple_SetItem(names, i, name) < 0) {
+            Py_DECREF(names);
+            return NULL;
+        }
+    }
+
+    return names;
+}
+
+// Method definition table for the module
+static PyMethodDef methods[] = {
+    {"language", language, METH_O, "Get the tree-sitter language for the given grammar name."},
+    {"languages", language_names, METH_NOARGS, "Get the names of all grammars in this module."},
+    {NULL, NULL, 0, NULL}
+};
+
+// Module definition structure
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "_combined",
+    .m_doc = "All tree-sitter grammars of the language pack, linked into a single shared object.",
+    .m_size = -1,
+    .m_methods = methods
+};
+
+// Module initialization function
+PyMODINIT_FUNC PyInit__combined(void) {
+    return PyModule_Create(&module);
+}
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+from threading import Event
+from typing import TYPE_CHECKING
+
+import pytest
+from tree_sitter import Parser
+
+from tree_sitter_language_pack import (
+    AsyncParseExecutor,
+    ParseResult,
+    SupportedLanguage,
+    aget_parser,
+    aparse,
+    aparse_many,
+    get_parser,
+)
+from tree_sitter_language_pack.aio import _Lane
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+SOURCES: list[tuple[SupportedLanguage, bytes]] = [
+    ("python", b"def f(): pass"),
+    ("json", b"[1, 2]"),
+    ("python", b"x = 1"),
+    ("javascript", b"let a = 1;"),
+]
+ROOT_TYPES = ["module", "document", "module", "program"]
+LARGE_SOURCE = b"def f(x):\n    return [x, 2, 'abc']\n" * 30000
+
+
+async def collect(results: AsyncIterator[ParseResult]) -> list[ParseResult]:
+    return [result async for result in results]
+
+
+def test_aparse() -> None:
+    tree = asyncio.run(aparse("python", b"x = 1"))
+
+    assert str(tree.root_node) == str(get_parser("python").parse(b"x = 1").root_node)
+
+
+def test_aparse_large_source_in_slices() -> None:
+    source = "s = '😀é'\n".encode() * 20000
+    executor = AsyncParseExecutor(workers=1, large_source_bytes=1024)
+
+    tree = asyncio.run(executor.parse("python", source))
+
+    assert str(tree.root_node) == str(get_parser("python").parse(source).root_node)
+    executor.shutdown()
+
+
+def test_aget_parser() -> None:
+    parser = asyncio.run(aget_parser("json"))
+
+    assert isinstance(parser, Parser)
+    assert parser.parse(b"{}").root_node.type == "document"
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_aparse_many(ordered: bool) -> None:
+    results = asyncio.run(collect(aparse_many(SOURCES, ordered=ordered, max_in_flight=2)))
+
+    results.sort(key=lambda result: result.index)
+    assert [result.index for result in results] == list(range(len(SOURCES)))
+    assert [result.tree.root_node.type for result in results if result.tree] == ROOT_TYPES
+
+
+def test_aparse_many_from_async_iterable_reports_errors() -> None:
+    async def items() -> AsyncIterator[tuple[SupportedLanguage, bytes]]:
+        yield "python", b"x = 1"
+        yield "invalid", b"x = 1"  # type: ignore[misc]
+        yield "python", "not bytes"  # type: ignore[misc]
+
+    results = asyncio.run(collect(aparse_many(items())))
+
+    assert results[0].ok
+    assert isinstance(results[1].error, LookupError)
+    assert isinstance(results[2].error, TypeError)
+
+
+def test_aparse_many_bounds_items_in_flight() -> None:
+    max_in_flight = 3
+    consumed = 0
+
+    async def items() -> AsyncIterator[tuple[SupportedLanguage, bytes]]:
+        nonlocal consumed
+        for _ in range(20):
+            consumed += 1
+            yield "python", b"x = 1"
+
+    async def main() -> None:
+        yielded = 0
+        async for _ in aparse_many(items(), max_in_flight=max_in_flight):
+            yielded += 1
+            assert consumed - yielded < max_in_flight
+
+    asyncio.run(main())
+
+
+def test_timeout_cancels_the_parse() -> None:
+    executor = AsyncParseExecutor(workers=1, large_workers=1, large_source_bytes=1024)
+
+    async def main() -> None:
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.parse("python", LARGE_SOURCE, timeout=0.001)
+        # The large thread is handed on once the cancelled parse stopped
+        tree = await executor.parse("python", LARGE_SOURCE[:2048], timeout=10)
+        assert not tree.root_node.has_error
+
+    asyncio.run(main())
+    executor.shutdown()
+
+
+def test_cancelled_parse_stops_reading() -> None:
+    executor = AsyncParseExecutor(workers=1)
+    cancelled = Event()
+    cancelled.set()
+
+    tree = executor._parse(cancelled, "python", LARGE_SOURCE, None)  # noqa: SLF001
+
+    assert tree.root_node.end_byte == 0
+    executor.shutdown()
+
+
+def test_large_sources_do_not_delay_small_ones() -> None:
+    executor = AsyncParseExecutor(workers=1, large_workers=1, large_source_bytes=len(LARGE_SOURCE))
+
+    async def main() -> None:
+        large = asyncio.create_task(executor.parse("python", LARGE_SOURCE))
+        await asyncio.sleep(0.01)
+        await executor.parse("python", b"x = 1")
+        assert not large.done()
+        large.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await large
+
+    asyncio.run(main())
+    executor.shutdown()
+
+
+def test_lane_hands_threads_out_in_order() -> None:
+    lane = _Lane(1, "test-lane")
+
+    async def main() -> None:
+        await lane.acquire()
+        first = asyncio.create_task(lane.acquire())
+        second = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert not first.done()
+
+        # A cancelled waiter gives up its place in the queue
+        first.cancel()
+        await asyncio.sleep(0)
+        lane.release()
+        await second
+        assert first.cancelled()
+
+        lane.release()
+        await lane.acquire()
+
+    asyncio.run(main())
+    lane.executor.shutdown()
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="must be positive integers"):
+        AsyncParseExecutor(workers=0)
+    with pytest.raises(ValueError, match="max_in_flight must be a positive integer"):
+        asyncio.run(collect(aparse_many(SOURCES, max_in_flight=0)))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import ParseResult, SupportedLanguage, parse_many
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+SOURCES: list[tuple[SupportedLanguage, bytes]] = [
+    ("python", b"def f(): pass"),
+    ("yaml", b"key: value"),
+    ("python", b"x = 1"),
+    ("csharp", b"class A {}"),
+    ("yaml", b"- item"),
+]
+ROOT_TYPES = ["module", "stream", "module", "compilation_unit", "stream"]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parse_many_yields_results_in_input_order(workers: int) -> None:
+    results = list(parse_many(SOURCES, workers=workers, chunk_size=2))
+
+    assert [result.index for result in results] == list(range(len(SOURCES)))
+    assert [result.language for result in results] == [language for language, _ in SOURCES]
+    assert [result.tree.root_node.type for result in results if result.tree] == ROOT_TYPES
+    assert all(result.ok for result in results)
+
+
+def test_parse_many_in_completion_order() -> None:
+    results = list(parse_many(SOURCES, workers=2, ordered=False))
+
+    assert sorted(result.index for result in results) == list(range(len(SOURCES)))
+
+
+def test_parse_many_reports_errors() -> None:
+    items: list[tuple[SupportedLanguage, bytes]] = [
+        ("python", b"x = 1"),
+        ("invalid", b"x = 1"),  # type: ignore[list-item]
+        ("python", "not bytes"),  # type: ignore[list-item]
+    ]
+
+    results = list(parse_many(items, workers=2))
+
+    assert results[0].ok
+    assert isinstance(results[1].error, LookupError)
+    assert results[1].tree is None
+    assert isinstance(results[2].error, TypeError)
+
+
+def test_parse_many_bounds_items_in_flight() -> None:
+    max_in_flight = 3
+    total = 20
+    consumed = 0
+
+    def sources() -> Iterator[tuple[SupportedLanguage, bytes]]:
+        nonlocal consumed
+        for _ in range(total):
+            consumed += 1
+            yield "python", b"x = 1"
+
+    results = parse_many(sources(), workers=2, max_in_flight=max_in_flight)
+    first: ParseResult = next(results)
+
+    assert first.index == 0
+    assert consumed <= max_in_flight + 1
+    assert len(list(results)) == total - 1
+
+
+def test_parse_many_rejects_invalid_configuration() -> None:
+    with pytest.raises(ValueError, match="positive"):
+        list(parse_many(SOURCES, chunk_size=0))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+from tree_sitter import Parser
+
+from tree_sitter_language_pack import (
+    CircuitBreaker,
+    SupportedLanguage,
+    get_circuit_breaker,
+    get_parser,
+    parse_many_with_budget,
+    parse_with_budget,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Takes well over a second to parse
+NESTED_SOURCE = b"[" * 1_000_000 + b"]" * 1_000_000
+TIMEOUT = 0.001
+THREADS = 8
+PARSES = 5000
+
+# pytest shows deprecation warnings regardless of the filter the module installs
+pytestmark = pytest.mark.filterwarnings("ignore:Use the progress_callback:DeprecationWarning")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    now = [0.0]
+    monkeypatch.setattr("tree_sitter_language_pack.budget.monotonic", lambda: now[0])
+
+    def advance(seconds: float) -> None:
+        now[0] += seconds
+
+    return advance
+
+
+def test_parse_with_budget() -> None:
+    result = parse_with_budget("json", b"[1]", timeout=10, max_bytes=3, breaker=CircuitBreaker())
+
+    assert result.ok
+    assert result.tree is not None
+    assert str(result.tree.root_node) == "(document (array (number)))"
+    assert result.seconds > 0
+
+
+def test_timeout_aborts_the_parse() -> None:
+    parser = get_parser("json")
+
+    result = parse_with_budget("json", NESTED_SOURCE, timeout=TIMEOUT, breaker=CircuitBreaker(), parser=parser)
+
+    assert (result.status, result.tree, result.ok) == ("timeout", None, False)
+    assert result.seconds < 1
+    # The aborted parse is not resumed by the next parse
+    assert str(parser.parse(b"[1]").root_node) == "(document (array (number)))"
+
+
+def test_timeout_of_the_parser_is_restored() -> None:
+    parser = get_parser("json")
+    parser.timeout_micros = 5_000_000  # type: ignore[misc]
+
+    assert parse_with_budget("json", b"[1]", timeout=TIMEOUT * 100, breaker=CircuitBreaker(), parser=parser).ok
+    assert parser.timeout_micros == 5_000_000  # noqa: PLR2004
+
+
+def test_oversized_sources_are_not_parsed() -> None:
+    result = parse_with_budget("json", b"[1, 2]", max_bytes=5, breaker=CircuitBreaker())
+
+    assert (result.status, result.tree, result.seconds) == ("oversized", None, 0.0)
+
+
+def test_errors_are_reported() -> None:
+    result = parse_with_budget("invalid", b"x", breaker=CircuitBreaker())  # type: ignore[arg-type]
+
+    assert result.status == "error"
+    assert isinstance(result.error, LookupError)
+
+
+def test_parse_failures_are_not_overruns() -> None:
+    breaker = CircuitBreaker(threshold=1)
+
+    # A parser without a language fails like an aborted parse, but well within the budget
+    result = parse_with_budget("json", b"[1]", timeout=10, breaker=breaker, parser=Parser())
+
+    assert result.status == "error"
+    assert isinstance(result.error, ValueError)
+    assert breaker.state("json") == "closed"
+
+
+def test_circuit_breaker_opens_after_repeated_overruns(clock: Callable[[float], None]) -> None:
+    breaker = CircuitBreaker(threshold=2, window=10, cooldown=60)
+
+    assert parse_with_budget("json", NESTED_SOURCE, timeout=TIMEOUT, breaker=breaker).status == "timeout"
+    assert breaker.state("json") == "closed"
+    assert parse_with_budget("json", NESTED_SOURCE, timeout=TIMEOUT, breaker=breaker).status == "timeout"
+    assert breaker.state("json") == "open"
+
+    assert parse_with_budget("json", b"[1]", timeout=TIMEOUT, breaker=breaker).status == "circuit_open"
+    # Other languages are not affected
+    assert parse_with_budget("python", b"x = 1", breaker=breaker).ok
+
+    clock(60)
+    assert breaker.state("json") == "half_open"
+    assert parse_with_budget("json", b"[1]", breaker=breaker).ok
+    assert breaker.state("json") == "closed"
+
+
+def test_failed_trial_reopens_the_circuit(clock: Callable[[float], None]) -> None:
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record_overrun("json")
+    clock(60)
+
+    assert breaker.allow("json")
+    # Only a single trial parse is let through
+    assert not breaker.allow("json")
+    breaker.record_overrun("json")
+    assert breaker.state("json") == "open"
+
+    clock(59)
+    assert not breaker.allow("json")
+    breaker.reset("json")
+    assert breaker.state("json") == "closed"
+
+
+def test_overruns_expire_after_the_window(clock: Callable[[float], None]) -> None:
+    breaker = CircuitBreaker(threshold=2, window=10)
+
+    breaker.record_overrun("json")
+    clock(10)
+    breaker.record_overrun("json")
+    assert breaker.state("json") == "closed"
+    clock(9)
+    breaker.record_overrun("json")
+    assert breaker.state("json") == "open"
+
+
+def test_parse_many_with_budget() -> None:
+    items: list[tuple[SupportedLanguage, bytes]] = [
+        ("json", b"[1]"),
+        ("json", NESTED_SOURCE),
+        ("python", b"x" * 100),
+        ("invalid", b"x"),  # type: ignore[list-item]
+    ]
+
+    results = list(parse_many_with_budget(items, timeout=TIMEOUT * 100, max_bytes=99, breaker=CircuitBreaker()))
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert [result.status for result in results] == ["ok", "oversized", "oversized", "error"]
+
+    results = list(parse_many_with_budget(items[:2], timeout=TIMEOUT, breaker=CircuitBreaker()))
+
+    assert [result.status for result in results] == ["ok", "timeout"]
+
+
+def test_concurrent_budgets_leave_the_warning_filters_alone() -> None:
+    filters = warnings.filters
+    filter_list = list(filters)
+    breaker = CircuitBreaker()
+
+    def parse_repeatedly(_: int) -> bool:
+        parser = get_parser("json")
+        return all(
+            parse_with_budget("json", b"[1]", timeout=10, breaker=breaker, parser=parser).ok for _ in range(PARSES)
+        )
+
+    # Switch threads often, so that changes of the filters by overlapping parses would interleave
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            assert all(executor.map(parse_repeatedly, range(THREADS)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert warnings.filters is filters
+    assert warnings.filters == filter_list
+
+
+def test_default_breaker() -> None:
+    assert get_circuit_breaker() is get_circuit_breaker()
+    assert get_circuit_breaker().state("json") == "closed"
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="timeout must be a positive number"):
+        parse_with_budget("json", b"[]", timeout=0)
+    with pytest.raises(ValueError, match="max_bytes must be a positive integer"):
+        list(parse_many_with_budget([("json", b"[]")], max_bytes=0))
+    with pytest.raises(ValueError, match="threshold must be a positive integer"):
+        CircuitBreaker(threshold=0)
+    with pytest.raises(ValueError, match="window and cooldown must be positive numbers"):
+        CircuitBreaker(cooldown=0)
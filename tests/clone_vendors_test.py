@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+from shutil import rmtree
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from git import Repo
+from scripts import clone_vendors
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+GRAMMARS = 10
+CLONE_JOBS = 3
+MOVE_JOBS = 2
+
+
+@pytest.fixture
+def grammar_repository(tmp_path: Path) -> tuple[str, str]:
+    work_tree = tmp_path / "grammar"
+    repo = Repo.init(work_tree, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "test")
+        config.set_value("user", "email", "test@example.com")
+        config.set_value("uploadpack", "allowAnySHA1InWant", "true")
+        config.set_value("uploadpack", "allowFilter", "true")
+
+    for directory in ("src", "common", "queries", "docs"):
+        (work_tree / directory).mkdir()
+    (work_tree / "src" / "parser.c").write_text("/* first */")
+    (work_tree / "common" / "scanner.h").write_text("/* common */")
+    (work_tree / "queries" / "tags.scm").write_text("(identifier) @name")
+    (work_tree / "docs" / "index.md").write_text("# docs")
+    repo.git.add(all=True)
+    repo.index.commit("first")
+    first_sha = repo.head.commit.hexsha
+
+    (work_tree / "src" / "parser.c").write_text("/* second */")
+    repo.git.add(all=True)
+    repo.index.commit("second")
+
+    return f"file://{work_tree}", first_sha
+
+
+@pytest.fixture
+def multi_grammar_repository(tmp_path: Path) -> tuple[str, str]:
+    work_tree = tmp_path / "grammars"
+    repo = Repo.init(work_tree, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "test")
+        config.set_value("user", "email", "test@example.com")
+        config.set_value("uploadpack", "allowAnySHA1InWant", "true")
+        config.set_value("uploadpack", "allowFilter", "true")
+
+    for directory in ("one", "two"):
+        (work_tree / directory / "src").mkdir(parents=True)
+        (work_tree / directory / "src" / "parser.c").write_text(f"/* {directory} */")
+    repo.git.add(all=True)
+    repo.index.commit("grammars")
+
+    return f"file://{work_tree}", repo.head.commit.hexsha
+
+
+@pytest.fixture(autouse=True)
+def vendor_directories(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    vendor_directory = tmp_path / "vendor"
+    monkeypatch.setattr(clone_vendors, "vendor_directory", vendor_directory)
+    monkeypatch.setattr(clone_vendors, "vendor_cache_directory", tmp_path / "cache")
+    return vendor_directory
+
+
+def test_sparse_fetch_of_pinned_revision(grammar_repository: tuple[str, str], vendor_directories: Path) -> None:
+    repo_url, first_sha = grammar_repository
+
+    report = asyncio.run(clone_vendors.clone_repository(repo_url, None, "grammar", rev=first_sha, sparse=True))
+
+    checkout = vendor_directories / "grammar"
+    assert (checkout / "src" / "parser.c").read_text() == "/* first */"
+    assert (checkout / "common" / "scanner.h").exists()
+    assert (checkout / "queries" / "tags.scm").exists()
+    assert not (checkout / "docs").exists()
+    assert Repo(checkout).git.rev_list("--count", "HEAD") == "1"
+    assert report["bytes_transferred"] > 0
+    assert not report["cached"]
+
+
+def test_pinned_revision_is_restored_from_cache(grammar_repository: tuple[str, str], vendor_directories: Path) -> None:
+    repo_url, first_sha = grammar_repository
+    asyncio.run(clone_vendors.clone_repository(repo_url, None, "grammar", rev=first_sha))
+    rmtree(vendor_directories)
+
+    report = asyncio.run(clone_vendors.clone_repository(repo_url, None, "grammar", rev=first_sha, sparse=True))
+
+    checkout = vendor_directories / "grammar"
+    assert (checkout / "src" / "parser.c").read_text() == "/* first */"
+    assert not (checkout / clone_vendors.CACHE_COMPLETE_MARKER).exists()
+    assert report["cached"]
+    assert report["bytes_transferred"] == 0
+
+
+def test_sparse_checkouts_of_grammar_directories_are_cached_separately(
+    multi_grammar_repository: tuple[str, str], vendor_directories: Path
+) -> None:
+    repo_url, sha = multi_grammar_repository
+
+    for directory in ("one", "two"):
+        report = asyncio.run(
+            clone_vendors.clone_repository(repo_url, None, directory, rev=sha, directory=directory, sparse=True)
+        )
+
+        assert not report["cached"]
+        assert (vendor_directories / directory / directory / "src" / "parser.c").read_text() == f"/* {directory} */"
+
+    rmtree(vendor_directories)
+    report = asyncio.run(clone_vendors.clone_repository(repo_url, None, "two", rev=sha, directory="two", sparse=True))
+
+    assert report["cached"]
+    assert (vendor_directories / "two" / "two" / "src" / "parser.c").exists()
+
+
+def test_concurrent_fetches_of_a_revision_share_the_cache(
+    multi_grammar_repository: tuple[str, str], vendor_directories: Path, tmp_path: Path
+) -> None:
+    repo_url, sha = multi_grammar_repository
+
+    async def fetch_all() -> list[clone_vendors.CloneReport]:
+        return await asyncio.gather(
+            *[
+                clone_vendors.clone_repository(repo_url, None, f"grammar{i}", rev=sha, directory="one", sparse=True)
+                for i in range(CLONE_JOBS)
+            ]
+        )
+
+    reports = asyncio.run(fetch_all())
+
+    assert not any(report["cached"] for report in reports)
+    for i in range(CLONE_JOBS):
+        assert (vendor_directories / f"grammar{i}" / "one" / "src" / "parser.c").exists()
+    cache_entries = list((tmp_path / "cache").glob("*/*"))
+    assert len(cache_entries) == 1
+    assert (cache_entries[0] / clone_vendors.CACHE_COMPLETE_MARKER).exists()
+    assert (cache_entries[0] / "one" / "src" / "parser.c").exists()
+
+
+def test_fetch_failure_raises(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match="failed to clone repo"):
+        asyncio.run(clone_vendors.clone_repository(f"file://{tmp_path / 'missing'}", None, "grammar", rev="0" * 40))
+
+    assert not (tmp_path / "cache").exists()
+
+
+@pytest.mark.parametrize(("directory", "expected_query"), [(None, "root"), ("grammar", "grammar")])
+def test_query_files_are_moved(
+    tmp_path: Path,
+    vendor_directories: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    directory: str | None,
+    expected_query: str,
+) -> None:
+    parsers_directory = tmp_path / "parsers"
+    monkeypatch.setattr(clone_vendors, "parsers_directory", parsers_directory)
+    checkout = vendor_directories / "language"
+    grammar_directory = checkout / directory if directory else checkout
+    (grammar_directory / "src").mkdir(parents=True)
+    (grammar_directory / "src" / "parser.c").write_text("/* parser */")
+    (checkout / "queries").mkdir()
+    (checkout / "queries" / "tags.scm").write_text("; root")
+    (checkout / "grammar" / "queries").mkdir(parents=True)
+    (checkout / "grammar" / "queries" / "tags.scm").write_text("; grammar")
+
+    asyncio.run(clone_vendors.move_src_folder("language", directory))
+
+    assert (parsers_directory / "language" / "src" / "parser.c").exists()
+    assert (parsers_directory / "language" / "queries" / "tags.scm").read_text() == f"; {expected_query}"
+
+
+def test_stale_languages_are_detected(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    parsers_directory = tmp_path / "parsers"
+    monkeypatch.setattr(clone_vendors, "parsers_directory", parsers_directory)
+    definitions: dict[str, clone_vendors.LanguageDict] = {
+        "unchanged": {"repo": "https://example.com/unchanged", "rev": "a"},
+        "bumped": {"repo": "https://example.com/bumped", "rev": "c"},
+        "missing": {"repo": "https://example.com/missing", "rev": "d"},
+        "new": {"repo": "https://example.com/new", "rev": "e", "generate": True},
+        "outdated": {"repo": "https://example.com/outdated", "rev": "g"},
+    }
+    for language_name in ("unchanged", "bumped", "removed", "outdated"):
+        (parsers_directory / language_name).mkdir(parents=True)
+
+    clone_vendors.write_manifest(
+        {
+            "unchanged": clone_vendors.get_manifest_entry(definitions["unchanged"]),
+            "bumped": clone_vendors.get_manifest_entry({"repo": "https://example.com/bumped", "rev": "b"}),
+            "missing": clone_vendors.get_manifest_entry(definitions["missing"]),
+            "removed": clone_vendors.get_manifest_entry({"repo": "https://example.com/removed", "rev": "f"}),
+            # Written before the queries folders were vendored
+            "outdated": {  # type: ignore[typeddict-item]
+                "repo": "https://example.com/outdated",
+                "rev": "g",
+                "branch": None,
+                "directory": None,
+                "generate": False,
+                "abi_version": None,
+            },
+        }
+    )
+
+    changed, removed = clone_vendors.get_stale_languages(definitions, clone_vendors.load_manifest())
+
+    assert changed == ["bumped", "missing", "new", "outdated"]
+    assert removed == ["removed"]
+
+
+def test_stages_are_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(clone_vendors, "parsers_directory", tmp_path / "parsers")
+    running = {"clone": 0, "move": 0}
+    peaks = {"clone": 0, "move": 0}
+
+    async def run_stage(stage: str) -> None:
+        running[stage] += 1
+        peaks[stage] = max(peaks[stage], running[stage])
+        await asyncio.sleep(0.01)
+        running[stage] -= 1
+
+    async def clone_repository(**kwargs: Any) -> clone_vendors.CloneReport:
+        await run_stage("clone")
+        return clone_vendors.CloneReport(
+            language_name=kwargs["language_name"], bytes_transferred=1, seconds=0.0, cached=False
+        )
+
+    async def move_src_folder(**_: Any) -> None:
+        await run_stage("move")
+
+    monkeypatch.setattr(clone_vendors, "clone_repository", clone_repository)
+    monkeypatch.setattr(clone_vendors, "move_src_folder", move_src_folder)
+
+    async def vendor_all() -> list[clone_vendors.CloneReport]:
+        semaphores = clone_vendors.StageSemaphores(
+            clone=asyncio.Semaphore(CLONE_JOBS), generate=asyncio.Semaphore(1), move=asyncio.Semaphore(MOVE_JOBS)
+        )
+        return await asyncio.gather(
+            *[
+                clone_vendors.process_repo(f"language{i}", {"repo": f"https://example.com/{i}", "rev": "a"}, semaphores)
+                for i in range(GRAMMARS)
+            ]
+        )
+
+    reports = asyncio.run(vendor_all())
+
+    assert len(reports) == GRAMMARS
+    assert peaks == {"clone": CLONE_JOBS, "move": MOVE_JOBS}
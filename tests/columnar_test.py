@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import pickle
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import (
+    ERROR_KIND_ID,
+    NodeFlag,
+    SupportedLanguage,
+    flatten_tree,
+    get_kind_names,
+    get_parser,
+    parse_file,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tree_sitter import Node, Tree
+
+POINT_FIELDS = ("start_rows", "start_columns", "end_rows", "end_columns")
+
+
+def walk_nodes(tree: Tree) -> list[tuple[int, int, int, int, int, int, int, int, int]]:
+    rows: list[tuple[int, int, int, int, int, int, int, int, int]] = []
+
+    def visit(node: Node, parent_index: int) -> None:
+        index = len(rows)
+        flags = (
+            (NodeFlag.NAMED if node.is_named else 0)
+            | (NodeFlag.ERROR if node.is_error else 0)
+            | (NodeFlag.MISSING if node.is_missing else 0)
+            | (NodeFlag.EXTRA if node.is_extra else 0)
+        )
+        rows.append(
+            (node.kind_id, node.start_byte, node.end_byte, parent_index, *node.start_point, *node.end_point, flags)
+        )
+        for child in node.children:
+            visit(child, index)
+
+    visit(tree.root_node, -1)
+    return rows
+
+
+@pytest.mark.parametrize(
+    ("language_name", "source"),
+    [
+        ("python", b"class A:\n    # comment\n    def f(self):\n        return [1, 2]\n"),
+        ("python", b"\n\n  def f(:\n  x = (1,\n"),
+        ("json", b'  \n  {"a": [1, 2,, ], "\xc3\xa9": null}  \n'),
+        ("javascript", "let é = 'ü';\r\nfoo(".encode()),
+    ],
+)
+def test_flatten_tree_matches_node_walk(language_name: SupportedLanguage, source: bytes) -> None:
+    tree = get_parser(language_name).parse(source)
+
+    flat_tree = flatten_tree(tree)
+
+    assert len(flat_tree) == len(walk_nodes(tree))
+    assert list(
+        zip(
+            flat_tree.kind_ids,
+            flat_tree.start_bytes,
+            flat_tree.end_bytes,
+            flat_tree.parent_indices,
+            flat_tree.start_rows,
+            flat_tree.start_columns,
+            flat_tree.end_rows,
+            flat_tree.end_columns,
+            flat_tree.flags,
+            strict=True,
+        )
+    ) == walk_nodes(tree)
+
+
+def test_flatten_tree_without_utf8_source() -> None:
+    # Points cannot be derived from the line breaks of a UTF-16 source and are read from the nodes instead
+    tree = get_parser("python").parse("x = 'é'\ny = 1\n".encode("utf-16-le"), encoding="utf16")
+
+    flat_tree = flatten_tree(tree)
+
+    assert [row[4:8] for row in walk_nodes(tree)] == list(
+        zip(flat_tree.start_rows, flat_tree.start_columns, flat_tree.end_rows, flat_tree.end_columns, strict=True)
+    )
+
+
+def test_flatten_tree_of_released_source() -> None:
+    source = b"def f():\n    return 1\n"
+    with memoryview(source) as view:
+        tree = get_parser("python").parse(view)
+
+    with pytest.raises(ValueError, match="released memoryview"):
+        _ = tree.root_node.text
+    assert [row[4:8] for row in walk_nodes(tree)] == list(
+        zip(*[getattr(flatten_tree(tree), name) for name in POINT_FIELDS], strict=True)
+    )
+
+
+def test_flatten_tree_of_parsed_file(tmp_path: Path) -> None:
+    path = tmp_path / "module.py"
+    path.write_bytes(b"def f():\n    return 1\n" * 10)
+
+    tree = parse_file("python", path)
+    flat_tree = flatten_tree(tree)
+
+    assert [row[4:8] for row in walk_nodes(tree)] == list(
+        zip(*[getattr(flat_tree, name) for name in POINT_FIELDS], strict=True)
+    )
+
+
+def test_flags_and_kind_names() -> None:
+    kind_names = get_kind_names("python")
+    flat_tree = flatten_tree(get_parser("python").parse(b"def f(:\n  pass  # c\n"))
+    error_tree = flatten_tree(get_parser("python").parse(b"x = (1,\n"))
+
+    assert get_kind_names("python") is kind_names
+    assert [kind_names[kind_id] for kind_id in flat_tree.kind_ids[:4]] == [
+        "module",
+        "function_definition",
+        "def",
+        "identifier",
+    ]
+    assert {
+        kind_names[kind_id]: NodeFlag(flags)
+        for kind_id, flags in zip(flat_tree.kind_ids, flat_tree.flags, strict=True)
+        if kind_names[kind_id] in {"def", ")", "comment"}
+    } == {"def": NodeFlag(0), ")": NodeFlag.MISSING, "comment": NodeFlag.NAMED | NodeFlag.EXTRA}
+    assert error_tree.kind_ids[1] == ERROR_KIND_ID
+    assert error_tree.flags[1] & NodeFlag.ERROR
+
+
+def test_flat_tree_can_be_pickled() -> None:
+    flat_tree = flatten_tree(get_parser("python").parse(b"x = 1"))
+
+    assert pickle.loads(pickle.dumps(flat_tree)) == flat_tree
+    assert memoryview(flat_tree.start_bytes).itemsize == flat_tree.start_bytes.itemsize
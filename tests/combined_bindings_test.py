@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tree_sitter_language_pack import get_binding
+from tree_sitter_language_pack._core import _load_combined_bindings
+
+
+def test_get_binding_prefers_combined_bindings() -> None:
+    capsule = object()
+    combined_bindings = SimpleNamespace(language=lambda name: capsule if name == "python" else None)
+
+    with patch(
+        "tree_sitter_language_pack._core._load_combined_bindings",
+        return_value=(combined_bindings, frozenset({"python"})),
+    ):
+        assert get_binding("python") is capsule
+        assert get_binding("yaml") is not capsule
+
+
+def test_combined_bindings_are_optional() -> None:
+    combined_bindings, language_names = _load_combined_bindings()
+
+    if combined_bindings is None:
+        assert language_names == frozenset()
+    else:
+        assert set(combined_bindings.languages()) == language_names
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, get_args
+
+import pytest
+from scripts.generate_detection_index import index_path, render_index
+from tree_sitter import Parser
+
+from tree_sitter_language_pack import SupportedLanguage, detect_language, get_parser_for_path
+from tree_sitter_language_pack._detection_index import EXTENSIONS, FILENAMES, INTERPRETERS, MODELINE_NAMES
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("src/main.py", "python"),
+        ("src/MAIN.PY", "python"),
+        ("/repo/web/app.test.tsx", "tsx"),
+        ("types.d.ts", "typescript"),
+        ("Dockerfile", "dockerfile"),
+        ("build/prod.dockerfile", "dockerfile"),
+        ("go.mod", "gomod"),
+        ("requirements.txt", "requirements"),
+        ("notes.txt", None),
+        ("CMakeLists.txt", "cmake"),
+        (".gitignore", "gitignore"),
+        (".eslintrc.json", "json"),
+        ("Makefile", "make"),
+        ("LICENSE", None),
+    ],
+)
+def test_detect_language_by_name(path: str, expected: SupportedLanguage | None) -> None:
+    assert detect_language(path) == expected
+
+
+@pytest.mark.parametrize(
+    ("first_bytes", "expected"),
+    [
+        (b"#!/usr/bin/env python3\nprint(1)\n", "python"),
+        (b"#!/usr/bin/python3.12 -u\n", "python"),
+        (b"#!/usr/bin/env -S FOO=1 node --harmony\n", "javascript"),
+        (b"#! /bin/bash\n", "bash"),
+        (b"#!/usr/bin/env -S uv run --script\n", "python"),
+        (b"#!/usr/bin/unknown\n", None),
+        (b"# -*- mode: ruby; coding: utf-8 -*-\n", "ruby"),
+        (b"// -*- C++ -*-\n", "cpp"),
+        (b"/* -*- coding: utf-8 -*- */\n", None),
+        (b"#!/bin/sh\n# vim: set ft=python :\n", "bash"),
+        (b"\n\n# vim: set ft=perl ts=4 :\n", "perl"),
+        (b"plain text\n", None),
+    ],
+)
+def test_detect_language_by_content(first_bytes: bytes, expected: SupportedLanguage | None) -> None:
+    assert detect_language("bin/tool", first_bytes) == expected
+
+
+def test_name_takes_precedence_over_content() -> None:
+    assert detect_language("script.rb", b"#!/usr/bin/env python\n") == "ruby"
+
+
+def test_get_parser_for_path(tmp_path: Path) -> None:
+    script = tmp_path / "tool"
+    script.write_bytes(b"#!/usr/bin/env python3\nprint('hello')\n")
+
+    parser = get_parser_for_path(script)
+    assert isinstance(parser, Parser)
+    assert parser.parse(script.read_bytes()).root_node.type == "module"
+
+    with pytest.raises(LookupError, match="Could not detect the language"):
+        get_parser_for_path(tmp_path / "missing")
+
+
+def test_index_is_up_to_date() -> None:
+    assert index_path.read_text() == render_index()
+
+
+def test_index_only_maps_supported_languages() -> None:
+    supported_languages = set(get_args(SupportedLanguage))
+    for index in (EXTENSIONS, FILENAMES, INTERPRETERS, MODELINE_NAMES):
+        assert set(index.values()) <= supported_languages
+    assert set(MODELINE_NAMES.values()) == supported_languages
+
+
+def test_index_is_immutable() -> None:
+    with pytest.raises(TypeError):
+        EXTENSIONS["py"] = "ruby"  # type: ignore[index]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tree_sitter import Point
+
+from tree_sitter_language_pack import Document, ParserPool, ParseSession, get_parser
+
+SOURCE = "def f():\n    return 1\n\n\nx = f()\n"
+EMOJI_SOURCE = "s = '😀é'\nt = 1\n"
+EDITS = 200
+MAX_TREES = 2
+PARSES = 2
+THREADS = 8
+
+
+def assert_matches_fresh_parse(document: Document) -> None:
+    assert str(document.tree.root_node) == str(get_parser(document.language).parse(document.source).root_node)
+
+
+def test_edit_reparses_incrementally() -> None:
+    document = Document("python", SOURCE)
+    first_tree = document.tree
+    assert document.changed_ranges[0].end_byte == len(SOURCE)
+
+    document.edit((1, 11), (1, 12), "[1, 2]")
+
+    assert document.source == SOURCE.replace("return 1", "return [1, 2]").encode()
+    assert document.version == 1
+    assert_matches_fresh_parse(document)
+    assert [(changed.start_point, changed.end_point) for changed in document.changed_ranges] == [
+        (Point(1, 11), Point(1, 17))
+    ]
+    # Trees handed out before an edit are not modified
+    assert first_tree.root_node.end_byte == len(SOURCE)
+
+
+def test_changed_ranges_of_an_edited_document() -> None:
+    document = Document("python", SOURCE)
+    document.reparse()
+    document.edit((1, 11), (1, 12), "[1, 2]")
+    document.reparse()
+
+    document.edit((4, 4), (4, 7), "g()")
+
+    # Re-parsed first, so the ranges are those of the last edit
+    assert [(changed.start_point, changed.end_point) for changed in document.changed_ranges] == [
+        (Point(4, 5), Point(4, 7))
+    ]
+    assert_matches_fresh_parse(document)
+
+
+def test_edits_are_batched_until_the_tree_is_accessed() -> None:
+    pool = ParserPool()
+    document = Document("python", SOURCE, pool=pool)
+    document.reparse()
+
+    for column, character in enumerate("abc", start=7):
+        document.edit((4, column), (4, column), character)
+
+    assert pool.stats("python").hits + pool.stats("python").misses == 1
+    assert document.source.endswith(b"x = f()abc\n")
+    assert_matches_fresh_parse(document)
+    assert pool.stats("python").hits + pool.stats("python").misses == PARSES
+
+
+def test_multiline_edits() -> None:
+    document = Document("python", SOURCE)
+    document.reparse()
+
+    document.edit((0, 0), (1, 0), "class A:\n    pass\n\n\ndef g():\n")
+    document.edit((4, 0), (4, 0), "")
+
+    assert document.source.startswith(b"class A:\n    pass\n\n\ndef g():\n    return 1\n")
+    assert_matches_fresh_parse(document)
+    assert document.point(len(document.source)) == Point(document.source.count(b"\n"), 0)
+
+
+@pytest.mark.parametrize(
+    ("position_encoding", "column"),
+    [("utf-8", len("s = '😀é".encode())), ("utf-16", len("s = '") + 3), ("utf-32", len("s = '") + 2)],
+)
+def test_position_encodings(position_encoding: str, column: int) -> None:
+    document = Document("python", EMOJI_SOURCE, position_encoding=position_encoding)  # type: ignore[arg-type]
+    byte_offset = len("s = '😀é".encode())
+
+    assert document.byte_offset(0, column) == byte_offset
+    assert document.position(byte_offset) == (0, column)
+
+    document.edit((0, column), (0, column), "!")
+    assert document.source.startswith("s = '😀é!'".encode())
+    assert_matches_fresh_parse(document)
+
+
+def test_positions_are_clamped() -> None:
+    document = Document("python", SOURCE)
+
+    assert document.byte_offset(0, 100) == len("def f():")
+    assert document.byte_offset(100, 0) == len(SOURCE)
+    with pytest.raises(ValueError, match="invalid position"):
+        document.byte_offset(-1, 0)
+    with pytest.raises(ValueError, match="invalid byte range"):
+        document.edit_bytes(5, 4, "")
+
+
+def test_random_edits_match_fresh_parses() -> None:
+    rng = random.Random(0)
+    document = Document("python", SOURCE * 20)
+
+    for _ in range(EDITS):
+        start = rng.randrange(len(document.source) + 1)
+        end = min(len(document.source), start + rng.randrange(4))
+        document.edit_bytes(start, end, rng.choice(["x", "\n", "(", "    ", "", "é"]))
+        if rng.random() < 0.3:  # noqa: PLR2004
+            assert_matches_fresh_parse(document)
+
+    assert_matches_fresh_parse(document)
+    line, column = document.position(len(document.source))
+    assert document.byte_offset(line, column) == len(document.source)
+
+
+def test_session_bounds_trees() -> None:
+    session = ParseSession(max_trees=MAX_TREES)
+    documents = [session.open(f"file:///{i}.py", "python", SOURCE) for i in range(4)]
+
+    for document in documents:
+        assert document.tree.root_node.type == "module"
+
+    assert [document.has_tree for document in documents] == [False, False, True, True]
+    assert len(session) == len(documents)
+
+    session.get("file:///0.py").edit((0, 4), (0, 5), "g")
+    assert_matches_fresh_parse(documents[0])
+    assert [document.has_tree for document in documents] == [True, False, False, True]
+
+
+def test_session_evicts_concurrently_parsed_documents() -> None:
+    session = ParseSession(max_trees=1)
+    documents = [session.open(f"file:///{i}.py", "python", SOURCE) for i in range(THREADS)]
+
+    def edit_and_parse(document: Document) -> None:
+        for i in range(EDITS):
+            document.edit((4, 0), (4, 1), "xy"[i % 2])
+            tree = document.tree
+            assert tree.root_node.type == "module"
+            assert tree.root_node.end_byte == len(document.source)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(edit_and_parse, documents))
+
+    for document in documents:
+        assert_matches_fresh_parse(document)
+
+
+def test_session_skips_documents_in_use() -> None:
+    session = ParseSession(max_trees=1)
+    busy_document = session.open("file:///busy.py", "python", SOURCE)
+    other_documents = [session.open(f"file:///{i}.py", "python", SOURCE) for i in range(2)]
+    assert busy_document.tree.root_node.type == "module"
+
+    # Stands in for another thread editing or parsing the document
+    with busy_document._lock:  # noqa: SLF001
+        assert other_documents[0].tree.root_node.type == "module"
+        assert busy_document.has_tree
+
+    assert other_documents[1].tree.root_node.type == "module"
+    assert [busy_document.has_tree, *(document.has_tree for document in other_documents)] == [False, False, True]
+
+
+def test_session_open_and_close() -> None:
+    session = ParseSession()
+    session.open("file:///a.py", "python", SOURCE)
+
+    assert "file:///a.py" in session
+    session.close("file:///a.py")
+    session.close("file:///a.py")
+    assert "file:///a.py" not in session
+    with pytest.raises(KeyError):
+        session.get("file:///a.py")
+    with pytest.raises(ValueError, match="max_trees"):
+        ParseSession(max_trees=0)
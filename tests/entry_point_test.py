@@ -8,24 +8,28 @@ from typing import TYPE_CHECKING, Any, cast
 import pytest
 from tree_sitter import Language, Parser
 
-from tree_sitter_language_pack import SupportedLanguage, get_binding, get_language, get_parser
+from tree_sitter_language_pack import SupportedLanguage, available_languages, get_binding, get_language, get_parser
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
 
-def load_language_definitions() -> dict[str, dict[str, str]]:
+def load_source_file(file_name: str) -> Any:
     possible_paths = [
-        Path(__file__).parent.parent.resolve() / "sources" / "language_definitions.json",
-        Path(os.environ.get("PROJECT_ROOT", ".")) / "sources" / "language_definitions.json",
-        Path.cwd() / "sources" / "language_definitions.json",
+        Path(__file__).parent.parent.resolve() / "sources" / file_name,
+        Path(os.environ.get("PROJECT_ROOT", ".")) / "sources" / file_name,
+        Path.cwd() / "sources" / file_name,
     ]
 
     for path in possible_paths:
         if path.exists():
-            return cast("dict[str, dict[str, str]]", loads(path.read_text()))
+            return loads(path.read_text())
+
+    raise AssertionError(f"sources/{file_name} not found")
+
 
-    raise AssertionError("language_definitions.json not found, using SupportedLanguage directly")
+def load_language_definitions() -> dict[str, dict[str, str]]:
+    return cast("dict[str, dict[str, str]]", load_source_file("language_definitions.json"))
 
 
 language_definitions = load_language_definitions()
@@ -37,6 +41,23 @@ def test_language_names() -> None:
     assert supported_languages == language_names
 
 
+def test_available_languages() -> None:
+    languages = available_languages()
+
+    # Builds restricted with TSLP_LANGUAGES or TSLP_PROFILES only contain some of the languages
+    assert languages
+    assert languages == sorted(languages)
+    assert set(languages) <= set(SupportedLanguage.__args__)  # type: ignore[attr-defined]
+    for language in languages:
+        assert isinstance(get_language(language), Language)
+
+
+@pytest.mark.parametrize("profile", sorted(load_source_file("language_profiles.json").items()))
+def test_language_profiles(profile: tuple[str, list[str]]) -> None:
+    _, profile_languages = profile
+    assert set(profile_languages) <= set(language_names)
+
+
 @pytest.mark.parametrize("language", language_names)
 def test_get_binding(language: SupportedLanguage) -> None:
     assert type(get_binding(language)).__name__ == "PyCapsule"
@@ -56,3 +77,8 @@ def test_get_parser(language: SupportedLanguage) -> None:
 def test_raises_exception_for_invalid_name(handler: Callable[[str], Any]) -> None:
     with pytest.raises(LookupError):
         handler("invalid")
+
+
+def test_lookup_error_lists_available_languages() -> None:
+    with pytest.raises(LookupError, match=r"Languages available in this build: .*python"):
+        get_binding("invalid")  # type: ignore[arg-type]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import gc
+from typing import TYPE_CHECKING
+
+from tree_sitter import Point
+
+from tree_sitter_language_pack import get_parser, get_parser_pool, parse_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SOURCE = b"def f():\n    return 1\n"
+EDITED_SOURCE = b"def g():\n    return 1\n"
+
+
+def test_parse_file_matches_parsing_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "module.py"
+    path.write_bytes(SOURCE * 100)
+
+    tree = parse_file("python", path)
+
+    assert str(tree.root_node) == str(get_parser("python").parse(SOURCE * 100).root_node)
+    assert get_parser_pool().stats("python").outstanding == 0
+
+
+def test_parse_file_with_parser_and_old_tree(tmp_path: Path) -> None:
+    path = tmp_path / "module.py"
+    path.write_bytes(SOURCE)
+    parser = get_parser("python")
+    tree = parse_file("python", path, parser=parser)
+
+    path.write_bytes(EDITED_SOURCE)
+    tree.edit(
+        start_byte=4,
+        old_end_byte=5,
+        new_end_byte=5,
+        start_point=Point(0, 4),
+        old_end_point=Point(0, 5),
+        new_end_point=Point(0, 5),
+    )
+    new_tree = parse_file("python", path, parser=parser, old_tree=tree)
+
+    function_name = new_tree.root_node.children[0].child_by_field_name("name")
+    assert function_name is not None
+    assert (function_name.start_byte, function_name.end_byte) == (4, 5)
+    assert not new_tree.root_node.has_error
+
+
+def test_parse_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.py"
+    path.touch()
+
+    assert parse_file("python", path).root_node.type == "module"
+
+
+def test_node_text_reads_from_the_mapped_file(tmp_path: Path) -> None:
+    path = tmp_path / "module.py"
+    path.write_bytes(SOURCE)
+
+    tree = parse_file("python", path)
+    gc.collect()
+
+    assert tree.root_node.children[0].text == SOURCE.rstrip(b"\n")
+    function_name = tree.root_node.children[0].child_by_field_name("name")
+    assert function_name is not None
+    assert function_name.text == b"f"
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from tree_sitter_language_pack._core import _EXTERNAL_BINDINGS
+
+GRAMMAR_MODULE_PREFIXES = ("tree_sitter_language_pack.bindings.", *_EXTERNAL_BINDINGS.values())
+
+
+def test_import_loads_no_grammars() -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tree_sitter_language_pack"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    imported_modules = [line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if "|" in line]
+    assert "tree_sitter_language_pack" in imported_modules
+    assert [module for module in imported_modules if module.startswith(GRAMMAR_MODULE_PREFIXES)] == []
+
+
+def test_external_grammar_is_imported_on_first_use() -> None:
+    code = (
+        "import sys; from tree_sitter_language_pack import get_binding; "
+        "assert 'tree_sitter_yaml' not in sys.modules; "
+        "get_binding('yaml'); "
+        "assert 'tree_sitter_yaml' in sys.modules; "
+        "assert 'tree_sitter_c_sharp' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_does_not_import_asyncio() -> None:
+    code = (
+        "import sys, tree_sitter_language_pack; "
+        "assert 'asyncio' not in sys.modules; "
+        "assert 'tree_sitter_language_pack.aio' not in sys.modules; "
+        "assert 'tree_sitter_language_pack.injections' not in sys.modules; "
+        "assert 'tree_sitter_language_pack.instrumentation' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_attributes_are_imported_on_first_use() -> None:
+    import tree_sitter_language_pack  # noqa: PLC0415
+    from tree_sitter_language_pack.aio import aparse  # noqa: PLC0415
+
+    assert tree_sitter_language_pack.aparse is aparse
+    assert all(hasattr(tree_sitter_language_pack, name) for name in tree_sitter_language_pack.__all__)
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        tree_sitter_language_pack.missing  # noqa: B018
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tree_sitter_language_pack import InjectionLayer, LayeredDocument, get_parser, parse_layers
+
+SOURCE = 'const a = css`a { color: red }`;\nconst b = css`b { margin: ${x}px }`;\nconst c = json`{"k": 1}`;\n'
+PYTHON_SOURCE = 'config = \'{"debug": true}\'\nname = "x"\n'
+JSON_STRINGS_QUERY = '((string (string_content) @injection.content) (#set! injection.language "json"))'
+EDITS = 100
+
+
+def layer_summary(layers: tuple[InjectionLayer, ...]) -> list[tuple[str, int, list[tuple[int, int]], str]]:
+    return [
+        (
+            layer.language,
+            layer.depth,
+            [(layer_range.start_byte, layer_range.end_byte) for layer_range in layer.ranges],
+            str(layer.tree.root_node),
+        )
+        for layer in layers
+    ]
+
+
+def test_parse_layers() -> None:
+    source = SOURCE.encode()
+    host, css, json = parse_layers("javascript", SOURCE)
+
+    assert (host.language, host.depth, host.ranges) == ("javascript", 0, ())
+    assert str(host.tree.root_node) == str(get_parser("javascript").parse(source).root_node)
+    # The CSS templates are a combined injection, parsed as one tree without the substitution
+    assert (css.language, css.depth) == ("css", 1)
+    assert [source[css_range.start_byte : css_range.end_byte] for css_range in css.ranges] == [
+        b"a { color: red }",
+        b"b { margin: ",
+        b"px }",
+    ]
+    assert not css.tree.root_node.has_error
+    assert [rule.text for rule in css.tree.root_node.named_children] == [b"a { color: red }", b"b { margin: ${x}px }"]
+    assert (json.language, json.depth) == ("json", 1)
+    assert source[json.ranges[0].start_byte : json.ranges[0].end_byte] == b'{"k": 1}'
+
+
+def test_layer_at() -> None:
+    document = LayeredDocument("javascript", SOURCE)
+
+    assert document.layer_at(0).language == "javascript"
+    assert document.layer_at(SOURCE.index("color")).language == "css"
+    # The substitution is part of the JavaScript layer
+    assert document.layer_at(SOURCE.index("${x}") + 2).language == "javascript"
+    assert document.layer_at(SOURCE.index('"k"')).language == "json"
+
+
+def test_edits_match_a_fresh_parse() -> None:
+    rng = random.Random(0)
+    snippets = ["css`", "`", "x", "\n", "${", "}", ";", "json`", "a { b: c }", '{"k": [1]}']
+    document = LayeredDocument("javascript", SOURCE * 3)
+    for _ in range(EDITS):
+        source = document.source
+        start_byte = rng.randrange(len(source) + 1)
+        document.edit_bytes(start_byte, min(len(source), start_byte + rng.choice([0, 1, 3])), rng.choice(snippets))
+        if rng.random() < 0.5:  # noqa: PLR2004
+            continue
+
+        for actual, expected in zip(
+            layer_summary(document.layers), layer_summary(parse_layers("javascript", document.source)), strict=True
+        ):
+            assert actual[:3] == expected[:3]
+            # Incremental parsing can recover from syntax errors differently
+            if "ERROR" not in expected[3] and "MISSING" not in expected[3]:
+                assert actual[3] == expected[3]
+
+
+def test_edit_reparses_layers_incrementally() -> None:
+    document = LayeredDocument("javascript", SOURCE)
+    _, css, json = document.layers
+
+    document.edit_bytes(SOURCE.index("red"), SOURCE.index("red") + len("red"), "blue")
+    _, new_css, new_json = document.layers
+
+    assert new_css.tree.root_node.named_children[0].text == b"a { color: blue }"
+    assert [rule.start_byte for rule in new_css.tree.root_node.named_children[1:]] == [
+        rule.start_byte + 1 for rule in css.tree.root_node.named_children[1:]
+    ]
+    # Layers after the edit are shifted
+    assert new_json.ranges[0].start_byte == json.ranges[0].start_byte + 1
+    assert str(new_json.tree.root_node) == str(json.tree.root_node)
+    # Layers handed out before an edit are not modified
+    assert css.tree.root_node.named_children[0].text == b"a { color: red }"
+
+
+def test_insert_before_injections() -> None:
+    document = LayeredDocument("javascript", SOURCE)
+    assert [layer.language for layer in document.layers] == ["javascript", "css", "json"]
+
+    document.edit_bytes(0, 0, "let y;\n")
+
+    assert layer_summary(document.layers) == layer_summary(parse_layers("javascript", "let y;\n" + SOURCE))
+    assert document.layers[2].ranges[0].start_point.row == SOURCE.count("\n", 0, SOURCE.index('{"k"')) + 1
+
+
+def test_edit_adds_and_removes_injections() -> None:
+    document = LayeredDocument("javascript", SOURCE)
+    assert [layer.language for layer in document.layers] == ["javascript", "css", "json"]
+
+    document.edit_bytes(SOURCE.index("json`"), SOURCE.index("json`") + len("json"), "sql")
+    assert [layer.language for layer in document.layers] == ["javascript", "css"]
+
+    document.edit_bytes(document.source.index(b"sql`"), document.source.index(b"sql`") + len("sql"), "json")
+    assert [layer.language for layer in document.layers] == ["javascript", "css", "json"]
+
+
+def test_injection_queries() -> None:
+    host, config, name = parse_layers("python", PYTHON_SOURCE, injection_queries={"python": JSON_STRINGS_QUERY})
+
+    assert host.language == "python"
+    # Every string is a separate injection, parsed as its own tree
+    assert (config.language, name.language) == ("json", "json")
+    assert config.tree.root_node.named_children[0].text == b'{"debug": true}'
+    assert name.tree.root_node.has_error
+    # The Python grammar does not bundle an injections query
+    assert len(parse_layers("python", PYTHON_SOURCE)) == 1
+
+
+def test_max_depth() -> None:
+    assert [layer.language for layer in parse_layers("javascript", SOURCE, max_depth=0)] == ["javascript"]
+    assert [layer.language for layer in parse_layers("javascript", SOURCE, max_depth=1)] == [
+        "javascript",
+        "css",
+        "json",
+    ]
+
+    with pytest.raises(ValueError, match="max_depth must not be negative"):
+        LayeredDocument("javascript", SOURCE, max_depth=-1)
+
+
+def test_executor() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        document = LayeredDocument("javascript", SOURCE, executor=executor)
+
+        assert layer_summary(document.layers) == layer_summary(parse_layers("javascript", SOURCE))
+        document.edit_bytes(0, 0, "\n")
+        assert layer_summary(document.layers) == layer_summary(parse_layers("javascript", "\n" + SOURCE))
+
+
+def test_release_tree() -> None:
+    document = LayeredDocument("javascript", SOURCE)
+    layers = document.layers
+
+    document.release_tree()
+
+    assert layer_summary(document.layers) == layer_summary(layers)
+    assert document.layers[1].tree is not layers[1].tree
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import (
+    Document,
+    InstrumentationEvent,
+    add_instrumentation_hook,
+    clear_cache,
+    disable_instrumentation,
+    enable_instrumentation,
+    get_binding,
+    get_language,
+    get_metrics,
+    get_parser,
+    instrumentation_enabled,
+    parse_file,
+    parse_many,
+    remove_instrumentation_hook,
+    render_metrics,
+    reset_metrics,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def instrumentation() -> Iterator[None]:
+    clear_cache()
+    reset_metrics()
+    enable_instrumentation()
+    yield
+    disable_instrumentation()
+    reset_metrics()
+
+
+def test_disabled_instrumentation_records_nothing() -> None:
+    disable_instrumentation()
+
+    get_parser("json").parse(b"[]")
+    list(parse_many([("json", b"[1]")]))
+
+    assert not instrumentation_enabled()
+    assert get_metrics() == {}
+
+
+def test_counters() -> None:
+    get_language("json")
+    get_language("json")
+    results = list(parse_many([("json", b"[1]"), ("json", b"[1,"), ("json", "not bytes")]))  # type: ignore[list-item]
+
+    metrics = get_metrics()["json"]
+    assert (metrics.loads, metrics.load_failures) == (1, 0)
+    assert metrics.load_seconds.count == 1
+    # The second get_language call and the one creating the batch worker's parser
+    assert metrics.cache_hits == 2  # noqa: PLR2004
+    assert metrics.parsers == 1
+    assert (metrics.parses, metrics.parse_failures, metrics.error_trees) == (3, 1, 1)
+    assert metrics.bytes_parsed == len(b"[1]") + len(b"[1,") + len("not bytes")
+    assert metrics.parse_seconds.count == 3  # noqa: PLR2004
+    assert [result.ok for result in results] == [True, True, False]
+
+
+def test_incremental_parses_and_files(tmp_path: Path) -> None:
+    document = Document("python", "x = 1\n")
+    assert document.tree is not None
+    document.edit_bytes(0, 1, "y")
+    assert document.tree is not None
+    path = tmp_path / "a.py"
+    path.write_bytes(b"def f(:\n")
+    parse_file("python", path)
+
+    metrics = get_metrics()["python"]
+    assert (metrics.parses, metrics.incremental_parses, metrics.error_trees) == (3, 1, 1)
+    assert metrics.bytes_parsed == len("x = 1\n") * 2 + len(b"def f(:\n")
+
+
+def test_load_failures() -> None:
+    with pytest.raises(LookupError):
+        get_binding("invalid")  # type: ignore[arg-type]
+
+    metrics = get_metrics()["invalid"]  # type: ignore[index]
+    assert (metrics.loads, metrics.load_failures, metrics.load_seconds.count) == (0, 1, 1)
+
+
+def test_hooks() -> None:
+    events: list[InstrumentationEvent] = []
+    add_instrumentation_hook(events.append)
+
+    list(parse_many([("json", b"[1,")]))
+    remove_instrumentation_hook(events.append)
+    list(parse_many([("json", b"[1]")]))
+
+    assert [(event.kind, event.language) for event in events] == [("load", "json"), ("parse", "json")]
+    assert (events[1].size, events[1].has_error, events[1].incremental, events[1].error) == (3, True, False, None)
+    assert events[1].seconds > 0
+    with pytest.raises(ValueError, match="hook is not registered"):
+        remove_instrumentation_hook(events.append)
+
+
+def test_histogram_buckets() -> None:
+    enable_instrumentation(buckets=[1e-9, 60])
+    get_parser("json").parse(b"[]")
+    list(parse_many([("json", b"[1]"), ("json", b"[2]")]))
+
+    histogram = get_metrics()["json"].parse_seconds
+    assert histogram.buckets == ((1e-9, 0), (60.0, 2), (float("inf"), 2))
+    assert histogram.count == 2  # noqa: PLR2004
+    assert 0 < histogram.seconds < 60  # noqa: PLR2004
+
+    with pytest.raises(ValueError, match="strictly increasing"):
+        enable_instrumentation(buckets=[1, 1])
+    with pytest.raises(ValueError, match="non-empty"):
+        enable_instrumentation(buckets=[])
+
+
+def test_render_metrics() -> None:
+    enable_instrumentation(buckets=[60])
+    list(parse_many([("json", b"[1]")]))
+
+    text = render_metrics()
+    assert "# TYPE tslp_parses_total counter\n" in text
+    assert 'tslp_parses_total{language="json"} 1\n' in text
+    assert 'tslp_parsed_bytes_total{language="json"} 3\n' in text
+    assert "# TYPE tslp_parse_seconds histogram\n" in text
+    assert 'tslp_parse_seconds_bucket{language="json",le="60.0"} 1\n' in text
+    assert 'tslp_parse_seconds_bucket{language="json",le="+Inf"} 1\n' in text
+    assert 'tslp_parse_seconds_count{language="json"} 1\n' in text
+    assert "# EOF" not in text
+
+    text = render_metrics(prefix="parsing", openmetrics=True)
+    assert "# TYPE parsing_parses counter\n" in text
+    assert 'parsing_parses_total{language="json"} 1\n' in text
+    assert "# UNIT parsing_parse_seconds seconds\n" in text
+    assert text.endswith("# EOF\n")
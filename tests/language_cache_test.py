@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import cached_languages, clear_cache, get_language, preload, set_cache_size
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def reset_cache() -> Iterator[None]:
+    clear_cache()
+    yield
+    set_cache_size(None)
+    clear_cache()
+
+
+def test_get_language_returns_cached_instance() -> None:
+    assert get_language("python") is get_language("python")
+    assert cached_languages() == ["python"]
+
+
+def test_preload() -> None:
+    preload(["python", "yaml"])
+    assert cached_languages() == ["python", "yaml"]
+
+
+def test_preload_raises_for_invalid_name() -> None:
+    with pytest.raises(LookupError):
+        preload(["invalid"])  # type: ignore[list-item]
+    assert cached_languages() == []
+
+
+def test_clear_cache() -> None:
+    language = get_language("python")
+    clear_cache()
+    assert cached_languages() == []
+    assert get_language("python") is not language
+
+
+def test_lru_eviction() -> None:
+    set_cache_size(2)
+    preload(["python", "yaml"])
+    get_language("python")
+    get_language("csharp")
+    assert cached_languages() == ["python", "csharp"]
+
+
+def test_set_cache_size_evicts_existing_entries() -> None:
+    preload(["python", "yaml", "csharp"])
+    set_cache_size(1)
+    assert cached_languages() == ["csharp"]
+
+
+def test_set_cache_size_rejects_invalid_value() -> None:
+    with pytest.raises(ValueError, match="maxsize"):
+        set_cache_size(0)
+
+
+def test_concurrent_access_returns_single_instance() -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        languages = list(executor.map(lambda _: get_language("python"), range(64)))
+    assert all(language is languages[0] for language in languages)
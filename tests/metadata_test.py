@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from tree_sitter_language_pack import LanguageInfo, get_kind_names, get_language, language_info, list_languages
+from tree_sitter_language_pack import metadata as metadata_module
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+INDEX: dict[str, dict[str, Any]] = {
+    "json": {
+        "repo": "https://github.com/tree-sitter/tree-sitter-json",
+        "rev": "0123456789abcdef",
+        "abi_version": 14,
+        "kind_names": ["end", "{"],
+        "field_names": ["", "key", "value"],
+        "has_external_scanner": False,
+        "source_bytes": 1024,
+    }
+}
+
+
+@pytest.fixture
+def index_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "language_index.json"
+    path.write_text(json.dumps(INDEX))
+    monkeypatch.setattr(metadata_module, "language_index_path", path)
+    return path
+
+
+@pytest.mark.usefixtures("index_path")
+def test_language_info() -> None:
+    entry = INDEX["json"]
+
+    assert language_info("json") == LanguageInfo(
+        name="json",
+        repo=entry["repo"],
+        rev=entry["rev"],
+        abi_version=entry["abi_version"],
+        kind_names=tuple(entry["kind_names"]),
+        field_names=tuple(entry["field_names"]),
+        has_external_scanner=entry["has_external_scanner"],
+        source_bytes=entry["source_bytes"],
+    )
+    assert language_info("yaml").package == "tree_sitter_yaml"
+    with pytest.raises(LookupError, match="No metadata found for python"):
+        language_info("python")
+
+
+@pytest.mark.usefixtures("index_path")
+def test_list_languages() -> None:
+    assert [info.name for info in list_languages()] == ["csharp", "embeddedtemplate", "json", "yaml"]
+
+
+def test_list_languages_without_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metadata_module, "language_index_path", tmp_path / "missing.json")
+
+    assert all(info.package for info in list_languages())
+
+
+def test_index_matches_loaded_grammars() -> None:
+    if not metadata_module.language_index_path.is_file():
+        pytest.skip("The language index is written by the build")
+
+    for info in list_languages():
+        if info.package is not None:
+            continue
+        language = get_language(info.name)
+        assert info.abi_version == language.abi_version
+        assert info.kind_names == get_kind_names(info.name)
+        assert info.field_names[1:] == tuple(
+            language.field_name_for_id(field_id) for field_id in range(1, language.field_count + 1)
+        )
+
+
+def test_language_info_does_not_load_grammars() -> None:
+    code = (
+        "import sys\n"
+        "from tree_sitter_language_pack import list_languages\n"
+        "list_languages()\n"
+        "print(any(name.startswith(('tree_sitter_language_pack.bindings.', 'tree_sitter_yaml')) for name in sys.modules))"
+    )
+
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout == "False\n"
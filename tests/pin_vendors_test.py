@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from git import GitCommandError, Repo
+from scripts import pin_vendors
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+RETRIES = 2
+
+
+@pytest.fixture
+def grammar_repository(tmp_path: Path) -> tuple[str, Repo]:
+    work_tree = tmp_path / "grammar"
+    repo = Repo.init(work_tree, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "test")
+        config.set_value("user", "email", "test@example.com")
+
+    (work_tree / "grammar.js").write_text("module.exports = grammar({})")
+    repo.git.add(all=True)
+    repo.index.commit("main")
+
+    repo.git.checkout("-b", "next")
+    (work_tree / "grammar.js").write_text("module.exports = grammar({name: 'next'})")
+    repo.git.add(all=True)
+    repo.index.commit("next")
+    repo.git.checkout("main")
+
+    return f"file://{work_tree}", repo
+
+
+def test_resolve_remote_ref(grammar_repository: tuple[str, Repo]) -> None:
+    repo_url, repo = grammar_repository
+
+    assert pin_vendors.resolve_remote_ref(repo_url) == repo.heads["main"].commit.hexsha
+    assert pin_vendors.resolve_remote_ref(repo_url, "next") == repo.heads["next"].commit.hexsha
+
+    with pytest.raises(ValueError, match="has no ref"):
+        pin_vendors.resolve_remote_ref(repo_url, "missing")
+
+
+def test_missing_branch_is_not_retried(grammar_repository: tuple[str, Repo]) -> None:
+    repo_url, _ = grammar_repository
+
+    assert pin_vendors.get_latest_commit_hash(repo_url, "missing", retries=RETRIES, backoff=0) == (None, 1)
+
+
+def test_failed_lookups_are_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    def resolve_remote_ref(repo_url: str, _: str | None = None) -> str:
+        calls.append(repo_url)
+        if len(calls) <= RETRIES:
+            raise GitCommandError("ls-remote", 128)
+        return "abc"
+
+    monkeypatch.setattr(pin_vendors, "resolve_remote_ref", resolve_remote_ref)
+
+    assert pin_vendors.get_latest_commit_hash("url", retries=RETRIES, backoff=0) == ("abc", RETRIES + 1)
+    assert pin_vendors.get_latest_commit_hash("url", retries=0, backoff=0) == ("abc", 1)
+
+
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_main_pins_revisions(
+    grammar_repository: tuple[str, Repo], tmp_path: Path, monkeypatch: pytest.MonkeyPatch, *, dry_run: bool
+) -> None:
+    repo_url, repo = grammar_repository
+    definitions = {
+        "grammar": {"repo": repo_url, "rev": "0" * 40},
+        "grammar_next": {"repo": repo_url, "branch": "next", "rev": repo.heads["next"].commit.hexsha},
+        "broken": {"repo": f"file://{tmp_path / 'missing'}", "rev": "1" * 40},
+    }
+    definitions_path = tmp_path / "language_definitions.json"
+    definitions_path.write_text(json.dumps(definitions))
+    monkeypatch.setattr(pin_vendors, "definitions_path", definitions_path)
+
+    arguments = ["--retries=0", *(["--dry-run"] if dry_run else [])]
+    results = asyncio.run(pin_vendors.main(pin_vendors.get_argument_parser().parse_args(arguments)))
+
+    assert {result["language_name"]: result["new_rev"] for result in results} == {
+        "grammar": repo.heads["main"].commit.hexsha,
+        "grammar_next": repo.heads["next"].commit.hexsha,
+        "broken": None,
+    }
+    pinned = {name: definition["rev"] for name, definition in json.loads(definitions_path.read_text()).items()}
+    assert pinned == {
+        "grammar": "0" * 40 if dry_run else repo.heads["main"].commit.hexsha,
+        "grammar_next": repo.heads["next"].commit.hexsha,
+        "broken": "1" * 40,
+    }
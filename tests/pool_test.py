@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from tree_sitter import Parser
+
+from tree_sitter_language_pack import ParserPool, PoolStats, get_parser_pool, get_pooled_parser
+
+POOL_SIZE = 4
+CHECKOUTS = 100
+
+
+def test_parser_is_reused() -> None:
+    pool = ParserPool()
+
+    with pool.parser("python") as first:
+        assert isinstance(first, Parser)
+        assert first.parse(b"x = 1").root_node.type == "module"
+
+    with pool.parser("python") as second:
+        assert second is first
+
+    assert pool.stats("python") == PoolStats(hits=1, misses=1, outstanding=0, idle=1, evicted=0)
+
+
+def test_parsers_are_exclusive_while_checked_out() -> None:
+    pool = ParserPool()
+
+    with pool.parser("python") as first, pool.parser("python") as second:
+        assert first is not second
+        assert pool.stats("python") == PoolStats(misses=2, outstanding=2)
+
+    assert pool.stats("python") == PoolStats(misses=2, idle=2)
+
+
+def test_max_size_discards_surplus_parsers() -> None:
+    pool = ParserPool(max_size=1)
+
+    first = pool.acquire("python")
+    second = pool.acquire("python")
+    pool.release(first)
+    pool.release(second)
+
+    assert pool.stats("python") == PoolStats(hits=0, misses=2, outstanding=0, idle=1, evicted=1)
+
+
+def test_idle_parsers_are_evicted() -> None:
+    pool = ParserPool(idle_timeout=10)
+
+    with patch("tree_sitter_language_pack.pool.monotonic", return_value=100.0):
+        pool.release(pool.acquire("python"))
+
+    with patch("tree_sitter_language_pack.pool.monotonic", return_value=105.0):
+        assert pool.evict_idle() == 0
+
+    with patch("tree_sitter_language_pack.pool.monotonic", return_value=111.0):
+        assert pool.evict_idle() == 1
+
+    assert pool.stats("python").idle == 0
+    assert pool.stats("python").evicted == 1
+
+
+def test_stats_are_summed_across_languages() -> None:
+    pool = ParserPool()
+    pool.release(pool.acquire("python"))
+    pool.release(pool.acquire("yaml"))
+    pool.release(pool.acquire("yaml"))
+
+    assert pool.stats() == PoolStats(hits=1, misses=2, outstanding=0, idle=2, evicted=0)
+
+
+def test_release_rejects_foreign_parser() -> None:
+    with pytest.raises(ValueError, match="not checked out"):
+        ParserPool().release(Parser())
+
+
+def test_acquire_raises_for_invalid_name() -> None:
+    pool = ParserPool()
+
+    with pytest.raises(LookupError):
+        pool.acquire("invalid")  # type: ignore[arg-type]
+
+    assert pool.stats() == PoolStats()
+
+
+def test_invalid_configuration() -> None:
+    with pytest.raises(ValueError, match="max_size"):
+        ParserPool(max_size=0)
+    with pytest.raises(ValueError, match="idle_timeout"):
+        ParserPool(idle_timeout=0)
+
+
+def test_concurrent_checkouts() -> None:
+    pool = ParserPool(max_size=POOL_SIZE)
+
+    def parse(_: int) -> str:
+        with pool.parser("python") as parser:
+            return parser.parse(b"def f(): pass").root_node.type
+
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        assert set(executor.map(parse, range(CHECKOUTS))) == {"module"}
+
+    stats = pool.stats("python")
+    assert stats.outstanding == 0
+    assert stats.hits + stats.misses == CHECKOUTS
+    assert stats.idle <= POOL_SIZE
+
+
+def test_get_pooled_parser_uses_default_pool() -> None:
+    with get_pooled_parser("python") as parser:
+        assert get_parser_pool().stats("python").outstanding >= 1
+        assert isinstance(parser, Parser)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import FlatTree, SupportedLanguage, get_language, parse_files
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from tree_sitter import Tree
+
+
+def count_node_kinds(tree: Tree, _: bytes) -> Counter[str]:
+    counts: Counter[str] = Counter()
+    cursor = tree.walk()
+    reached_root = False
+    while not reached_root:
+        if cursor.node is not None:
+            counts[cursor.node.type] += 1
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                reached_root = True
+                break
+    return counts
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[tuple[SupportedLanguage, Path]]:
+    sources: list[tuple[SupportedLanguage, str, bytes]] = [
+        ("python", "a.py", b"def f():\n    return 1\n"),
+        ("yaml", "b.yaml", b"key: value\n"),
+        ("python", "c.py", b"x = 1\n"),
+    ]
+    result: list[tuple[SupportedLanguage, Path]] = []
+    for language, name, source in sources:
+        path = tmp_path / name
+        path.write_bytes(source)
+        result.append((language, path))
+    return result
+
+
+def test_parse_files_returns_flat_trees(files: list[tuple[SupportedLanguage, Path]]) -> None:
+    results = list(parse_files(files, languages=["python"], workers=2))
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert [result.path for result in results] == [str(path) for _, path in files]
+    assert all(result.ok for result in results)
+
+    flat_tree = results[0].value
+    assert isinstance(flat_tree, FlatTree)
+    assert get_language("python").node_kind_for_id(flat_tree.kind_ids[0]) == "module"
+    assert flat_tree.start_bytes[0] == 0
+    assert flat_tree.end_bytes[0] == len(files[0][1].read_bytes())
+
+
+def test_parse_files_with_custom_extractor(files: list[tuple[SupportedLanguage, Path]]) -> None:
+    results = list(parse_files(files, count_node_kinds, workers=1, ordered=False))
+
+    counts = {result.path: result.value for result in results if result.value is not None}
+    assert counts[str(files[0][1])]["function_definition"] == 1
+    assert counts[str(files[1][1])]["stream"] == 1
+
+
+def test_parse_files_reports_errors(tmp_path: Path) -> None:
+    files: list[tuple[SupportedLanguage, Path]] = [("python", tmp_path / "missing.py")]
+    results = list(parse_files(files, workers=1))
+
+    assert not results[0].ok
+    assert isinstance(results[0].error, FileNotFoundError)
+    assert results[0].value is None
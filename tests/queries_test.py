@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from tree_sitter import QueryError
+
+from tree_sitter_language_pack import (
+    available_queries,
+    clear_query_cache,
+    compile_query,
+    get_query,
+    get_query_source,
+    set_query_cache_size,
+)
+from tree_sitter_language_pack import queries as queries_module
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+FUNCTION_QUERY = "(function_definition name: (identifier) @name)"
+CALL_QUERY = "(call function: (identifier) @name)"
+
+
+@pytest.fixture(autouse=True)
+def query_cache() -> Iterator[None]:
+    clear_query_cache()
+    yield
+    set_query_cache_size(128)
+    clear_query_cache()
+
+
+@pytest.fixture
+def queries_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / "python").mkdir()
+    (tmp_path / "python" / "tags.scm").write_text(FUNCTION_QUERY)
+    (tmp_path / "python" / "highlights.scm").write_text("(comment) @comment")
+    monkeypatch.setattr(queries_module, "queries_directory", tmp_path)
+    return tmp_path
+
+
+def test_compiled_queries_are_cached() -> None:
+    query = compile_query("python", FUNCTION_QUERY)
+
+    assert compile_query("python", FUNCTION_QUERY) is query
+    assert compile_query("python", CALL_QUERY) is not query
+    assert query.capture_name(0) == "name"
+
+
+def test_query_cache_evicts_least_recently_used() -> None:
+    set_query_cache_size(1)
+    function_query = compile_query("python", FUNCTION_QUERY)
+    compile_query("python", CALL_QUERY)
+
+    assert compile_query("python", FUNCTION_QUERY) is not function_query
+    with pytest.raises(ValueError, match="maxsize"):
+        set_query_cache_size(0)
+
+
+def test_invalid_queries_are_not_cached() -> None:
+    with pytest.raises(QueryError):
+        compile_query("python", "(not_a_node) @name")
+
+    assert len(queries_module._query_cache) == 0  # noqa: SLF001
+
+
+@pytest.mark.usefixtures("queries_directory")
+def test_get_bundled_query() -> None:
+    assert available_queries("python") == ["highlights", "tags"]
+    assert available_queries("json") == []
+    assert get_query_source("python", "tags") == FUNCTION_QUERY
+
+    query = get_query("python", "tags")
+    assert get_query("python", "tags") is query
+    assert compile_query("python", FUNCTION_QUERY) is query
+
+    with pytest.raises(LookupError, match="Available queries: highlights, tags"):
+        get_query("python", "locals")
+
+
+@pytest.mark.skipif(not available_queries("python"), reason="the package was built without query files")
+def test_shipped_queries_compile() -> None:
+    for query_name in available_queries("python"):
+        assert get_query("python", query_name).capture_name(0)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pickle
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import (
+    ERROR_KIND_ID,
+    SupportedLanguage,
+    get_parser,
+    parse_stats,
+    parse_stats_many,
+    tree_stats,
+)
+
+if TYPE_CHECKING:
+    from tree_sitter import Node, Tree
+
+
+def walk_stats(tree: Tree) -> tuple[Counter[int], int, int, int, int]:
+    kind_counts: Counter[int] = Counter()
+    max_depth = error_count = missing_count = error_bytes = 0
+
+    def visit(node: Node, depth: int, in_error: bool) -> None:
+        nonlocal max_depth, error_count, missing_count, error_bytes
+        kind_counts[node.kind_id] += 1
+        max_depth = max(depth, max_depth)
+        missing_count += node.is_missing
+        if node.is_error:
+            error_count += 1
+            if not in_error:
+                error_bytes += node.end_byte - node.start_byte
+        for child in node.children:
+            visit(child, depth + 1, in_error or node.is_error)
+
+    visit(tree.root_node, 0, False)
+    return kind_counts, max_depth, error_count, missing_count, error_bytes
+
+
+@pytest.mark.parametrize(
+    ("language_name", "source"),
+    [
+        ("python", b"class A:\n    def f(self):\n        return [1, [2, (3,)]]\n"),
+        ("python", b"def f(:\n  x = (1,\n  y = ]]\n"),
+        # The UNEXPECTED leaves are ERROR nodes without an error cost, nested in other ERROR nodes
+        ("python", b"f(a $ b)\nx = 1 $\n"),
+        ("json", b'{"a": [1, 2,, ], "b": {"c": }}'),
+        ("javascript", b"let x = ;\nfoo(1, 2\nclass { ]"),
+    ],
+)
+def test_tree_stats_matches_node_walk(language_name: SupportedLanguage, source: bytes) -> None:
+    tree = get_parser(language_name).parse(source)
+
+    stats = tree_stats(tree)
+
+    assert (
+        stats.kind_counts,
+        stats.max_depth,
+        stats.error_count,
+        stats.missing_count,
+        stats.error_bytes,
+    ) == walk_stats(tree)
+    assert stats.node_count == tree.root_node.descendant_count == stats.kind_counts.total()
+    assert stats.byte_count == tree.root_node.end_byte
+    assert stats.parse_seconds is None
+
+
+def test_tree_stats_of_valid_and_invalid_sources() -> None:
+    valid = tree_stats(get_parser("python").parse(b"x = 1\n"))
+    invalid = tree_stats(get_parser("python").parse(b"x = = 1\n"))
+
+    assert (valid.error_count, valid.missing_count, valid.error_bytes, valid.error_coverage) == (0, 0, 0, 0.0)
+    assert ERROR_KIND_ID not in valid.kind_counts
+    assert invalid.error_count == invalid.kind_counts[ERROR_KIND_ID] > 0
+    assert 0 < invalid.error_coverage <= 1
+    assert tree_stats(get_parser("python").parse(b"")).error_coverage == 0.0
+
+
+def test_parse_stats() -> None:
+    source = b"def f():\n    return 1\n"
+    parser = get_parser("python")
+
+    stats = parse_stats("python", source)
+
+    assert stats.parse_seconds is not None
+    assert stats.parse_seconds >= 0
+    assert stats.kind_counts == tree_stats(parser.parse(source)).kind_counts
+    assert parse_stats("python", source, parser=parser).node_count == stats.node_count
+    assert pickle.loads(pickle.dumps(stats)) == stats
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parse_stats_many(workers: int) -> None:
+    items: list[tuple[SupportedLanguage, bytes]] = [
+        ("python", b"x = 1"),
+        ("json", b"[1, 2"),
+        ("python", b"def g(): pass"),
+    ]
+
+    results = list(parse_stats_many(items, workers=workers, chunk_size=1))
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert all(result.ok for result in results)
+    assert [result.stats.node_count if result.stats else None for result in results] == [
+        tree_stats(get_parser(language_name).parse(source)).node_count for language_name, source in items
+    ]
+    assert results[1].stats is not None
+    assert results[1].stats.missing_count == 1
+
+
+def test_parse_stats_many_reports_failures() -> None:
+    results = list(parse_stats_many([("python", b"x = 1"), ("unknown", b"x")]))  # type: ignore[list-item]
+
+    assert results[0].ok
+    assert not results[1].ok
+    assert results[1].stats is None
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pickle
+from typing import TYPE_CHECKING
+
+import pytest
+from tree_sitter import Point
+
+from tree_sitter_language_pack import SupportedLanguage, Tag, extract_tags, extract_tags_many, get_parser, has_tags
+from tree_sitter_language_pack import queries as queries_module
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TAGS_QUERY = """
+(class_definition name: (identifier) @name) @definition.class
+(function_definition name: (identifier) @name) @definition.function
+(call function: [(identifier) @name (attribute attribute: (identifier) @name)]) @reference.call
+(call function: (identifier) @name) @reference.call
+(decorator (identifier) @name)
+"""
+SOURCE = "class A:\n    def f(self):\n        return é(self.g())\n".encode()
+
+
+@pytest.fixture(autouse=True)
+def queries_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / "python").mkdir()
+    (tmp_path / "python" / "tags.scm").write_text(TAGS_QUERY)
+    monkeypatch.setattr(queries_module, "queries_directory", tmp_path)
+    return tmp_path
+
+
+def test_extract_tags() -> None:
+    tags = extract_tags("python", SOURCE)
+
+    assert tags.kinds == ("definition.class", "definition.function", "reference.call")
+    # The second call pattern matches é(...) again, and the decorator pattern has no kind
+    assert list(tags) == [
+        Tag("definition.class", "A", 0, len(SOURCE) - 1, 6, 7, Point(0, 6), Point(0, 7)),
+        Tag("definition.function", "f", 13, len(SOURCE) - 1, 17, 18, Point(1, 8), Point(1, 9)),
+        Tag("reference.call", "é", 41, len(SOURCE) - 1, 41, 43, Point(2, 15), Point(2, 17)),
+        Tag("reference.call", "g", 44, 52, 49, 50, Point(2, 23), Point(2, 24)),
+    ]
+    assert [tag.is_definition for tag in tags] == [True, True, False, False]
+
+
+def test_extract_tags_from_tree() -> None:
+    tree = get_parser("python").parse(SOURCE)
+
+    tags = extract_tags("python", SOURCE, tree=tree)
+
+    assert tags.names == ["A", "f", "é", "g"]
+    assert pickle.loads(pickle.dumps(tags)) == tags
+    assert len(extract_tags("python", b"")) == 0
+
+
+def test_extract_tags_without_tags_query() -> None:
+    assert has_tags("python")
+    assert not has_tags("json")
+    with pytest.raises(LookupError, match="No 'tags' query"):
+        extract_tags("json", b"{}")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_extract_tags_many(workers: int) -> None:
+    items: list[tuple[SupportedLanguage, bytes]] = [
+        ("python", SOURCE),
+        ("json", b"{}"),
+        ("python", b"def g(): pass"),
+    ]
+
+    results = list(extract_tags_many(items, workers=workers, chunk_size=1))
+
+    assert [result.index for result in results] == [0, 1, 2]
+    assert [result.tags.names if result.tags else None for result in results] == [["A", "f", "é", "g"], None, ["g"]]
+    assert isinstance(results[1].error, LookupError)
+    assert not results[1].ok
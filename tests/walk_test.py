@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tree_sitter_language_pack import ParsedFile, TreeParseStats, parse_tree
+from tree_sitter_language_pack.walk import DEFAULT_EXCLUDE
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MAX_FILE_SIZE = 64
+
+
+@pytest.fixture
+def source_tree(tmp_path: Path) -> Path:
+    files = {
+        "app.py": b"def main(): pass\n",
+        "lib/util.py": b"x = 1\n",
+        "lib/config.yaml": b"key: value\n",
+        "lib/data.py": b"x = '\0'\n",
+        "lib/large.py": b"x = 1\n" * MAX_FILE_SIZE,
+        "bin/tool": b"#!/usr/bin/env python3\nprint('hello')\n",
+        "README": b"no language\n",
+        "node_modules/dep/index.py": b"y = 2\n",
+        ".git/hooks/pre-commit.py": b"z = 3\n",
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parse_tree(source_tree: Path, workers: int) -> None:
+    stats = TreeParseStats()
+
+    results = list(parse_tree(source_tree, workers=workers, max_file_size=MAX_FILE_SIZE, ordered=True, stats=stats))
+
+    assert [(result.path, result.language) for result in results] == [
+        (str(source_tree / "app.py"), "python"),
+        (str(source_tree / "bin" / "tool"), "python"),
+        (str(source_tree / "lib" / "config.yaml"), "yaml"),
+        (str(source_tree / "lib" / "util.py"), "python"),
+    ]
+    assert [result.tree.root_node.type for result in results] == ["module", "module", "stream", "module"]
+    assert stats.files_parsed == len(results)
+    assert stats.bytes_parsed == sum((source_tree / result.path).stat().st_size for result in results)
+    assert stats.skipped == {"excluded": 2, "undetected": 1, "oversized": 1, "binary": 1}
+    assert stats.errors == {}
+    assert set(stats.language_seconds) == {"python", "yaml"}
+    assert stats.files_per_second > 0
+    assert stats.bytes_per_second > 0
+
+
+def test_parse_tree_include(source_tree: Path) -> None:
+    results = list(parse_tree(source_tree, include=["lib/*.py"], max_file_size=MAX_FILE_SIZE))
+
+    assert [path for path, _, _ in results] == [str(source_tree / "lib" / "util.py")]
+    assert isinstance(results[0], ParsedFile)
+
+
+def test_parse_tree_exclude(source_tree: Path) -> None:
+    exclude = [*DEFAULT_EXCLUDE, "lib", "bin/*"]
+    results = list(parse_tree(source_tree, exclude=exclude, max_file_size=MAX_FILE_SIZE))
+
+    assert [path for path, _, _ in results] == [str(source_tree / "app.py")]
+
+
+def test_parse_tree_is_lazy(source_tree: Path) -> None:
+    stats = TreeParseStats()
+    results = parse_tree(source_tree, workers=1, max_in_flight=1, chunk_size=1, stats=stats)
+
+    next(results)
+    assert stats.files_parsed == 1
+    assert stats.finished is None
+
+    assert len(list(results)) == stats.files_parsed - 1
+    assert stats.finished is not None
+
+
+def test_parse_tree_invalid_configuration(source_tree: Path) -> None:
+    with pytest.raises(ValueError, match="must be positive"):
+        next(parse_tree(source_tree, workers=0))
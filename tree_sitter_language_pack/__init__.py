@@ -1,257 +1,169 @@
 from __future__ import annotations
 
-import ctypes
-import sys
 from importlib import import_module
-from pathlib import Path
-from typing import Literal, cast
-
-import tree_sitter_c_sharp
-import tree_sitter_embedded_template
-import tree_sitter_yaml
-from tree_sitter import Language, Parser
-
-SupportedLanguage = Literal[
-    "actionscript",
-    "ada",
-    "agda",
-    "apex",
-    "arduino",
-    "asm",
-    "astro",
-    "bash",
-    "beancount",
-    "bibtex",
-    "bicep",
-    "bitbake",
-    "bsl",
-    "c",
-    "cairo",
-    "capnp",
-    "chatito",
-    "clarity",
-    "clojure",
-    "cmake",
-    "cobol",
-    "comment",
-    "commonlisp",
-    "cpon",
-    "cpp",
-    "csharp",
-    "css",
-    "csv",
-    "cuda",
-    "d",
-    "dart",
-    "dockerfile",
-    "doxygen",
-    "dtd",
-    "elisp",
-    "elixir",
-    "elm",
-    "embeddedtemplate",
-    "erlang",
-    "fennel",
-    "firrtl",
-    "fish",
-    "fortran",
-    "fsharp",
-    "fsharp_signature",
-    "func",
-    "gdscript",
-    "gitattributes",
-    "gitcommit",
-    "gitignore",
-    "gleam",
-    "glsl",
-    "gn",
-    "go",
-    "gomod",
-    "gosum",
-    "graphql",
-    "groovy",
-    "gstlaunch",
-    "hack",
-    "hare",
-    "haskell",
-    "haxe",
-    "hcl",
-    "heex",
-    "hlsl",
-    "html",
-    "hyprlang",
-    "ini",
-    "ispc",
-    "janet",
-    "java",
-    "javascript",
-    "jsdoc",
-    "json",
-    "jsonnet",
-    "julia",
-    "kconfig",
-    "kdl",
-    "kotlin",
-    "latex",
-    "linkerscript",
-    "llvm",
-    "lua",
-    "luadoc",
-    "luap",
-    "luau",
-    "make",
-    "markdown",
-    "markdown_inline",
-    "matlab",
-    "mermaid",
-    "meson",
-    "netlinx",
-    "nim",
-    "ninja",
-    "nix",
-    "nqc",
-    "objc",
-    "ocaml",
-    "ocaml_interface",
-    "odin",
-    "org",
-    "pascal",
-    "pem",
-    "perl",
-    "pgn",
-    "php",
-    "po",
-    "pony",
-    "powershell",
-    "printf",
-    "prisma",
-    "properties",
-    "proto",
-    "psv",
-    "puppet",
-    "purescript",
-    "pymanifest",
-    "python",
-    "qmldir",
-    "qmljs",
-    "query",
-    "r",
-    "racket",
-    "re2c",
-    "readline",
-    "rego",
-    "requirements",
-    "ron",
-    "rst",
-    "ruby",
-    "rust",
-    "scala",
-    "scheme",
-    "scss",
-    "smali",
-    "smithy",
-    "solidity",
-    "sparql",
-    "swift",
-    "sql",
-    "squirrel",
-    "starlark",
-    "svelte",
-    "tablegen",
-    "tcl",
-    "terraform",
-    "test",
-    "thrift",
-    "toml",
-    "tsv",
-    "tsx",
-    "twig",
-    "typescript",
-    "typst",
-    "udev",
-    "ungrammar",
-    "uxntal",
-    "v",
-    "verilog",
-    "vhdl",
-    "vim",
-    "vue",
-    "wast",
-    "wat",
-    "wgsl",
-    "xcompose",
-    "xml",
-    "yaml",
-    "yuck",
-    "zig",
-    "magik",
+from typing import TYPE_CHECKING
+
+from tree_sitter_language_pack._core import (
+    SupportedLanguage,
+    available_languages,
+    cached_languages,
+    clear_cache,
+    get_binding,
+    get_language,
+    get_parser,
+    preload,
+    set_cache_size,
+)
+from tree_sitter_language_pack.batch import ParseResult, parse_many
+from tree_sitter_language_pack.budget import (
+    BudgetResult,
+    CircuitBreaker,
+    get_circuit_breaker,
+    parse_many_with_budget,
+    parse_with_budget,
+)
+from tree_sitter_language_pack.columnar import ERROR_KIND_ID, FlatTree, NodeFlag, flatten_tree, get_kind_names
+from tree_sitter_language_pack.detection import detect_language, get_parser_for_path
+from tree_sitter_language_pack.document import Document, ParseSession
+from tree_sitter_language_pack.files import parse_file
+from tree_sitter_language_pack.metadata import LanguageInfo, language_info, list_languages
+from tree_sitter_language_pack.pool import ParserPool, PoolStats, get_parser_pool, get_pooled_parser
+from tree_sitter_language_pack.process_pool import FileResult, parse_files
+from tree_sitter_language_pack.queries import (
+    available_queries,
+    clear_query_cache,
+    compile_query,
+    get_query,
+    get_query_source,
+    set_query_cache_size,
+)
+from tree_sitter_language_pack.stats import StatsResult, TreeStats, parse_stats, parse_stats_many, tree_stats
+from tree_sitter_language_pack.tags import Tag, Tags, TagsResult, extract_tags, extract_tags_many, has_tags
+from tree_sitter_language_pack.walk import ParsedFile, TreeParseStats, parse_tree
+
+if TYPE_CHECKING:
+    from tree_sitter_language_pack.aio import AsyncParseExecutor, aget_parser, aparse, aparse_many, get_async_executor
+    from tree_sitter_language_pack.injections import InjectionLayer, LayeredDocument, parse_layers
+    from tree_sitter_language_pack.instrumentation import (
+        Histogram,
+        InstrumentationEvent,
+        LanguageMetrics,
+        add_instrumentation_hook,
+        disable_instrumentation,
+        enable_instrumentation,
+        get_metrics,
+        instrumentation_enabled,
+        remove_instrumentation_hook,
+        render_metrics,
+        reset_metrics,
+    )
+
+# These modules import asyncio or compile queries at import time, so they are only imported on first use
+_LAZY_ATTRIBUTES = {
+    "AsyncParseExecutor": "aio",
+    "aget_parser": "aio",
+    "aparse": "aio",
+    "aparse_many": "aio",
+    "get_async_executor": "aio",
+    "InjectionLayer": "injections",
+    "LayeredDocument": "injections",
+    "parse_layers": "injections",
+    "Histogram": "instrumentation",
+    "InstrumentationEvent": "instrumentation",
+    "LanguageMetrics": "instrumentation",
+    "add_instrumentation_hook": "instrumentation",
+    "disable_instrumentation": "instrumentation",
+    "enable_instrumentation": "instrumentation",
+    "get_metrics": "instrumentation",
+    "instrumentation_enabled": "instrumentation",
+    "remove_instrumentation_hook": "instrumentation",
+    "render_metrics": "instrumentation",
+    "reset_metrics": "instrumentation",
+}
+
+__all__ = [
+    "ERROR_KIND_ID",
+    "AsyncParseExecutor",
+    "BudgetResult",
+    "CircuitBreaker",
+    "Document",
+    "FileResult",
+    "FlatTree",
+    "Histogram",
+    "InjectionLayer",
+    "InstrumentationEvent",
+    "LanguageInfo",
+    "LanguageMetrics",
+    "LayeredDocument",
+    "NodeFlag",
+    "ParseResult",
+    "ParseSession",
+    "ParsedFile",
+    "ParserPool",
+    "PoolStats",
+    "StatsResult",
+    "SupportedLanguage",
+    "Tag",
+    "Tags",
+    "TagsResult",
+    "TreeParseStats",
+    "TreeStats",
+    "add_instrumentation_hook",
+    "aget_parser",
+    "aparse",
+    "aparse_many",
+    "available_languages",
+    "available_queries",
+    "cached_languages",
+    "clear_cache",
+    "clear_query_cache",
+    "compile_query",
+    "detect_language",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "extract_tags",
+    "extract_tags_many",
+    "flatten_tree",
+    "get_async_executor",
+    "get_binding",
+    "get_circuit_breaker",
+    "get_kind_names",
+    "get_language",
+    "get_metrics",
+    "get_parser",
+    "get_parser_for_path",
+    "get_parser_pool",
+    "get_pooled_parser",
+    "get_query",
+    "get_query_source",
+    "has_tags",
+    "instrumentation_enabled",
+    "language_info",
+    "list_languages",
+    "parse_file",
+    "parse_files",
+    "parse_layers",
+    "parse_many",
+    "parse_many_with_budget",
+    "parse_stats",
+    "parse_stats_many",
+    "parse_tree",
+    "parse_with_budget",
+    "preload",
+    "remove_instrumentation_hook",
+    "render_metrics",
+    "reset_metrics",
+    "set_cache_size",
+    "set_query_cache_size",
+    "tree_stats",
 ]
 
 
-def get_binding(language_name: SupportedLanguage) -> object:
-    """Get the binding for the given language name.
-
-    Args:
-        language_name: The name of the language.
-
-    Raises:
-        LookupError: If the language is not found.
-
-    Returns:
-        A pycapsule object
-    """
-    if language_name == "yaml":
-        return tree_sitter_yaml.language()
-
-    if language_name == "csharp":
-        return tree_sitter_c_sharp.language()
-
-    if language_name == "embeddedtemplate":
-        return tree_sitter_embedded_template.language()
-
-    try:
-        module = import_module(name=f".bindings.{language_name}", package=__package__)
-        return cast("object", module.language())
-    except (ModuleNotFoundError, ImportError) as e:
-        # Workaround for Windows environments where wheels built with one Python version (e.g., 3.12)
-        # and installed on a different version (e.g., 3.10) fail with "DLL load failed while importing".
-        # This may be a Python bug, handling cases where the normal import_module mechanism fails.
-        package_path = Path(__file__).parent
-        ext = ".pyd" if sys.platform.startswith("win") else ".so"
-        lib_path = package_path / "bindings" / f"{language_name}{ext}"
-
-        if lib_path.exists():
-            lib = ctypes.cdll.LoadLibrary(str(lib_path))
-            language_fn = getattr(lib, f"tree_sitter_{language_name}", None)
-            if language_fn:
-                return language_fn()
-
-        raise LookupError(f"Could not find language library for {language_name}") from e
-
-
-def get_language(language_name: SupportedLanguage) -> Language:
-    """Get the language with the given name.
-
-    Args:
-        language_name: The name of the language.
-
-    Returns:
-        Language: The language as a tree-sitter Language instance.
-    """
-    binding = get_binding(language_name)
-    return Language(binding)
-
-
-def get_parser(language_name: SupportedLanguage) -> Parser:
-    """Get a parser for the given language name.
-
-    Args:
-        language_name: The name of the language.
-
-    Returns:
-        Parser: The parser for the language as a tree-sitter Parser instance.
-    """
-    return Parser(get_language(language_name=language_name))
-
+def __getattr__(name: str) -> object:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["SupportedLanguage", "get_binding", "get_language", "get_parser"]
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
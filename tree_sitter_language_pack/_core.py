@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import ctypes
+import sys
+from collections import OrderedDict
+from functools import cache
+from importlib import import_module
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING, Literal, cast
+
+from tree_sitter import Language, Parser
+
+from tree_sitter_language_pack._instrumentation import instrumented_load, record_cache_hit, record_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import ModuleType
+
+SupportedLanguage = Literal[
+    "actionscript",
+    "ada",
+    "agda",
+    "apex",
+    "arduino",
+    "asm",
+    "astro",
+    "bash",
+    "beancount",
+    "bibtex",
+    "bicep",
+    "bitbake",
+    "bsl",
+    "c",
+    "cairo",
+    "capnp",
+    "chatito",
+    "clarity",
+    "clojure",
+    "cmake",
+    "cobol",
+    "comment",
+    "commonlisp",
+    "cpon",
+    "cpp",
+    "csharp",
+    "css",
+    "csv",
+    "cuda",
+    "d",
+    "dart",
+    "dockerfile",
+    "doxygen",
+    "dtd",
+    "elisp",
+    "elixir",
+    "elm",
+    "embeddedtemplate",
+    "erlang",
+    "fennel",
+    "firrtl",
+    "fish",
+    "fortran",
+    "fsharp",
+    "fsharp_signature",
+    "func",
+    "gdscript",
+    "gitattributes",
+    "gitcommit",
+    "gitignore",
+    "gleam",
+    "glsl",
+    "gn",
+    "go",
+    "gomod",
+    "gosum",
+    "graphql",
+    "groovy",
+    "gstlaunch",
+    "hack",
+    "hare",
+    "haskell",
+    "haxe",
+    "hcl",
+    "heex",
+    "hlsl",
+    "html",
+    "hyprlang",
+    "ini",
+    "ispc",
+    "janet",
+    "java",
+    "javascript",
+    "jsdoc",
+    "json",
+    "jsonnet",
+    "julia",
+    "kconfig",
+    "kdl",
+    "kotlin",
+    "latex",
+    "linkerscript",
+    "llvm",
+    "lua",
+    "luadoc",
+    "luap",
+    "luau",
+    "make",
+    "markdown",
+    "markdown_inline",
+    "matlab",
+    "mermaid",
+    "meson",
+    "netlinx",
+    "nim",
+    "ninja",
+    "nix",
+    "nqc",
+    "objc",
+    "ocaml",
+    "ocaml_interface",
+    "odin",
+    "org",
+    "pascal",
+    "pem",
+    "perl",
+    "pgn",
+    "php",
+    "po",
+    "pony",
+    "powershell",
+    "printf",
+    "prisma",
+    "properties",
+    "proto",
+    "psv",
+    "puppet",
+    "purescript",
+    "pymanifest",
+    "python",
+    "qmldir",
+    "qmljs",
+    "query",
+    "r",
+    "racket",
+    "re2c",
+    "readline",
+    "rego",
+    "requirements",
+    "ron",
+    "rst",
+    "ruby",
+    "rust",
+    "scala",
+    "scheme",
+    "scss",
+    "smali",
+    "smithy",
+    "solidity",
+    "sparql",
+    "swift",
+    "sql",
+    "squirrel",
+    "starlark",
+    "svelte",
+    "tablegen",
+    "tcl",
+    "terraform",
+    "test",
+    "thrift",
+    "toml",
+    "tsv",
+    "tsx",
+    "twig",
+    "typescript",
+    "typst",
+    "udev",
+    "ungrammar",
+    "uxntal",
+    "v",
+    "verilog",
+    "vhdl",
+    "vim",
+    "vue",
+    "wast",
+    "wat",
+    "wgsl",
+    "xcompose",
+    "xml",
+    "yaml",
+    "yuck",
+    "zig",
+    "magik",
+]
+
+_EXTERNAL_BINDINGS: dict[str, str] = {
+    "csharp": "tree_sitter_c_sharp",
+    "embeddedtemplate": "tree_sitter_embedded_template",
+    "yaml": "tree_sitter_yaml",
+}
+
+
+@cache
+def _load_combined_bindings() -> tuple[ModuleType | None, frozenset[str]]:
+    """Load the extension module that bundles all languages, if the package was built with TSLP_BUILD_MODE=combined.
+
+    Returns:
+        The combined bindings module and the names of the languages it contains, or None and an empty set.
+    """
+    try:
+        module = import_module(name=".bindings._combined", package=__package__)
+    except ImportError:
+        return None, frozenset()
+    return module, frozenset(module.languages())
+
+
+def get_binding(language_name: SupportedLanguage) -> object:
+    """Get the binding for the given language name.
+
+    Args:
+        language_name: The name of the language.
+
+    Raises:
+        LookupError: If the language is not found.
+
+    Returns:
+        A pycapsule object
+    """
+    return instrumented_load(language_name, _load_binding)
+
+
+def _load_binding(language_name: SupportedLanguage) -> object:
+    if language_name in _EXTERNAL_BINDINGS:
+        # These grammars are provided by third-party packages and imported on first use, so that importing this
+        # package does not load their shared libraries.
+        return cast("object", import_module(_EXTERNAL_BINDINGS[language_name]).language())
+
+    combined_bindings, combined_language_names = _load_combined_bindings()
+    if combined_bindings is not None and language_name in combined_language_names:
+        return cast("object", combined_bindings.language(language_name))
+
+    try:
+        module = import_module(name=f".bindings.{language_name}", package=__package__)
+        return cast("object", module.language())
+    except (ModuleNotFoundError, ImportError) as e:
+        # Workaround for Windows environments where wheels built with one Python version (e.g., 3.12)
+        # and installed on a different version (e.g., 3.10) fail with "DLL load failed while importing".
+        # This may be a Python bug, handling cases where the normal import_module mechanism fails.
+        package_path = Path(__file__).parent
+        ext = ".pyd" if sys.platform.startswith("win") else ".so"
+        lib_path = package_path / "bindings" / f"{language_name}{ext}"
+
+        if lib_path.exists():
+            lib = ctypes.cdll.LoadLibrary(str(lib_path))
+            language_fn = getattr(lib, f"tree_sitter_{language_name}", None)
+            if language_fn:
+                return language_fn()
+
+        raise LookupError(
+            f"Could not find language library for {language_name}. "
+            f"Languages available in this build: {', '.join(available_languages())}"
+        ) from e
+
+
+def available_languages() -> list[SupportedLanguage]:
+    """Get the names of the languages compiled into this build of the package.
+
+    Wheels built with TSLP_LANGUAGES or TSLP_PROFILES contain only a subset of the supported languages.
+
+    Returns:
+        list[SupportedLanguage]: The sorted names of the available languages.
+    """
+    bindings_path = Path(__file__).parent / "bindings"
+    language_names = {
+        path.name.split(".", 1)[0]
+        for path in bindings_path.iterdir()
+        if path.suffix in {".so", ".pyd"} and not path.name.startswith("_")
+    }
+    language_names.update(_load_combined_bindings()[1])
+    language_names.update(_EXTERNAL_BINDINGS)
+    return cast("list[SupportedLanguage]", sorted(language_names))
+
+
+class _LanguageCache:
+    """A thread-safe cache of tree-sitter Language instances keyed by language name.
+
+    The cache is unbounded by default. When a maximum size is set, it behaves as an LRU cache and evicts the least
+    recently used language once the limit is exceeded.
+    """
+
+    def __init__(self, maxsize: int | None = None) -> None:
+        self._lock = RLock()
+        self._languages: OrderedDict[SupportedLanguage, Language] = OrderedDict()
+        self._maxsize = maxsize
+
+    @property
+    def maxsize(self) -> int | None:
+        """The maximum number of cached languages, or None if the cache is unbounded."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int | None) -> None:
+        if value is not None and value < 1:
+            raise ValueError("maxsize must be a positive integer or None")
+
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, language_name: SupportedLanguage) -> Language:
+        """Get the language for the given name, loading and caching it on a miss.
+
+        Args:
+            language_name: The name of the language.
+
+        Returns:
+            Language: The cached tree-sitter Language instance.
+        """
+        with self._lock:
+            language = self._languages.get(language_name)
+            if language is None:
+                language = Language(get_binding(language_name))
+                self._languages[language_name] = language
+                self._evict()
+            else:
+                record_cache_hit(language_name)
+                if self._maxsize is not None:
+                    self._languages.move_to_end(language_name)
+            return language
+
+    def keys(self) -> list[SupportedLanguage]:
+        """Get the names of the cached languages, from least to most recently used."""
+        with self._lock:
+            return list(self._languages)
+
+    def clear(self) -> None:
+        """Remove all cached languages."""
+        with self._lock:
+            self._languages.clear()
+
+    def _evict(self) -> None:
+        if self._maxsize is not None:
+            while len(self._languages) > self._maxsize:
+                self._languages.popitem(last=False)
+
+
+_language_cache = _LanguageCache()
+
+
+def get_language(language_name: SupportedLanguage) -> Language:
+    """Get the language with the given name.
+
+    Languages are cached per process, so repeated calls for the same name return the same instance.
+
+    Args:
+        language_name: The name of the language.
+
+    Returns:
+        Language: The language as a tree-sitter Language instance.
+    """
+    return _language_cache.get(language_name)
+
+
+def get_parser(language_name: SupportedLanguage) -> Parser:
+    """Get a parser for the given language name.
+
+    Args:
+        language_name: The name of the language.
+
+    Returns:
+        Parser: The parser for the language as a tree-sitter Parser instance.
+    """
+    parser = Parser(get_language(language_name=language_name))
+    record_parser(language_name)
+    return parser
+
+
+def preload(language_names: Iterable[SupportedLanguage]) -> None:
+    """Load the given languages into the language cache ahead of time.
+
+    Args:
+        language_names: The names of the languages to load.
+    """
+    for language_name in language_names:
+        _language_cache.get(language_name)
+
+
+def cached_languages() -> list[SupportedLanguage]:
+    """Get the names of the languages currently held in the language cache.
+
+    Returns:
+        list[SupportedLanguage]: The cached language names, from least to most recently used.
+    """
+    return _language_cache.keys()
+
+
+def clear_cache() -> None:
+    """Remove all languages from the language cache."""
+    _language_cache.clear()
+
+
+def set_cache_size(maxsize: int | None) -> None:
+    """Set the maximum number of languages held in the language cache.
+
+    Passing an integer switches the cache to LRU mode, evicting the least recently used languages beyond the limit.
+    Passing None makes the cache unbounded, which is the default.
+
+    Args:
+        maxsize: The maximum number of cached languages, or None for an unbounded cache.
+    """
+    _language_cache.maxsize = maxsize
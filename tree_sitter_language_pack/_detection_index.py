@@ -0,0 +1,718 @@
+# This file is generated by scripts/generate_detection_index.py from sources/language_detection.json. Do not edit.
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+FILENAMES: Final[Mapping[str, SupportedLanguage]] = MappingProxyType(
+    {
+        ".Rprofile": "r",
+        ".XCompose": "xcompose",
+        ".babelrc": "json",
+        ".bash_aliases": "bash",
+        ".bash_logout": "bash",
+        ".bash_profile": "bash",
+        ".bashrc": "bash",
+        ".clang-format": "yaml",
+        ".clang-tidy": "yaml",
+        ".dockerignore": "gitignore",
+        ".editorconfig": "ini",
+        ".emacs": "elisp",
+        ".eslintignore": "gitignore",
+        ".eslintrc": "json",
+        ".exrc": "vim",
+        ".gitattributes": "gitattributes",
+        ".gitconfig": "ini",
+        ".gitignore": "gitignore",
+        ".gvimrc": "vim",
+        ".inputrc": "readline",
+        ".luacheckrc": "lua",
+        ".npmignore": "gitignore",
+        ".npmrc": "ini",
+        ".prettierignore": "gitignore",
+        ".prettierrc": "json",
+        ".profile": "bash",
+        ".pythonrc": "python",
+        ".vimrc": "vim",
+        ".zprofile": "bash",
+        ".zshenv": "bash",
+        ".zshrc": "bash",
+        "APKBUILD": "bash",
+        "BUILD": "starlark",
+        "BUILD.bazel": "starlark",
+        "Brewfile": "ruby",
+        "CMakeLists.txt": "cmake",
+        "COMMIT_EDITMSG": "gitcommit",
+        "Cargo.lock": "toml",
+        "Cask": "elisp",
+        "Config.in": "kconfig",
+        "Containerfile": "dockerfile",
+        "Dockerfile": "dockerfile",
+        "Fastfile": "ruby",
+        "GNUmakefile": "make",
+        "Gemfile": "ruby",
+        "Guardfile": "ruby",
+        "Jenkinsfile": "groovy",
+        "Kbuild": "make",
+        "Kconfig": "kconfig",
+        "MANIFEST.in": "pymanifest",
+        "MERGE_MSG": "gitcommit",
+        "MODULE.bazel": "starlark",
+        "Makefile": "make",
+        "PKGBUILD": "bash",
+        "Pipfile": "toml",
+        "Podfile": "ruby",
+        "Puppetfile": "puppet",
+        "Rakefile": "ruby",
+        "SConscript": "python",
+        "SConstruct": "python",
+        "TAG_EDITMSG": "gitcommit",
+        "Tiltfile": "starlark",
+        "Vagrantfile": "ruby",
+        "WORKSPACE": "starlark",
+        "WORKSPACE.bazel": "starlark",
+        "XCompose": "xcompose",
+        "_vimrc": "vim",
+        "composer.lock": "json",
+        "constraints.txt": "requirements",
+        "flake.lock": "json",
+        "go.mod": "gomod",
+        "go.sum": "gosum",
+        "go.work": "gomod",
+        "go.work.sum": "gosum",
+        "hypridle.conf": "hyprlang",
+        "hyprland.conf": "hyprlang",
+        "hyprlock.conf": "hyprlang",
+        "hyprpaper.conf": "hyprlang",
+        "inputrc": "readline",
+        "makefile": "make",
+        "meson.build": "meson",
+        "meson.options": "meson",
+        "meson_options.txt": "meson",
+        "mix.lock": "elixir",
+        "poetry.lock": "toml",
+        "qmldir": "qmldir",
+        "rebar.config": "erlang",
+        "rebar.lock": "erlang",
+        "requirements-dev.txt": "requirements",
+        "requirements-test.txt": "requirements",
+        "requirements.in": "requirements",
+        "requirements.txt": "requirements",
+        "setup.cfg": "ini",
+        "tox.ini": "ini",
+        "uv.lock": "toml",
+    }
+)
+"""Exact file names, matched case-sensitively."""
+
+EXTENSIONS: Final[Mapping[str, SupportedLanguage]] = MappingProxyType(
+    {
+        "ada": "ada",
+        "adb": "ada",
+        "ads": "ada",
+        "agda": "agda",
+        "apex": "apex",
+        "as": "actionscript",
+        "asd": "commonlisp",
+        "asm": "asm",
+        "astro": "astro",
+        "atom": "xml",
+        "axi": "netlinx",
+        "axs": "netlinx",
+        "bash": "bash",
+        "bats": "bash",
+        "bazel": "starlark",
+        "bb": "bitbake",
+        "bbappend": "bitbake",
+        "bbclass": "bitbake",
+        "bean": "beancount",
+        "beancount": "beancount",
+        "bib": "bibtex",
+        "bicep": "bicep",
+        "bsl": "bsl",
+        "bzl": "starlark",
+        "c": "c",
+        "c++": "cpp",
+        "cairo": "cairo",
+        "capnp": "capnp",
+        "cbl": "cobol",
+        "cc": "cpp",
+        "cer": "pem",
+        "cfg": "ini",
+        "chatito": "chatito",
+        "cjs": "javascript",
+        "cl": "commonlisp",
+        "clar": "clarity",
+        "clj": "clojure",
+        "cljc": "clojure",
+        "cljs": "clojure",
+        "cls": "apex",
+        "cmake": "cmake",
+        "cob": "cobol",
+        "comp": "glsl",
+        "conf": "ini",
+        "containerfile": "dockerfile",
+        "cpon": "cpon",
+        "cpp": "cpp",
+        "cpy": "cobol",
+        "crt": "pem",
+        "cs": "csharp",
+        "csproj": "xml",
+        "csr": "pem",
+        "css": "css",
+        "csv": "csv",
+        "csx": "csharp",
+        "cts": "typescript",
+        "cu": "cuda",
+        "cuh": "cuda",
+        "cxx": "cpp",
+        "d": "d",
+        "dart": "dart",
+        "ddl": "sql",
+        "di": "d",
+        "dml": "sql",
+        "dockerfile": "dockerfile",
+        "dpr": "pascal",
+        "dtd": "dtd",
+        "dtx": "latex",
+        "edn": "clojure",
+        "ejs": "embeddedtemplate",
+        "el": "elisp",
+        "elm": "elm",
+        "epp": "puppet",
+        "erb": "embeddedtemplate",
+        "erl": "erlang",
+        "escript": "erlang",
+        "ex": "elixir",
+        "exs": "elixir",
+        "f": "fortran",
+        "f03": "fortran",
+        "f08": "fortran",
+        "f77": "fortran",
+        "f90": "fortran",
+        "f95": "fortran",
+        "fc": "func",
+        "fir": "firrtl",
+        "fish": "fish",
+        "fnl": "fennel",
+        "for": "fortran",
+        "frag": "glsl",
+        "fs": "fsharp",
+        "fsi": "fsharp_signature",
+        "fsproj": "xml",
+        "fsx": "fsharp",
+        "func": "func",
+        "fx": "hlsl",
+        "fxh": "hlsl",
+        "gd": "gdscript",
+        "gemspec": "ruby",
+        "geojson": "json",
+        "geom": "glsl",
+        "gleam": "gleam",
+        "glsl": "glsl",
+        "gn": "gn",
+        "gni": "gn",
+        "go": "go",
+        "gql": "graphql",
+        "gradle": "groovy",
+        "graphql": "graphql",
+        "graphqls": "graphql",
+        "groovy": "groovy",
+        "gvy": "groovy",
+        "gyp": "python",
+        "gypi": "python",
+        "h": "c",
+        "h++": "cpp",
+        "ha": "hare",
+        "hack": "hack",
+        "hcl": "hcl",
+        "heex": "heex",
+        "hh": "cpp",
+        "hhi": "hack",
+        "hlsl": "hlsl",
+        "hlsli": "hlsl",
+        "hpp": "cpp",
+        "hrl": "erlang",
+        "hs": "haskell",
+        "hs-boot": "haskell",
+        "htm": "html",
+        "html": "html",
+        "hx": "haxe",
+        "hxx": "cpp",
+        "ini": "ini",
+        "inl": "cpp",
+        "ino": "arduino",
+        "ipp": "cpp",
+        "ispc": "ispc",
+        "isph": "ispc",
+        "janet": "janet",
+        "java": "java",
+        "jdn": "janet",
+        "jl": "julia",
+        "js": "javascript",
+        "json": "json",
+        "json5": "json",
+        "jsonc": "json",
+        "jsonnet": "jsonnet",
+        "jsx": "javascript",
+        "kdl": "kdl",
+        "key": "pem",
+        "ksh": "bash",
+        "kt": "kotlin",
+        "kts": "kotlin",
+        "ld": "linkerscript",
+        "lds": "linkerscript",
+        "libsonnet": "jsonnet",
+        "lisp": "commonlisp",
+        "ll": "llvm",
+        "lpr": "pascal",
+        "lsp": "commonlisp",
+        "ltx": "latex",
+        "lua": "lua",
+        "luau": "luau",
+        "m": "objc",
+        "magik": "magik",
+        "mak": "make",
+        "make": "make",
+        "markdown": "markdown",
+        "md": "markdown",
+        "mdown": "markdown",
+        "mdx": "markdown",
+        "mermaid": "mermaid",
+        "mjs": "javascript",
+        "mk": "make",
+        "mkd": "markdown",
+        "ml": "ocaml",
+        "mli": "ocaml_interface",
+        "mm": "objc",
+        "mmd": "mermaid",
+        "mts": "typescript",
+        "mysql": "sql",
+        "nasm": "asm",
+        "nim": "nim",
+        "nimble": "nim",
+        "nims": "nim",
+        "ninja": "ninja",
+        "nix": "nix",
+        "nomad": "hcl",
+        "nqc": "nqc",
+        "nut": "squirrel",
+        "odin": "odin",
+        "org": "org",
+        "os": "bsl",
+        "pas": "pascal",
+        "pde": "arduino",
+        "pem": "pem",
+        "pgn": "pgn",
+        "pgsql": "sql",
+        "php": "php",
+        "php3": "php",
+        "php4": "php",
+        "php5": "php",
+        "phps": "php",
+        "phtml": "php",
+        "pl": "perl",
+        "plist": "xml",
+        "pm": "perl",
+        "po": "po",
+        "pod": "perl",
+        "pom": "xml",
+        "pony": "pony",
+        "pot": "po",
+        "pp": "puppet",
+        "prisma": "prisma",
+        "properties": "properties",
+        "props": "xml",
+        "proto": "proto",
+        "ps1": "powershell",
+        "psd1": "powershell",
+        "psm1": "powershell",
+        "psv": "psv",
+        "purs": "purescript",
+        "pxd": "python",
+        "py": "python",
+        "pyi": "python",
+        "pyw": "python",
+        "pyx": "python",
+        "qml": "qmljs",
+        "r": "r",
+        "rake": "ruby",
+        "rb": "ruby",
+        "rbi": "ruby",
+        "re": "re2c",
+        "rego": "rego",
+        "rest": "rst",
+        "rkt": "racket",
+        "rktd": "racket",
+        "rktl": "racket",
+        "rmd": "r",
+        "rockspec": "lua",
+        "ron": "ron",
+        "rq": "sparql",
+        "rs": "rust",
+        "rss": "xml",
+        "rst": "rst",
+        "ru": "ruby",
+        "rules": "udev",
+        "s": "asm",
+        "sbt": "scala",
+        "sc": "scala",
+        "scala": "scala",
+        "scm": "scheme",
+        "scss": "scss",
+        "sh": "bash",
+        "sky": "starlark",
+        "sld": "scheme",
+        "sls": "scheme",
+        "smali": "smali",
+        "smithy": "smithy",
+        "sol": "solidity",
+        "sparql": "sparql",
+        "sql": "sql",
+        "ss": "scheme",
+        "star": "starlark",
+        "sty": "latex",
+        "sv": "verilog",
+        "svelte": "svelte",
+        "svg": "xml",
+        "svh": "verilog",
+        "swift": "swift",
+        "t": "perl",
+        "tab": "tsv",
+        "tal": "uxntal",
+        "targets": "xml",
+        "tcl": "tcl",
+        "td": "tablegen",
+        "tesc": "glsl",
+        "tese": "glsl",
+        "tex": "latex",
+        "tf": "terraform",
+        "tfvars": "terraform",
+        "thrift": "thrift",
+        "tk": "tcl",
+        "tm": "tcl",
+        "toml": "toml",
+        "tpp": "cpp",
+        "trigger": "apex",
+        "ts": "typescript",
+        "tsv": "tsv",
+        "tsx": "tsx",
+        "twig": "twig",
+        "typ": "typst",
+        "ungram": "ungrammar",
+        "v": "verilog",
+        "vbproj": "xml",
+        "vert": "glsl",
+        "vh": "verilog",
+        "vhd": "vhdl",
+        "vhdl": "vhdl",
+        "vim": "vim",
+        "vimrc": "vim",
+        "vsh": "v",
+        "vue": "vue",
+        "vv": "v",
+        "wast": "wast",
+        "wat": "wat",
+        "webmanifest": "json",
+        "wgsl": "wgsl",
+        "wsdl": "xml",
+        "xhtml": "html",
+        "xml": "xml",
+        "xsd": "xml",
+        "xsl": "xml",
+        "xslt": "xml",
+        "yaml": "yaml",
+        "yml": "yaml",
+        "yuck": "yuck",
+        "zig": "zig",
+        "zon": "zig",
+        "zsh": "bash",
+    }
+)
+"""Lowercase file extensions without the leading dot, possibly with several parts such as ``d.ts``."""
+
+INTERPRETERS: Final[Mapping[str, SupportedLanguage]] = MappingProxyType(
+    {
+        "ash": "bash",
+        "bash": "bash",
+        "bb": "clojure",
+        "bun": "javascript",
+        "chicken": "scheme",
+        "clisp": "commonlisp",
+        "clojure": "clojure",
+        "csi": "scheme",
+        "dart": "dart",
+        "dash": "bash",
+        "deno": "javascript",
+        "elixir": "elixir",
+        "escript": "erlang",
+        "fennel": "fennel",
+        "fish": "fish",
+        "groovy": "groovy",
+        "guile": "scheme",
+        "hhvm": "hack",
+        "janet": "janet",
+        "jruby": "ruby",
+        "julia": "julia",
+        "ksh": "bash",
+        "lua": "lua",
+        "luajit": "lua",
+        "make": "make",
+        "node": "javascript",
+        "nodejs": "javascript",
+        "ocaml": "ocaml",
+        "perl": "perl",
+        "php": "php",
+        "powershell": "powershell",
+        "pwsh": "powershell",
+        "pypy": "python",
+        "pypy3": "python",
+        "python": "python",
+        "python2": "python",
+        "python3": "python",
+        "racket": "racket",
+        "rake": "ruby",
+        "rscript": "r",
+        "ruby": "ruby",
+        "runghc": "haskell",
+        "runhaskell": "haskell",
+        "rust-script": "rust",
+        "sbcl": "commonlisp",
+        "scala": "scala",
+        "sh": "bash",
+        "swift": "swift",
+        "tclsh": "tcl",
+        "ts-node": "typescript",
+        "tsx": "typescript",
+        "uv": "python",
+        "wish": "tcl",
+        "zsh": "bash",
+    }
+)
+"""Lowercase interpreter names found in shebang lines."""
+
+MODELINE_NAMES: Final[Mapping[str, SupportedLanguage]] = MappingProxyType(
+    {
+        "actionscript": "actionscript",
+        "ada": "ada",
+        "agda": "agda",
+        "apex": "apex",
+        "arduino": "arduino",
+        "asm": "asm",
+        "astro": "astro",
+        "bash": "bash",
+        "bazel": "starlark",
+        "beancount": "beancount",
+        "bibtex": "bibtex",
+        "bicep": "bicep",
+        "bitbake": "bitbake",
+        "bsl": "bsl",
+        "c": "c",
+        "c#": "csharp",
+        "c++": "cpp",
+        "cairo": "cairo",
+        "capnp": "capnp",
+        "chatito": "chatito",
+        "clarity": "clarity",
+        "clojure": "clojure",
+        "cmake": "cmake",
+        "cobol": "cobol",
+        "comment": "comment",
+        "commonlisp": "commonlisp",
+        "conf": "ini",
+        "cpon": "cpon",
+        "cpp": "cpp",
+        "cs": "csharp",
+        "csharp": "csharp",
+        "css": "css",
+        "csv": "csv",
+        "cuda": "cuda",
+        "d": "d",
+        "dart": "dart",
+        "delphi": "pascal",
+        "docker": "dockerfile",
+        "dockerfile": "dockerfile",
+        "dosini": "ini",
+        "doxygen": "doxygen",
+        "dtd": "dtd",
+        "elisp": "elisp",
+        "elixir": "elixir",
+        "elm": "elm",
+        "emacs-lisp": "elisp",
+        "embeddedtemplate": "embeddedtemplate",
+        "erlang": "erlang",
+        "eruby": "embeddedtemplate",
+        "ess-r": "r",
+        "f#": "fsharp",
+        "fennel": "fennel",
+        "firrtl": "firrtl",
+        "fish": "fish",
+        "fortran": "fortran",
+        "fsharp": "fsharp",
+        "fsharp_signature": "fsharp_signature",
+        "func": "func",
+        "gas": "asm",
+        "gdscript": "gdscript",
+        "gitattributes": "gitattributes",
+        "gitcommit": "gitcommit",
+        "gitignore": "gitignore",
+        "gleam": "gleam",
+        "glsl": "glsl",
+        "gn": "gn",
+        "go": "go",
+        "golang": "go",
+        "gomod": "gomod",
+        "gosum": "gosum",
+        "graphql": "graphql",
+        "groovy": "groovy",
+        "gstlaunch": "gstlaunch",
+        "hack": "hack",
+        "hare": "hare",
+        "haskell": "haskell",
+        "haxe": "haxe",
+        "hcl": "hcl",
+        "heex": "heex",
+        "hlsl": "hlsl",
+        "html": "html",
+        "hyprlang": "hyprlang",
+        "ini": "ini",
+        "ispc": "ispc",
+        "janet": "janet",
+        "java": "java",
+        "java-properties": "properties",
+        "javascript": "javascript",
+        "js": "javascript",
+        "js2": "javascript",
+        "jsdoc": "jsdoc",
+        "json": "json",
+        "jsonnet": "jsonnet",
+        "julia": "julia",
+        "kconfig": "kconfig",
+        "kdl": "kdl",
+        "kotlin": "kotlin",
+        "latex": "latex",
+        "linkerscript": "linkerscript",
+        "lisp": "commonlisp",
+        "llvm": "llvm",
+        "lua": "lua",
+        "luadoc": "luadoc",
+        "luap": "luap",
+        "luau": "luau",
+        "magik": "magik",
+        "make": "make",
+        "makefile": "make",
+        "markdown": "markdown",
+        "markdown_inline": "markdown_inline",
+        "matlab": "matlab",
+        "mermaid": "mermaid",
+        "meson": "meson",
+        "nasm": "asm",
+        "netlinx": "netlinx",
+        "nim": "nim",
+        "ninja": "ninja",
+        "nix": "nix",
+        "nqc": "nqc",
+        "nxml": "xml",
+        "objc": "objc",
+        "objective-c": "objc",
+        "objectivec": "objc",
+        "ocaml": "ocaml",
+        "ocaml_interface": "ocaml_interface",
+        "octave": "matlab",
+        "odin": "odin",
+        "org": "org",
+        "pascal": "pascal",
+        "pem": "pem",
+        "perl": "perl",
+        "pgn": "pgn",
+        "php": "php",
+        "po": "po",
+        "pony": "pony",
+        "powershell": "powershell",
+        "printf": "printf",
+        "prisma": "prisma",
+        "properties": "properties",
+        "proto": "proto",
+        "protobuf": "proto",
+        "psv": "psv",
+        "puppet": "puppet",
+        "purescript": "purescript",
+        "pwsh": "powershell",
+        "py": "python",
+        "pymanifest": "pymanifest",
+        "python": "python",
+        "python3": "python",
+        "qmldir": "qmldir",
+        "qmljs": "qmljs",
+        "query": "query",
+        "r": "r",
+        "racket": "racket",
+        "rb": "ruby",
+        "re2c": "re2c",
+        "readline": "readline",
+        "rego": "rego",
+        "requirements": "requirements",
+        "restructuredtext": "rst",
+        "ron": "ron",
+        "rs": "rust",
+        "rst": "rst",
+        "ruby": "ruby",
+        "rust": "rust",
+        "scala": "scala",
+        "scheme": "scheme",
+        "scss": "scss",
+        "sh": "bash",
+        "shell": "bash",
+        "shell-script": "bash",
+        "smali": "smali",
+        "smithy": "smithy",
+        "solidity": "solidity",
+        "sparql": "sparql",
+        "sql": "sql",
+        "squirrel": "squirrel",
+        "starlark": "starlark",
+        "svelte": "svelte",
+        "swift": "swift",
+        "systemverilog": "verilog",
+        "tablegen": "tablegen",
+        "tcl": "tcl",
+        "terraform": "terraform",
+        "test": "test",
+        "tex": "latex",
+        "tf": "terraform",
+        "thrift": "thrift",
+        "toml": "toml",
+        "ts": "typescript",
+        "tsv": "tsv",
+        "tsx": "tsx",
+        "twig": "twig",
+        "typescript": "typescript",
+        "typst": "typst",
+        "udev": "udev",
+        "ungrammar": "ungrammar",
+        "uxntal": "uxntal",
+        "v": "v",
+        "verilog": "verilog",
+        "vhdl": "vhdl",
+        "vim": "vim",
+        "viml": "vim",
+        "vimscript": "vim",
+        "vlang": "v",
+        "vue": "vue",
+        "wast": "wast",
+        "wat": "wat",
+        "wgsl": "wgsl",
+        "xcompose": "xcompose",
+        "xml": "xml",
+        "yaml": "yaml",
+        "yuck": "yuck",
+        "zig": "zig",
+        "zsh": "bash",
+    }
+)
+"""Lowercase language names and aliases found in Emacs and Vim modelines."""
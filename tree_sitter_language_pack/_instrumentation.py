@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter, time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tree_sitter import Parser, Point, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+    from tree_sitter_language_pack.instrumentation import InstrumentationEvent
+
+# The recording side of tree_sitter_language_pack.instrumentation, which the rest of the package calls into. It is kept
+# free of dataclasses and other import-time work, so that the public module is only imported when it is used.
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "seconds")
+
+    def __init__(self, bucket_count: int) -> None:
+        # One count per bucket and one for observations beyond the last bound
+        self.counts = [0] * (bucket_count + 1)
+        self.seconds = 0.0
+
+    def observe(self, bounds: tuple[float, ...], seconds: float) -> None:
+        self.counts[bisect_left(bounds, seconds)] += 1
+        self.seconds += seconds
+
+
+class LanguageMetrics:
+    __slots__ = (
+        "bytes_parsed",
+        "cache_hits",
+        "error_trees",
+        "incremental_parses",
+        "load_failures",
+        "load_seconds",
+        "loads",
+        "parse_failures",
+        "parse_seconds",
+        "parsers",
+        "parses",
+    )
+
+    def __init__(self, bucket_count: int) -> None:
+        self.loads = 0
+        self.load_failures = 0
+        self.load_seconds = Histogram(bucket_count)
+        self.cache_hits = 0
+        self.parsers = 0
+        self.parses = 0
+        self.incremental_parses = 0
+        self.parse_failures = 0
+        self.error_trees = 0
+        self.bytes_parsed = 0
+        self.parse_seconds = Histogram(bucket_count)
+
+
+class Instrumentation:
+    __slots__ = ("buckets", "enabled", "hooks", "lock", "metrics")
+
+    def __init__(self) -> None:
+        # Checked without the lock on every instrumented call, so that disabled instrumentation costs one attribute
+        # lookup
+        self.enabled = False
+        self.lock = Lock()
+        self.buckets: tuple[float, ...] = DEFAULT_BUCKETS
+        self.metrics: dict[SupportedLanguage, LanguageMetrics] = {}
+        # Replaced rather than mutated, so that events are dispatched without holding the lock
+        self.hooks: tuple[Callable[[InstrumentationEvent], None], ...] = ()
+
+    def get(self, language_name: SupportedLanguage) -> LanguageMetrics:
+        metrics = self.metrics.get(language_name)
+        if metrics is None:
+            metrics = self.metrics[language_name] = LanguageMetrics(len(self.buckets))
+        return metrics
+
+    def record_load(
+        self, language_name: SupportedLanguage, started_at: float, seconds: float, error: BaseException | None
+    ) -> None:
+        with self.lock:
+            metrics = self.get(language_name)
+            metrics.load_seconds.observe(self.buckets, seconds)
+            if error is None:
+                metrics.loads += 1
+            else:
+                metrics.load_failures += 1
+
+        if self.hooks:
+            self.dispatch("load", language_name, started_at, seconds, 0, False, False, error)
+
+    def record_parse(  # noqa: PLR0913
+        self,
+        language_name: SupportedLanguage,
+        started_at: float,
+        seconds: float,
+        size: int,
+        incremental: bool,
+        has_error: bool,
+        error: BaseException | None,
+    ) -> None:
+        with self.lock:
+            metrics = self.get(language_name)
+            metrics.parse_seconds.observe(self.buckets, seconds)
+            metrics.parses += 1
+            metrics.incremental_parses += incremental
+            metrics.bytes_parsed += size
+            metrics.error_trees += has_error
+            metrics.parse_failures += error is not None
+
+        # Events are only built for hooks, as they cost about as much as updating the metrics
+        if self.hooks:
+            self.dispatch("parse", language_name, started_at, seconds, size, incremental, has_error, error)
+
+    def dispatch(  # noqa: PLR0913
+        self,
+        kind: str,
+        language_name: SupportedLanguage,
+        started_at: float,
+        seconds: float,
+        size: int,
+        incremental: bool,
+        has_error: bool,
+        error: BaseException | None,
+    ) -> None:
+        # Hooks are registered through the public module, so it has been imported already
+        from tree_sitter_language_pack.instrumentation import InstrumentationEvent  # noqa: PLC0415
+
+        event = InstrumentationEvent(
+            kind,  # type: ignore[arg-type]
+            language_name,
+            started_at,
+            seconds,
+            size,
+            incremental,
+            has_error,
+            error,
+        )
+        for hook in self.hooks:
+            hook(event)
+
+
+state = Instrumentation()
+
+
+def instrumented_load(language_name: SupportedLanguage, load: Callable[[SupportedLanguage], object]) -> object:
+    """Load a grammar, recording the load if instrumentation is enabled.
+
+    Args:
+        language_name: The name of the language.
+        load: The function loading the binding of the language.
+
+    Returns:
+        object: The binding returned by the function.
+    """
+    if not state.enabled:
+        return load(language_name)
+
+    started_at = time()
+    start = perf_counter()
+    try:
+        binding = load(language_name)
+    except BaseException as e:
+        state.record_load(language_name, started_at, perf_counter() - start, e)
+        raise
+    state.record_load(language_name, started_at, perf_counter() - start, None)
+    return binding
+
+
+def record_cache_hit(language_name: SupportedLanguage) -> None:
+    """Count a language served from the language cache, if instrumentation is enabled."""
+    if state.enabled:
+        with state.lock:
+            state.get(language_name).cache_hits += 1
+
+
+def record_parser(language_name: SupportedLanguage) -> None:
+    """Count a created parser, if instrumentation is enabled."""
+    if state.enabled:
+        with state.lock:
+            state.get(language_name).parsers += 1
+
+
+def instrumented_parse(
+    parser: Parser,
+    language_name: SupportedLanguage,
+    source: bytes | memoryview | Callable[[int, Point], bytes],
+    old_tree: Tree | None = None,
+    *,
+    size: int | None = None,
+) -> Tree:
+    """Parse a source, recording the parse if instrumentation is enabled.
+
+    Args:
+        parser: The parser, set to the language.
+        language_name: The name of the language.
+        source: The source, or a function reading it.
+        old_tree: The tree of the previous version of the source, edited to match it.
+        size: The number of bytes parsed. Defaults to the length of the source, or 0 for read functions.
+
+    Returns:
+        Tree: The parsed tree.
+    """
+    if not state.enabled:
+        return parser.parse(source) if old_tree is None else parser.parse(source, old_tree)
+
+    if size is None:
+        size = 0 if callable(source) else len(source)
+    started_at = time()
+    start = perf_counter()
+    try:
+        tree = parser.parse(source) if old_tree is None else parser.parse(source, old_tree)
+    except BaseException as e:
+        state.record_parse(language_name, started_at, perf_counter() - start, size, old_tree is not None, False, e)
+        raise
+    seconds = perf_counter() - start
+    state.record_parse(language_name, started_at, seconds, size, old_tree is not None, tree.root_node.has_error, None)
+    return tree
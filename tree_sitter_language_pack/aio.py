@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import AsyncIterable
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+from time import sleep
+from typing import TYPE_CHECKING, TypeVar
+
+from tree_sitter_language_pack._core import get_parser
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.batch import ParseResult, _pop_ready
+from tree_sitter_language_pack.pool import ParserPool, get_parser_pool
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
+    from concurrent.futures import Future
+
+    from tree_sitter import Parser, Point, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+_T = TypeVar("_T")
+
+# The size of the slices larger sources are fed to the parser in. Between slices, a running parse checks whether it was
+# cancelled and lets other threads, such as the event loop, take the GIL.
+_READ_CHUNK_SIZE = 8 * 1024
+
+
+class _Lane:
+    """A thread pool whose threads are handed out to coroutines in FIFO order, one task per thread.
+
+    Tasks only reach the thread pool once a thread is free, so waiting tasks can be cancelled before they start and
+    the work queue of the thread pool never grows.
+    """
+
+    __slots__ = ("_free", "_lock", "_waiters", "executor")
+
+    def __init__(self, workers: int, thread_name_prefix: str) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+        self._lock = Lock()
+        self._free = workers
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # A thread was already handed to the waiter. If the waiter was cancelled before it was woken, `_wake`
+            # passes the thread on instead.
+            if not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        # Called from worker threads when a task finishes, so waiters are woken in the thread of their event loop
+        with self._lock:
+            if not self._waiters:
+                self._free += 1
+                return
+            waiter = self._waiters.popleft()
+        waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+
+    def _wake(self, waiter: asyncio.Future[None]) -> None:
+        if waiter.cancelled():
+            self.release()
+        else:
+            waiter.set_result(None)
+
+
+class AsyncParseExecutor:
+    """Parses sources for asyncio code on dedicated threads, without blocking the event loop.
+
+    Sources of at least ``large_source_bytes`` are parsed on a separate, smaller set of threads than other sources, so
+    a burst of large sources cannot delay small ones. Each set of threads runs one parse per thread; further requests
+    wait in FIFO order without blocking the event loop, which applies backpressure to the callers. Parsers are checked
+    out of a `ParserPool`, so they are reused across requests.
+
+    Requests can be cancelled and given a timeout. Sources are fed to the parser in slices of a few KiB, so a cancelled
+    parse stops at the next slice and frees its thread instead of running to completion. The tree-sitter bindings hold
+    the GIL while parsing; between slices, the parse hands the GIL on, so the event loop stays responsive while long
+    parses run.
+
+    An executor can be used from several event loops and threads at once.
+
+    Example:
+        ```python
+        executor = AsyncParseExecutor(workers=4, large_source_bytes=256 * 1024)
+        tree = await executor.parse("python", b"x = 1", timeout=1.0)
+        ```
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int | None = None,
+        large_workers: int | None = None,
+        large_source_bytes: int = 1024 * 1024,
+        pool: ParserPool | None = None,
+    ) -> None:
+        """Create a new executor. Its threads are started on first use.
+
+        Args:
+            workers: The number of threads parsing sources below ``large_source_bytes``. Defaults to the number of
+                CPUs, capped at 32.
+            large_workers: The number of threads parsing sources of at least ``large_source_bytes``. Defaults to half
+                of ``workers``, rounded up.
+            large_source_bytes: The size from which sources are parsed on the threads for large sources.
+            pool: The parser pool to check parsers out of. Defaults to the process-wide parser pool.
+
+        Raises:
+            ValueError: If workers, large_workers or large_source_bytes are not positive.
+        """
+        if workers is None:
+            workers = min(32, os.cpu_count() or 1)
+        if large_workers is None:
+            large_workers = (workers + 1) // 2
+        if workers < 1 or large_workers < 1 or large_source_bytes < 1:
+            raise ValueError("workers, large_workers and large_source_bytes must be positive integers")
+
+        self.workers = workers
+        self.large_workers = large_workers
+        self.large_source_bytes = large_source_bytes
+        self._pool = pool or get_parser_pool()
+        self._lane = _Lane(workers, "tree-sitter-async")
+        self._large_lane = _Lane(large_workers, "tree-sitter-async-large")
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Stop the threads of the executor. Requests made afterwards fail with a RuntimeError.
+
+        Args:
+            wait: Whether to wait for running parses to finish.
+        """
+        self._lane.executor.shutdown(wait=wait)
+        self._large_lane.executor.shutdown(wait=wait)
+
+    async def get_parser(self, language_name: SupportedLanguage) -> Parser:
+        """Create a parser for a language on a worker thread, so that loading the grammar does not block the loop.
+
+        Args:
+            language_name: The name of the language.
+
+        Returns:
+            Parser: A new parser for the language, owned by the caller.
+        """
+        return await self._run(self._lane, lambda _: get_parser(language_name))
+
+    async def parse(
+        self,
+        language_name: SupportedLanguage,
+        source: bytes,
+        *,
+        old_tree: Tree | None = None,
+        timeout: float | None = None,
+    ) -> Tree:
+        """Parse a source on a worker thread.
+
+        Args:
+            language_name: The name of the language.
+            source: The source to parse.
+            old_tree: The previous tree of the source, for incremental parsing after ``Tree.edit``.
+            timeout: The number of seconds to wait for a thread and the parse, or None to wait indefinitely.
+
+        Raises:
+            asyncio.TimeoutError: If the timeout expired. The parse is cancelled.
+
+        Returns:
+            Tree: The parsed tree.
+        """
+        lane = self._large_lane if len(source) >= self.large_source_bytes else self._lane
+        run = self._run(lane, lambda cancelled: self._parse(cancelled, language_name, source, old_tree))
+        if timeout is None:
+            return await run
+        return await asyncio.wait_for(run, timeout)
+
+    async def parse_many(
+        self,
+        items: Iterable[tuple[SupportedLanguage, bytes]] | AsyncIterable[tuple[SupportedLanguage, bytes]],
+        *,
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[ParseResult]:
+        """Parse many sources concurrently on the worker threads, like `parse_many`.
+
+        Sources are read lazily from ``items`` into a bounded window. Failures, including timeouts, are reported as
+        results with an ``error`` instead of being raised, so one bad input does not abort the batch. Closing the
+        iterator early cancels the parses still in flight.
+
+        Args:
+            items: The ``(language, source)`` pairs to parse, from a regular or an asynchronous iterable.
+            ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+            max_in_flight: The maximum number of sources read from ``items`` but not yet yielded, which bounds memory
+                use. Defaults to twice the number of threads.
+            timeout: The timeout of each parse in seconds, see `parse`.
+
+        Raises:
+            ValueError: If max_in_flight is not positive.
+
+        Yields:
+            ParseResult: The result of each parse.
+        """
+        if max_in_flight is None:
+            max_in_flight = 2 * (self.workers + self.large_workers)
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+
+        iterator = _iterate(items).__aiter__()
+        pending: set[asyncio.Task[ParseResult]] = set()
+        completed: dict[int, ParseResult] = {}
+        taken = 0
+        yielded = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and taken - yielded < max_in_flight:
+                    try:
+                        language_name, source = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.create_task(self._parse_result(taken, language_name, source, timeout)))
+                    taken += 1
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                completed.update((result.index, result) for result in (task.result() for task in done))
+
+                ready = _pop_ready(completed, yielded, ordered=ordered)
+                yielded += len(ready)
+                for result in ready:
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _parse_result(
+        self, index: int, language_name: SupportedLanguage, source: bytes, timeout: float | None
+    ) -> ParseResult:
+        try:
+            tree = await self.parse(language_name, source, timeout=timeout)
+        except Exception as e:  # noqa: BLE001
+            return ParseResult(index=index, language=language_name, error=e)
+        return ParseResult(index=index, language=language_name, tree=tree)
+
+    async def _run(self, lane: _Lane, function: Callable[[Event], _T]) -> _T:
+        await lane.acquire()
+        cancelled = Event()
+        try:
+            future: Future[_T] = lane.executor.submit(function, cancelled)
+        except BaseException:
+            lane.release()
+            raise
+        # The thread is only handed on once the task has finished, even if the caller stopped waiting for it
+        future.add_done_callback(lambda _: lane.release())
+
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def _parse(self, cancelled: Event, language_name: SupportedLanguage, source: bytes, old_tree: Tree | None) -> Tree:
+        with self._pool.parser(language_name) as parser:
+            if len(source) <= _READ_CHUNK_SIZE:
+                return instrumented_parse(parser, language_name, source, old_tree)
+
+            def read(byte_offset: int, _: Point) -> bytes:
+                # An empty slice ends the input, so the parser wraps up quickly once the parse was cancelled
+                if cancelled.is_set():
+                    return b""
+                # The bindings hold the GIL while parsing, so it is handed on explicitly
+                sleep(0)
+                return source[byte_offset : byte_offset + _READ_CHUNK_SIZE]
+
+            return instrumented_parse(parser, language_name, read, old_tree, size=len(source))
+
+
+async def _iterate(
+    items: Iterable[tuple[SupportedLanguage, bytes]] | AsyncIterable[tuple[SupportedLanguage, bytes]],
+) -> AsyncIterator[tuple[SupportedLanguage, bytes]]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+# Created on first use, so that importing the module does not start an executor
+_default_executor: AsyncParseExecutor | None = None
+_default_executor_lock = Lock()
+
+
+def get_async_executor() -> AsyncParseExecutor:
+    """Get the process-wide executor used by `aget_parser`, `aparse` and `aparse_many`.
+
+    The executor is created on the first call.
+
+    Returns:
+        AsyncParseExecutor: The default executor.
+    """
+    global _default_executor  # noqa: PLW0603
+    if _default_executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                _default_executor = AsyncParseExecutor()
+    return _default_executor
+
+
+async def aget_parser(language_name: SupportedLanguage) -> Parser:
+    """Get a parser for the given language without blocking the event loop, see `AsyncParseExecutor.get_parser`.
+
+    Args:
+        language_name: The name of the language.
+
+    Returns:
+        Parser: A new parser for the language.
+    """
+    return await get_async_executor().get_parser(language_name)
+
+
+async def aparse(
+    language_name: SupportedLanguage,
+    source: bytes,
+    *,
+    old_tree: Tree | None = None,
+    timeout: float | None = None,
+) -> Tree:
+    """Parse a source on the process-wide executor without blocking the event loop, see `AsyncParseExecutor.parse`.
+
+    Args:
+        language_name: The name of the language.
+        source: The source to parse.
+        old_tree: The previous tree of the source, for incremental parsing after ``Tree.edit``.
+        timeout: The number of seconds to wait for a thread and the parse, or None to wait indefinitely.
+
+    Raises:
+        asyncio.TimeoutError: If the timeout expired. The parse is cancelled.
+
+    Returns:
+        Tree: The parsed tree.
+    """
+    return await get_async_executor().parse(language_name, source, old_tree=old_tree, timeout=timeout)
+
+
+def aparse_many(
+    items: Iterable[tuple[SupportedLanguage, bytes]] | AsyncIterable[tuple[SupportedLanguage, bytes]],
+    *,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    timeout: float | None = None,
+) -> AsyncIterator[ParseResult]:
+    """Parse many sources on the process-wide executor, see `AsyncParseExecutor.parse_many`.
+
+    Args:
+        items: The ``(language, source)`` pairs to parse, from a regular or an asynchronous iterable.
+        ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+        max_in_flight: The maximum number of sources read from ``items`` but not yet yielded.
+        timeout: The timeout of each parse in seconds.
+
+    Returns:
+        AsyncIterator[ParseResult]: The result of each parse.
+    """
+    return get_async_executor().parse_many(items, ordered=ordered, max_in_flight=max_in_flight, timeout=timeout)
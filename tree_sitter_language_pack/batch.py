@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from threading import local
+from typing import TYPE_CHECKING, Protocol, TypeVar
+
+from tree_sitter_language_pack._core import SupportedLanguage, get_parser
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from tree_sitter import Parser, Tree
+
+
+@dataclass(frozen=True, slots=True)
+class ParseResult:
+    """The outcome of parsing a single source in a batch."""
+
+    index: int
+    """The position of the source in the input iterable."""
+    language: SupportedLanguage
+    """The language the source was parsed with."""
+    tree: Tree | None = None
+    """The parsed tree, or None if parsing failed."""
+    error: Exception | None = None
+    """The exception raised while parsing, or None if parsing succeeded."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the source was parsed successfully."""
+        return self.error is None
+
+
+class _WorkerParsers(local):
+    """Parsers owned by a single worker thread, created on first use per language."""
+
+    def __init__(self) -> None:
+        self.parsers: dict[SupportedLanguage, Parser] = {}
+
+    def get(self, language_name: SupportedLanguage) -> Parser:
+        parser = self.parsers.get(language_name)
+        if parser is None:
+            parser = self.parsers[language_name] = get_parser(language_name)
+        return parser
+
+
+def _parse_chunk(
+    worker_parsers: _WorkerParsers, language_name: SupportedLanguage, chunk: list[tuple[int, bytes]]
+) -> list[ParseResult]:
+    try:
+        parser = worker_parsers.get(language_name)
+    except Exception as e:  # noqa: BLE001
+        return [ParseResult(index=index, language=language_name, error=e) for index, _ in chunk]
+
+    results: list[ParseResult] = []
+    for index, source in chunk:
+        try:
+            tree = instrumented_parse(parser, language_name, source)
+        except Exception as e:  # noqa: BLE001, PERF203
+            results.append(ParseResult(index=index, language=language_name, error=e))
+        else:
+            results.append(ParseResult(index=index, language=language_name, tree=tree))
+    return results
+
+
+class _Indexed(Protocol):
+    @property
+    def index(self) -> int: ...
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R", bound=_Indexed)
+
+
+def _pop_ready(completed: dict[int, _R], next_index: int, *, ordered: bool) -> list[_R]:
+    if not ordered:
+        ready = list(completed.values())
+        completed.clear()
+        return ready
+
+    ready = []
+    while next_index in completed:
+        ready.append(completed.pop(next_index))
+        next_index += 1
+    return ready
+
+
+def _iter_windowed(
+    items: Iterable[tuple[SupportedLanguage, _T]],
+    submit_chunk: Callable[[SupportedLanguage, list[tuple[int, _T]]], Future[list[_R]]],
+    *,
+    ordered: bool,
+    max_in_flight: int,
+    chunk_size: int,
+) -> Iterator[_R]:
+    """Feed items to an executor in same-language chunks through a bounded window and yield their results.
+
+    Args:
+        items: The ``(language, payload)`` pairs to process.
+        submit_chunk: A callable that submits a chunk of ``(index, payload)`` pairs of one language to an executor.
+        ordered: Whether to yield results in input order.
+        max_in_flight: The maximum number of items read from ``items`` but not yet yielded.
+        chunk_size: The maximum number of items per chunk.
+
+    Yields:
+        The results of the chunks, one per item.
+    """
+    source_iterator = enumerate(items)
+    pending: set[Future[list[_R]]] = set()
+    completed: dict[int, _R] = {}
+    taken = 0
+    yielded = 0
+    exhausted = False
+
+    while True:
+        if not exhausted and taken - yielded < max_in_flight:
+            window = list(islice(source_iterator, max_in_flight - (taken - yielded)))
+            exhausted = not window
+            taken += len(window)
+
+            chunks: dict[SupportedLanguage, list[tuple[int, _T]]] = {}
+            for index, (language_name, payload) in window:
+                chunk = chunks.setdefault(language_name, [])
+                chunk.append((index, payload))
+                if len(chunk) == chunk_size:
+                    pending.add(submit_chunk(language_name, chunks.pop(language_name)))
+            pending.update(submit_chunk(language_name, chunk) for language_name, chunk in chunks.items())
+
+        if not pending:
+            break
+
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            completed.update((result.index, result) for result in future.result())
+
+        ready = _pop_ready(completed, yielded, ordered=ordered)
+        yielded += len(ready)
+        yield from ready
+
+
+def _map_chunks(  # noqa: PLR0913
+    items: Iterable[tuple[SupportedLanguage, _T]],
+    process_chunk: Callable[[_WorkerParsers, SupportedLanguage, list[tuple[int, _T]]], list[_R]],
+    *,
+    workers: int | None,
+    ordered: bool,
+    max_in_flight: int | None,
+    chunk_size: int,
+    thread_name_prefix: str,
+) -> Iterator[_R]:
+    """Process items in same-language chunks on a thread pool whose threads each keep one parser per language.
+
+    Args:
+        items: The ``(language, payload)`` pairs to process.
+        process_chunk: A callable that processes a chunk of ``(index, payload)`` pairs of one language with the
+            parsers of the calling worker thread and returns one result per item.
+        workers: The number of worker threads. Defaults to the number of CPUs, capped at 32.
+        ordered: Whether to yield results in input order.
+        max_in_flight: The maximum number of items read from ``items`` but not yet yielded. Defaults to
+            ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of items per chunk.
+        thread_name_prefix: The name prefix of the worker threads.
+
+    Raises:
+        ValueError: If workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        The results of the chunks, one per item.
+    """
+    if workers is None:
+        workers = min(32, os.cpu_count() or 1)
+    if max_in_flight is None:
+        max_in_flight = workers * chunk_size * 2
+    if workers < 1 or max_in_flight < 1 or chunk_size < 1:
+        raise ValueError("workers, max_in_flight and chunk_size must be positive integers")
+
+    worker_parsers = _WorkerParsers()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+
+    def submit_chunk(language_name: SupportedLanguage, chunk: list[tuple[int, _T]]) -> Future[list[_R]]:
+        return executor.submit(process_chunk, worker_parsers, language_name, chunk)
+
+    try:
+        yield from _iter_windowed(
+            items,
+            submit_chunk,
+            ordered=ordered,
+            max_in_flight=max_in_flight,
+            chunk_size=chunk_size,
+        )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_many(
+    items: Iterable[tuple[SupportedLanguage, bytes]],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    chunk_size: int = 16,
+) -> Iterator[ParseResult]:
+    """Parse many sources concurrently on a thread pool.
+
+    Sources are read lazily from ``items`` into a bounded window, grouped by language into chunks and parsed by
+    worker threads that each keep one reusable parser per language. Failures are reported as results with an
+    ``error`` instead of being raised, so one bad input does not abort the batch.
+
+    Note that the tree-sitter Python bindings hold the GIL while parsing, so on a regular CPython build the
+    threads mostly overlap the Python-side work around each parse rather than the parse loop itself.
+
+    Args:
+        items: The ``(language, source)`` pairs to parse.
+        workers: The number of worker threads. Defaults to the number of CPUs, capped at 32.
+        ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+        max_in_flight: The maximum number of sources read from ``items`` but not yet yielded, which bounds memory
+            use. Defaults to ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of same-language sources handed to a worker at once.
+
+    Raises:
+        ValueError: If workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        ParseResult: The result of each parse.
+    """
+    yield from _map_chunks(
+        items,
+        _parse_chunk,
+        workers=workers,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+        chunk_size=chunk_size,
+        thread_name_prefix="tree-sitter-parse",
+    )
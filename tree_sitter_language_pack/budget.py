@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import re
+import warnings
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Literal
+
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.batch import _map_chunks
+from tree_sitter_language_pack.pool import get_pooled_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from tree_sitter import Parser, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+    from tree_sitter_language_pack.batch import _WorkerParsers
+
+# The bindings deprecate timeout_micros in favor of the progress callback, which crashes the interpreter when it is
+# invoked with the current bindings. The timeout is checked by the parse loop itself, so it also stops parses that
+# do not advance through the source. The filter is installed once, as changing the filters per parse is not
+# thread-safe, and only matches the warnings raised by this module.
+warnings.filterwarnings("ignore", "Use the progress_callback", DeprecationWarning, f"{re.escape(__name__)}$")
+
+BudgetStatus = Literal["ok", "timeout", "oversized", "circuit_open", "error"]
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetResult:
+    """The outcome of parsing a source within a time budget and size limit."""
+
+    language: SupportedLanguage
+    """The language the source was parsed with."""
+    status: BudgetStatus
+    """Whether the source was parsed (``ok``), exceeded the time budget (``timeout``) or the size limit
+    (``oversized``), was rejected because the circuit breaker of the language is open (``circuit_open``), or failed
+    to parse (``error``)."""
+    tree: Tree | None = None
+    """The parsed tree, or None if the source was not parsed."""
+    error: Exception | None = None
+    """The exception raised while parsing, for results with status ``error``."""
+    seconds: float = 0.0
+    """The wall time spent parsing the source, including aborted parses."""
+    index: int = 0
+    """The position of the source in the input iterable of `parse_many_with_budget`."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the source was parsed successfully."""
+        return self.status == "ok"
+
+
+class _Circuit:
+    __slots__ = ("open_until", "overruns", "probing")
+
+    def __init__(self) -> None:
+        self.overruns: deque[float] = deque()
+        self.open_until: float | None = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """A thread-safe, per-language circuit breaker for parses that exceed their time budget.
+
+    After ``threshold`` budget overruns of a language within ``window`` seconds, the circuit of the language opens
+    and its parses are rejected without parsing for ``cooldown`` seconds. Once the cooldown elapsed, a single trial
+    parse is let through: if it finishes within its budget, the circuit closes again, otherwise it stays open for
+    another cooldown.
+
+    Example:
+        ```python
+        breaker = CircuitBreaker(threshold=3, cooldown=60)
+
+        result = parse_with_budget("python", source, timeout=0.5, breaker=breaker)
+        breaker.state("python")  # "closed", "open" or "half_open"
+        ```
+    """
+
+    def __init__(self, *, threshold: int = 3, window: float = 300.0, cooldown: float = 60.0) -> None:
+        """Create a new circuit breaker.
+
+        Args:
+            threshold: The number of budget overruns within the window that open the circuit of a language.
+            window: The number of seconds budget overruns are counted for.
+            cooldown: The number of seconds the circuit of a language stays open.
+
+        Raises:
+            ValueError: If threshold, window or cooldown are not positive.
+        """
+        if threshold < 1:
+            raise ValueError("threshold must be a positive integer")
+        if window <= 0 or cooldown <= 0:
+            raise ValueError("window and cooldown must be positive numbers")
+
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._lock = Lock()
+        self._circuits: dict[SupportedLanguage, _Circuit] = {}
+
+    def allow(self, language_name: SupportedLanguage) -> bool:
+        """Check whether a source of the given language may be parsed.
+
+        Once the cooldown of an open circuit elapsed, this lets a single trial parse through, whose outcome must be
+        reported with `record_success` or `record_overrun`.
+
+        Args:
+            language_name: The name of the language.
+
+        Returns:
+            bool: Whether the source may be parsed.
+        """
+        with self._lock:
+            circuit = self._circuits.get(language_name)
+            if circuit is None or circuit.open_until is None:
+                return True
+            if monotonic() < circuit.open_until or circuit.probing:
+                return False
+            circuit.probing = True
+            return True
+
+    def record_success(self, language_name: SupportedLanguage) -> None:
+        """Report a parse that finished within its time budget, closing the circuit after a trial parse.
+
+        Args:
+            language_name: The name of the language.
+        """
+        with self._lock:
+            circuit = self._circuits.get(language_name)
+            if circuit is not None and circuit.probing:
+                circuit.overruns.clear()
+                circuit.open_until = None
+                circuit.probing = False
+
+    def record_overrun(self, language_name: SupportedLanguage) -> None:
+        """Report a parse that exceeded its time budget, opening the circuit once the threshold is reached.
+
+        Args:
+            language_name: The name of the language.
+        """
+        now = monotonic()
+        with self._lock:
+            circuit = self._circuits.get(language_name)
+            if circuit is None:
+                circuit = self._circuits[language_name] = _Circuit()
+
+            if circuit.open_until is None:
+                circuit.overruns.append(now)
+                while circuit.overruns[0] <= now - self.window:
+                    circuit.overruns.popleft()
+                if len(circuit.overruns) < self.threshold:
+                    return
+            # A failed trial parse, or a parse that started before the circuit opened, extends the cooldown
+            circuit.overruns.clear()
+            circuit.open_until = now + self.cooldown
+            circuit.probing = False
+
+    def state(self, language_name: SupportedLanguage) -> CircuitState:
+        """Get the state of the circuit of a language.
+
+        Args:
+            language_name: The name of the language.
+
+        Returns:
+            CircuitState: ``closed`` if parses are let through, ``open`` if they are rejected, or ``half_open`` if
+                the cooldown elapsed and the next parse is a trial.
+        """
+        with self._lock:
+            circuit = self._circuits.get(language_name)
+            if circuit is None or circuit.open_until is None:
+                return "closed"
+            return "open" if monotonic() < circuit.open_until else "half_open"
+
+    def reset(self, language_name: SupportedLanguage | None = None) -> None:
+        """Close the circuit of a language and forget its overruns.
+
+        Args:
+            language_name: The name of the language, or None to reset all languages.
+        """
+        with self._lock:
+            if language_name is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(language_name, None)
+
+
+_default_breaker = CircuitBreaker()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide circuit breaker used by `parse_with_budget` and `parse_many_with_budget` by default.
+
+    Returns:
+        CircuitBreaker: The default circuit breaker.
+    """
+    return _default_breaker
+
+
+def parse_with_budget(  # noqa: PLR0913
+    language_name: SupportedLanguage,
+    source: bytes,
+    *,
+    timeout: float | None = None,
+    max_bytes: int | None = None,
+    breaker: CircuitBreaker | None = None,
+    parser: Parser | None = None,
+) -> BudgetResult:
+    """Parse a source, giving up once it exceeds a time budget or size limit instead of blocking.
+
+    Parses are aborted by the parse loop of tree-sitter once the timeout elapsed, including parses that stall on a
+    pathological input without advancing through it. Overruns are reported to a circuit breaker, which rejects the
+    sources of a language after repeated overruns. Failures are reported as results instead of being raised.
+
+    Args:
+        language_name: The name of the language.
+        source: The source to parse.
+        timeout: The time budget of the parse in seconds, or None for no time budget.
+        max_bytes: The maximum size of the source in bytes, or None for no size limit. Larger sources are not
+            parsed.
+        breaker: The circuit breaker of the languages. Defaults to the process-wide circuit breaker.
+        parser: The parser to parse the source with. Defaults to a parser checked out from the process-wide parser
+            pool.
+
+    Raises:
+        ValueError: If timeout or max_bytes are not positive.
+
+    Returns:
+        BudgetResult: The outcome of the parse.
+    """
+    _check_limits(timeout, max_bytes)
+    return _parse_with_budget(
+        language_name, source, 0, parser, timeout, max_bytes, _default_breaker if breaker is None else breaker
+    )
+
+
+def parse_many_with_budget(  # noqa: PLR0913
+    items: Iterable[tuple[SupportedLanguage, bytes]],
+    *,
+    timeout: float | None = None,
+    max_bytes: int | None = None,
+    breaker: CircuitBreaker | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    chunk_size: int = 16,
+) -> Iterator[BudgetResult]:
+    """Parse many sources concurrently on a thread pool, each within a time budget and size limit.
+
+    Sources are batched like in `parse_many` and parsed like in `parse_with_budget`, so a pathological source only
+    holds up its worker for the time budget.
+
+    Args:
+        items: The ``(language, source)`` pairs to parse.
+        timeout: The time budget of each parse in seconds, or None for no time budget.
+        max_bytes: The maximum size of each source in bytes, or None for no size limit.
+        breaker: The circuit breaker of the languages. Defaults to the process-wide circuit breaker.
+        workers: The number of worker threads. Defaults to the number of CPUs, capped at 32.
+        ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+        max_in_flight: The maximum number of sources read from ``items`` but not yet yielded, which bounds memory
+            use. Defaults to ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of same-language sources handed to a worker at once.
+
+    Raises:
+        ValueError: If timeout, max_bytes, workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        BudgetResult: The outcome of each parse.
+    """
+    _check_limits(timeout, max_bytes)
+    yield from _map_chunks(
+        items,
+        partial(_parse_chunk_with_budget, timeout, max_bytes, _default_breaker if breaker is None else breaker),
+        workers=workers,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+        chunk_size=chunk_size,
+        thread_name_prefix="tree-sitter-budget",
+    )
+
+
+def _check_limits(timeout: float | None, max_bytes: int | None) -> None:
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be a positive number or None")
+    if max_bytes is not None and max_bytes < 1:
+        raise ValueError("max_bytes must be a positive integer or None")
+
+
+def _parse_chunk_with_budget(  # noqa: PLR0913
+    timeout: float | None,
+    max_bytes: int | None,
+    breaker: CircuitBreaker,
+    worker_parsers: _WorkerParsers,
+    language_name: SupportedLanguage,
+    chunk: list[tuple[int, bytes]],
+) -> list[BudgetResult]:
+    try:
+        parser = worker_parsers.get(language_name)
+    except Exception as e:  # noqa: BLE001
+        return [BudgetResult(language_name, "error", error=e, index=index) for index, _ in chunk]
+
+    return [
+        _parse_with_budget(language_name, source, index, parser, timeout, max_bytes, breaker) for index, source in chunk
+    ]
+
+
+def _parse_with_budget(  # noqa: PLR0913
+    language_name: SupportedLanguage,
+    source: bytes,
+    index: int,
+    parser: Parser | None,
+    timeout: float | None,
+    max_bytes: int | None,
+    breaker: CircuitBreaker,
+) -> BudgetResult:
+    if max_bytes is not None and len(source) > max_bytes:
+        return BudgetResult(language_name, "oversized", index=index)
+    if not breaker.allow(language_name):
+        return BudgetResult(language_name, "circuit_open", index=index)
+
+    start = perf_counter()
+    try:
+        if parser is None:
+            with get_pooled_parser(language_name) as pooled_parser:
+                tree = _parse_with_timeout(pooled_parser, language_name, source, timeout)
+        else:
+            tree = _parse_with_timeout(parser, language_name, source, timeout)
+    except TimeoutError:
+        breaker.record_overrun(language_name)
+        return BudgetResult(language_name, "timeout", seconds=perf_counter() - start, index=index)
+    except Exception as e:  # noqa: BLE001
+        # Errors are raised quickly, so they do not count against the language
+        breaker.record_success(language_name)
+        return BudgetResult(language_name, "error", error=e, seconds=perf_counter() - start, index=index)
+
+    breaker.record_success(language_name)
+    return BudgetResult(language_name, "ok", tree=tree, seconds=perf_counter() - start, index=index)
+
+
+def _parse_with_timeout(parser: Parser, language_name: SupportedLanguage, source: bytes, timeout: float | None) -> Tree:
+    if timeout is None:
+        return instrumented_parse(parser, language_name, source)
+
+    previous_timeout_micros = parser.timeout_micros
+    # The type stubs of py-tree-sitter declare timeout_micros read-only, but it can be set
+    parser.timeout_micros = max(1, round(timeout * 1_000_000))  # type: ignore[misc]
+    start = perf_counter()
+    try:
+        return instrumented_parse(parser, language_name, source)
+    except ValueError as e:
+        # The bindings report any parse that returned no tree, e.g. on a parser without a language, like an abort
+        if str(e) != "Parsing failed" or perf_counter() - start < timeout:
+            raise
+        # An aborted parse is resumed by the next parse unless the parser is reset
+        parser.reset()
+        raise TimeoutError from e
+    finally:
+        parser.timeout_micros = previous_timeout_micros  # type: ignore[misc]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import IntFlag
+from functools import cache
+from typing import TYPE_CHECKING
+
+from tree_sitter_language_pack._core import get_language
+
+if TYPE_CHECKING:
+    from tree_sitter import Node, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+ERROR_KIND_ID = 0xFFFF
+"""The kind id of ``ERROR`` nodes, which is not part of the range covered by `get_kind_names`."""
+
+_NEWLINE_RE = re.compile(b"\n")
+
+
+class NodeFlag(IntFlag):
+    """The bits of `FlatTree.flags`."""
+
+    NAMED = 1
+    """The node is named, i.e. it is not an anonymous token such as a keyword or punctuation."""
+    ERROR = 2
+    """The node is an ``ERROR`` node."""
+    MISSING = 4
+    """The node was inserted by the parser to recover from a syntax error."""
+    EXTRA = 8
+    """The node is an extra, such as a comment, that may appear anywhere."""
+
+
+# Operators on IntFlag members are implemented in Python, so the traversal works with plain integers
+_NAMED, _ERROR, _MISSING, _EXTRA = (
+    int(flag) for flag in (NodeFlag.NAMED, NodeFlag.ERROR, NodeFlag.MISSING, NodeFlag.EXTRA)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FlatTree:
+    """A parsed tree flattened into parallel arrays, one entry per node in pre-order.
+
+    Unlike a ``tree_sitter.Tree``, a flat tree is compact and can be pickled, e.g. to return it from a worker process.
+    The arrays support the buffer protocol, so they can be wrapped without copying, e.g. with ``numpy.frombuffer``.
+    """
+
+    kind_ids: array[int]
+    """The kind id of each node, see `get_kind_names` and ``tree_sitter.Language.node_kind_for_id``."""
+    start_bytes: array[int]
+    """The start byte offset of each node."""
+    end_bytes: array[int]
+    """The end byte offset of each node."""
+    parent_indices: array[int]
+    """The index of the parent of each node, or -1 for the root node."""
+    start_rows: array[int]
+    """The line of the start of each node."""
+    start_columns: array[int]
+    """The byte column of the start of each node."""
+    end_rows: array[int]
+    """The line of the end of each node."""
+    end_columns: array[int]
+    """The byte column of the end of each node."""
+    flags: array[int]
+    """The `NodeFlag` bits of each node."""
+
+    def __len__(self) -> int:
+        """Get the number of nodes in the tree.
+
+        Returns:
+            int: The number of nodes.
+        """
+        return len(self.kind_ids)
+
+
+@cache
+def get_kind_names(language_name: SupportedLanguage) -> tuple[str, ...]:
+    """Get the names of the node kinds of a language, indexed by kind id.
+
+    Kind ids of ``ERROR`` nodes (`ERROR_KIND_ID`) are outside the returned range.
+
+    Args:
+        language_name: The name of the language.
+
+    Returns:
+        tuple[str, ...]: The name of each kind id, e.g. to map `FlatTree.kind_ids` to names.
+    """
+    language = get_language(language_name)
+    return tuple(language.node_kind_for_id(kind_id) or "" for kind_id in range(language.node_kind_count))
+
+
+def flatten_tree(tree: Tree) -> FlatTree:
+    """Flatten a parsed tree into parallel arrays in pre-order, in a single traversal.
+
+    If the tree still references its source, the points of the nodes are derived from the byte offsets and the line
+    breaks in the source, which is several times faster than reading them from each node. Otherwise, e.g. if the tree
+    was parsed from a memoryview that has been released since, the points are read from the nodes.
+
+    Args:
+        tree: The tree to flatten.
+
+    Returns:
+        FlatTree: The flattened tree.
+    """
+    kind_ids: array[int] = array("H")
+    start_bytes: array[int] = array("I")
+    end_bytes: array[int] = array("I")
+    parent_indices: array[int] = array("i")
+    flags: array[int] = array("B")
+    points: list[array[int]] = [array("I") for _ in range(4)]
+
+    root_node = tree.root_node
+    line_starts = _get_line_starts(root_node)
+    # The stack of the indices of the ancestors of the current node
+    ancestors = [-1]
+    cursor = tree.walk()
+    index = 0
+    while True:
+        node = cursor.node
+        if node is not None:
+            kind_id = node.kind_id
+            kind_ids.append(kind_id)
+            start_bytes.append(node.start_byte)
+            end_bytes.append(node.end_byte)
+            parent_indices.append(ancestors[-1])
+            flags.append(
+                (_NAMED if node.is_named else 0)
+                | (_ERROR if kind_id == ERROR_KIND_ID else 0)
+                | (_MISSING if node.is_missing else 0)
+                | (_EXTRA if node.is_extra else 0)
+            )
+            if line_starts is None:
+                _append_points(points, node)
+
+        if cursor.goto_first_child():
+            ancestors.append(index)
+            index += 1
+            continue
+
+        index += 1
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                if line_starts is not None:
+                    _append_rows_and_columns(start_bytes, end_bytes, line_starts, points)
+                start_rows, start_columns, end_rows, end_columns = points
+                return FlatTree(
+                    kind_ids=kind_ids,
+                    start_bytes=start_bytes,
+                    end_bytes=end_bytes,
+                    parent_indices=parent_indices,
+                    start_rows=start_rows,
+                    start_columns=start_columns,
+                    end_rows=end_rows,
+                    end_columns=end_columns,
+                    flags=flags,
+                )
+            ancestors.pop()
+
+
+def _get_line_starts(root_node: Node) -> list[int] | None:
+    try:
+        source = root_node.text
+    except ValueError:
+        # The tree was parsed from a memoryview that has been released since
+        return None
+    if source is None:
+        return None
+
+    # The root node may start after leading whitespace, so the offsets are relative to its start point
+    start_byte = root_node.start_byte
+    start_row, start_column = root_node.start_point
+    line_starts = [start_byte - start_column]
+    line_starts.extend(start_byte + match.end() for match in _NEWLINE_RE.finditer(source))
+
+    # The line breaks do not match the points, e.g. if the tree was parsed from UTF-16
+    end_row, end_column = root_node.end_point
+    if start_row + len(line_starts) - 1 != end_row or root_node.end_byte - line_starts[-1] != end_column:
+        return None
+    # Rows are the index of the line start, so pad the list up to the first row
+    return [line_starts[0]] * start_row + line_starts
+
+
+def _append_rows_and_columns(
+    start_bytes: array[int], end_bytes: array[int], line_starts: list[int], points: list[array[int]]
+) -> None:
+    start_rows, start_columns, end_rows, end_columns = points
+    # Start offsets never decrease in pre-order, so the start row only ever moves forward
+    line_starts = [*line_starts, sys.maxsize]
+    row = 0
+    next_line_start = line_starts[1]
+    for start_byte, end_byte in zip(start_bytes, end_bytes, strict=True):
+        while start_byte >= next_line_start:
+            row += 1
+            next_line_start = line_starts[row + 1]
+        start_rows.append(row)
+        start_columns.append(start_byte - line_starts[row])
+        # Most nodes end on the line they start on
+        end_row = row if end_byte < next_line_start else bisect_right(line_starts, end_byte, row + 1) - 1
+        end_rows.append(end_row)
+        end_columns.append(end_byte - line_starts[end_row])
+
+
+def _append_points(points: list[array[int]], node: Node) -> None:
+    start_row, start_column = node.start_point
+    end_row, end_column = node.end_point
+    points[0].append(start_row)
+    points[1].append(start_column)
+    points[2].append(end_row)
+    points[3].append(end_column)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import TYPE_CHECKING
+
+from tree_sitter_language_pack._core import SupportedLanguage, get_parser
+from tree_sitter_language_pack._detection_index import EXTENSIONS, FILENAMES, INTERPRETERS, MODELINE_NAMES
+
+if TYPE_CHECKING:
+    from tree_sitter import Parser
+
+DETECTION_READ_SIZE = 1024
+"""The number of leading bytes `get_parser_for_path` reads to look for a shebang or a modeline."""
+
+_MODELINE_SEARCH_LINES = 5
+
+_EMACS_MODELINE_RE = re.compile(rb"-\*-(.*?)-\*-")
+_EMACS_MODE_RE = re.compile(rb"(?:^|;)\s*mode\s*:\s*([\w+#.-]+)", re.IGNORECASE)
+_VIM_MODELINE_RE = re.compile(rb"\b(?:vi|vim|ex):.*?\b(?:ft|filetype|syntax|syn)=([\w+#.-]+)")
+_INTERPRETER_VERSION_RE = re.compile(r"[\d.]+$")
+
+
+def _detect_by_extension(file_name: str) -> SupportedLanguage | None:
+    lowered = file_name.lower()
+    # Try the longest extension first, e.g. "d.ts" before "ts", skipping the dot of hidden files
+    dot = lowered.find(".", 1)
+    while dot != -1:
+        if (language_name := EXTENSIONS.get(lowered[dot + 1 :])) is not None:
+            return language_name
+        dot = lowered.find(".", dot + 1)
+    return None
+
+
+def _detect_by_shebang(first_line: bytes) -> SupportedLanguage | None:
+    if not first_line.startswith(b"#!"):
+        return None
+
+    arguments = first_line[2:].decode("utf-8", "replace").split()
+    if not arguments:
+        return None
+
+    interpreter = arguments[0].rsplit("/", 1)[-1]
+    if interpreter == "env":
+        # Skip env options and variable assignments, e.g. "#!/usr/bin/env -S FOO=1 python3 -u"
+        interpreter = next((argument for argument in arguments[1:] if argument[0] != "-" and "=" not in argument), "")
+
+    interpreter = interpreter.lower()
+    return INTERPRETERS.get(interpreter) or INTERPRETERS.get(_INTERPRETER_VERSION_RE.sub("", interpreter))
+
+
+def _detect_by_modeline(lines: list[bytes]) -> SupportedLanguage | None:
+    for line in lines:
+        if (emacs_match := _EMACS_MODELINE_RE.search(line)) is not None:
+            variables = emacs_match.group(1)
+            if (mode_match := _EMACS_MODE_RE.search(variables)) is not None:
+                name = mode_match.group(1)
+            elif b":" not in variables:
+                name = variables.strip()
+            else:
+                continue
+        elif (vim_match := _VIM_MODELINE_RE.search(line)) is not None:
+            name = vim_match.group(1)
+        else:
+            continue
+
+        if (language_name := MODELINE_NAMES.get(name.decode("utf-8", "replace").lower())) is not None:
+            return language_name
+    return None
+
+
+def detect_language(path: str | os.PathLike[str], first_bytes: bytes | None = None) -> SupportedLanguage | None:
+    """Detect the language of a file from its name and, optionally, its first bytes.
+
+    The file name is looked up in a precomputed index of exact file names (e.g. ``Dockerfile`` or ``go.mod``), then
+    of file extensions. If neither matches and the leading bytes of the file are given, they are checked for a shebang
+    line (e.g. ``#!/usr/bin/env python3``) and for Emacs or Vim modelines. The file itself is never read.
+
+    Args:
+        path: The path or name of the file.
+        first_bytes: The leading bytes of the file, used for files whose name is not recognized.
+
+    Returns:
+        SupportedLanguage | None: The detected language, or None if the language could not be detected.
+    """
+    # os.path.basename is considerably faster than pathlib, which matters when crawling large trees
+    file_name = os.path.basename(path)  # noqa: PTH119
+    language_name = FILENAMES.get(file_name) or _detect_by_extension(file_name)
+    if language_name is not None or not first_bytes:
+        return language_name
+
+    lines = first_bytes.split(b"\n", _MODELINE_SEARCH_LINES)[:_MODELINE_SEARCH_LINES]
+    return _detect_by_shebang(lines[0]) or _detect_by_modeline(lines)
+
+
+def get_parser_for_path(path: str | os.PathLike[str], first_bytes: bytes | None = None) -> Parser:
+    """Get a parser for a file, detecting its language with `detect_language`.
+
+    If the language cannot be detected from the file name and no leading bytes are given, the first
+    `DETECTION_READ_SIZE` bytes of the file are read to look for a shebang or a modeline.
+
+    Args:
+        path: The path of the file.
+        first_bytes: The leading bytes of the file, if already available.
+
+    Raises:
+        LookupError: If the language of the file cannot be detected or is not available in this build.
+
+    Returns:
+        Parser: A parser for the detected language.
+    """
+    language_name = detect_language(path, first_bytes)
+    if language_name is None and first_bytes is None:
+        try:
+            with open(path, "rb") as file:  # noqa: PTH123
+                language_name = detect_language(path, file.read(DETECTION_READ_SIZE))
+        except OSError:
+            pass
+
+    if language_name is None:
+        raise LookupError(f"Could not detect the language of {os.fspath(path)}")
+    return get_parser(language_name)
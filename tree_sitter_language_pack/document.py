@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Literal
+
+from tree_sitter import Point, Range
+
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.pool import ParserPool, get_parser_pool
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tree_sitter import Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+PositionEncoding = Literal["utf-8", "utf-16", "utf-32"]
+"""The unit of the columns of line/column positions, named as in the Language Server Protocol."""
+
+
+def _column_to_byte(line: bytes, column: int, position_encoding: PositionEncoding) -> int:
+    if position_encoding == "utf-8" or line.isascii():
+        return min(column, len(line))
+
+    text = line.decode("utf-8", "surrogateescape")
+    if position_encoding == "utf-32":
+        return len(text[:column].encode("utf-8", "surrogateescape"))
+
+    units = 0
+    for index, character in enumerate(text):
+        if units >= column:
+            return len(text[:index].encode("utf-8", "surrogateescape"))
+        units += 2 if ord(character) > 0xFFFF else 1  # noqa: PLR2004
+    return len(line)
+
+
+def _byte_to_column(line: bytes, byte_column: int, position_encoding: PositionEncoding) -> int:
+    if position_encoding == "utf-8" or line.isascii():
+        return byte_column
+
+    text = line[:byte_column].decode("utf-8", "surrogateescape")
+    if position_encoding == "utf-32":
+        return len(text)
+    return len(text) + sum(ord(character) > 0xFFFF for character in text)  # noqa: PLR2004
+
+
+class Document:
+    r"""An open source document that is re-parsed incrementally as it is edited.
+
+    Edits are applied to the source and to the current tree right away, and the document is re-parsed lazily, using
+    the edited tree, when its tree is next accessed. Several edits in a row, such as a burst of keystrokes, therefore
+    cost a single incremental parse. A parser is only checked out of the parser pool for the duration of a parse, so
+    open documents do not hold on to parsers.
+
+    A document must only be edited and parsed by one thread at a time. Other threads may release its tree, as the
+    eviction of a `ParseSession` does, since edits, parses and releases are serialized by a lock of the document.
+
+    Example:
+        ```python
+        document = Document("python", "def f():\n    pass\n")
+        document.edit((1, 4), (1, 8), "return 1")
+        document.tree.root_node  # re-parsed incrementally
+        document.changed_ranges  # the ranges whose syntactic structure changed
+        ```
+    """
+
+    __slots__ = (
+        "_changed_ranges",
+        "_dirty",
+        "_line_starts",
+        "_lines_complete",
+        "_lock",
+        "_on_parse",
+        "_pool",
+        "_previous_tree",
+        "_source",
+        "_tree",
+        "language",
+        "position_encoding",
+        "version",
+    )
+
+    def __init__(
+        self,
+        language_name: SupportedLanguage,
+        source: bytes | str = b"",
+        *,
+        position_encoding: PositionEncoding = "utf-16",
+        pool: ParserPool | None = None,
+    ) -> None:
+        """Create a new document.
+
+        Args:
+            language_name: The name of the language of the document.
+            source: The initial source of the document. Strings are encoded as UTF-8.
+            position_encoding: The unit of the columns of the line/column positions passed to `edit`. The Language
+                Server Protocol uses ``utf-16`` by default.
+            pool: The parser pool to check parsers out of. Defaults to the process-wide parser pool.
+        """
+        self.language: SupportedLanguage = language_name
+        """The name of the language of the document."""
+        self.position_encoding: PositionEncoding = position_encoding
+        """The unit of the columns of line/column positions."""
+        self.version = 0
+        """The number of edits applied to the document."""
+        self._pool = pool if pool is not None else get_parser_pool()
+        self._source = source.encode() if isinstance(source, str) else source
+        self._tree: Tree | None = None
+        self._dirty = True
+        self._changed_ranges: list[Range] = []
+        self._previous_tree: Tree | None = None
+        self._on_parse: Callable[[Document], None] | None = None
+        self._lock = Lock()
+        # Line start offsets are computed lazily and only up to the furthest line looked up since the last edit
+        self._line_starts = [0]
+        self._lines_complete = False
+
+    @property
+    def source(self) -> bytes:
+        """The current source of the document."""
+        return self._source
+
+    @property
+    def tree(self) -> Tree:
+        """The tree of the current source, re-parsed first if the document was edited."""
+        return self.reparse()
+
+    @property
+    def changed_ranges(self) -> list[Range]:
+        """The ranges whose syntactic structure changed in the last re-parse, re-parsed first if the document was edited.
+
+        Comparing the trees costs about as much as a small incremental parse, so it is only done when this is accessed.
+        If the document had no tree to reuse, this is the range of the whole document.
+        """
+        # The current tree is an edited copy that matches no parse until the document is re-parsed
+        tree = self.reparse()
+        with self._lock:
+            if self._previous_tree is not None and self._tree is tree:
+                self._changed_ranges = self._previous_tree.changed_ranges(tree)
+                self._previous_tree = None
+            return self._changed_ranges
+
+    def edit(self, start: tuple[int, int], end: tuple[int, int], text: str | bytes) -> None:
+        """Replace the text between two line/column positions.
+
+        Positions are zero-based ``(line, column)`` pairs, with columns counted in units of `position_encoding`, as in
+        Language Server Protocol ``TextDocumentContentChangeEvent`` ranges. Positions past the end of a line or of the
+        document are clamped.
+
+        Args:
+            start: The position of the start of the replaced text.
+            end: The position of the end of the replaced text.
+            text: The new text. Strings are encoded as UTF-8.
+        """
+        self.edit_bytes(self.byte_offset(*start), self.byte_offset(*end), text)
+
+    def edit_bytes(self, start_byte: int, end_byte: int, text: str | bytes) -> None:
+        """Replace the text between two byte offsets.
+
+        Args:
+            start_byte: The byte offset of the start of the replaced text.
+            end_byte: The byte offset of the end of the replaced text.
+            text: The new text. Strings are encoded as UTF-8.
+
+        Raises:
+            ValueError: If the offsets are not within the source or in the wrong order.
+        """
+        if not 0 <= start_byte <= end_byte <= len(self._source):
+            raise ValueError(f"invalid byte range {start_byte}-{end_byte} for a source of {len(self._source)} bytes")
+
+        new_text = text.encode() if isinstance(text, str) else text
+        start_point = self.point(start_byte)
+        old_end_point = self.point(end_byte)
+        if (newlines := new_text.count(b"\n")) > 0:
+            new_end_point = Point(start_point.row + newlines, len(new_text) - new_text.rfind(b"\n") - 1)
+        else:
+            new_end_point = Point(start_point.row, start_point.column + len(new_text))
+
+        with self._lock:
+            self._source = self._source[:start_byte] + new_text + self._source[end_byte:]
+            del self._line_starts[bisect_right(self._line_starts, start_byte) :]
+            self._lines_complete = False
+            self.version += 1
+
+            if self._tree is not None:
+                if not self._dirty:
+                    # Edit a copy, so trees handed out before this edit stay consistent with their source
+                    self._tree = self._tree.copy()
+                self._tree.edit(
+                    start_byte=start_byte,
+                    old_end_byte=end_byte,
+                    new_end_byte=start_byte + len(new_text),
+                    start_point=start_point,
+                    old_end_point=old_end_point,
+                    new_end_point=new_end_point,
+                )
+            self._dirty = True
+
+    def replace(self, source: bytes | str) -> None:
+        """Replace the whole source of the document, e.g. on a full text synchronization.
+
+        Args:
+            source: The new source. Strings are encoded as UTF-8.
+        """
+        self.edit_bytes(0, len(self._source), source)
+
+    def reparse(self) -> Tree:
+        """Re-parse the document if it was edited since the last parse.
+
+        Returns:
+            Tree: The tree of the current source.
+        """
+        with self._lock:
+            old_tree = self._tree
+            if old_tree is not None and not self._dirty:
+                return old_tree
+
+            with self._pool.parser(self.language) as parser:
+                new_tree = instrumented_parse(parser, self.language, self._source, old_tree)
+
+            root_node = new_tree.root_node
+            self._changed_ranges = [
+                Range(root_node.start_point, root_node.end_point, root_node.start_byte, root_node.end_byte)
+            ]
+            self._previous_tree = old_tree
+            self._tree = new_tree
+            self._dirty = False
+
+        # Called without the lock, as it may release the trees of other documents
+        if self._on_parse is not None:
+            self._on_parse(self)
+        return new_tree
+
+    def release_tree(self) -> None:
+        """Drop the tree to free its memory. The next access to `tree` parses the source from scratch."""
+        with self._lock:
+            self._release_tree()
+
+    def _try_release_tree(self) -> bool:
+        # Documents that are being edited or parsed by another thread are skipped rather than waited for
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._release_tree()
+        finally:
+            self._lock.release()
+        return True
+
+    def _release_tree(self) -> None:
+        self._tree = None
+        self._previous_tree = None
+        self._dirty = True
+
+    @property
+    def has_tree(self) -> bool:
+        """Whether the document currently holds a tree."""
+        return self._tree is not None
+
+    def byte_offset(self, line: int, column: int) -> int:
+        """Convert a line/column position into a byte offset.
+
+        Args:
+            line: The zero-based line.
+            column: The zero-based column, in units of `position_encoding`.
+
+        Raises:
+            ValueError: If the line or column are negative.
+
+        Returns:
+            int: The byte offset, clamped to the end of the line or of the source.
+        """
+        if line < 0 or column < 0:
+            raise ValueError(f"invalid position {line}:{column}")
+        self._index_lines(lambda line_starts: len(line_starts) > line + 1)
+        if line >= len(self._line_starts):
+            return len(self._source)
+
+        line_start = self._line_starts[line]
+        line_end = self._line_starts[line + 1] - 1 if line + 1 < len(self._line_starts) else len(self._source)
+        return line_start + _column_to_byte(self._source[line_start:line_end], column, self.position_encoding)
+
+    def point(self, byte_offset: int) -> Point:
+        """Convert a byte offset into a tree-sitter point, i.e. a line and a byte column.
+
+        Args:
+            byte_offset: The byte offset.
+
+        Returns:
+            Point: The point.
+        """
+        self._index_lines(lambda line_starts: line_starts[-1] > byte_offset)
+        row = bisect_right(self._line_starts, byte_offset) - 1
+        return Point(row, byte_offset - self._line_starts[row])
+
+    def position(self, byte_offset: int) -> tuple[int, int]:
+        """Convert a byte offset into a line/column position, e.g. to report changed ranges to an editor.
+
+        Args:
+            byte_offset: The byte offset.
+
+        Returns:
+            tuple[int, int]: The zero-based line and column, in units of `position_encoding`.
+        """
+        row, byte_column = self.point(byte_offset)
+        line_start = self._line_starts[row]
+        line = self._source[line_start : line_start + byte_column]
+        return row, _byte_to_column(line, byte_column, self.position_encoding)
+
+    def _index_lines(self, is_indexed: Callable[[list[int]], bool]) -> None:
+        line_starts = self._line_starts
+        source = self._source
+        while not self._lines_complete and not is_indexed(line_starts):
+            newline = source.find(b"\n", line_starts[-1])
+            if newline == -1:
+                self._lines_complete = True
+            else:
+                line_starts.append(newline + 1)
+
+
+class ParseSession:
+    """A set of open documents, keyed by URI, with a bound on the number of trees kept in memory.
+
+    When more than ``max_trees`` documents hold a tree, the trees of the least recently parsed documents are dropped.
+    Their sources are kept, and they are parsed from scratch when their tree is accessed again. This keeps memory
+    bounded when thousands of documents are open but only a few are actively edited. Documents that are being edited
+    or parsed by another thread at that moment keep their tree until a later parse evicts them.
+
+    The session is thread-safe, but each document must only be edited and parsed by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_trees: int | None = 256,
+        position_encoding: PositionEncoding = "utf-16",
+        pool: ParserPool | None = None,
+    ) -> None:
+        """Create a new session.
+
+        Args:
+            max_trees: The maximum number of documents that keep their tree, or None for no limit.
+            position_encoding: The unit of the columns of the line/column positions of the documents.
+            pool: The parser pool to check parsers out of. Defaults to the process-wide parser pool.
+
+        Raises:
+            ValueError: If max_trees is not positive.
+        """
+        if max_trees is not None and max_trees < 1:
+            raise ValueError("max_trees must be a positive integer or None")
+
+        self.max_trees = max_trees
+        self.position_encoding: PositionEncoding = position_encoding
+        self._pool = pool
+        self._lock = Lock()
+        self._documents: dict[str, Document] = {}
+        self._parsed: OrderedDict[str, None] = OrderedDict()
+
+    def open(self, uri: str, language_name: SupportedLanguage, source: bytes | str = b"") -> Document:
+        """Open a document, replacing any open document with the same URI.
+
+        Args:
+            uri: The URI identifying the document.
+            language_name: The name of the language of the document.
+            source: The initial source of the document.
+
+        Returns:
+            Document: The opened document.
+        """
+        document = Document(language_name, source, position_encoding=self.position_encoding, pool=self._pool)
+        document._on_parse = lambda parsed_document: self._track(uri, parsed_document)  # noqa: SLF001
+        with self._lock:
+            self._documents[uri] = document
+            self._parsed.pop(uri, None)
+        return document
+
+    def get(self, uri: str) -> Document:
+        """Get an open document.
+
+        Args:
+            uri: The URI identifying the document.
+
+        Raises:
+            KeyError: If no document with this URI is open.
+
+        Returns:
+            Document: The document.
+        """
+        with self._lock:
+            return self._documents[uri]
+
+    def close(self, uri: str) -> None:
+        """Close a document, releasing its source and tree. Closing a document that is not open does nothing.
+
+        Args:
+            uri: The URI identifying the document.
+        """
+        with self._lock:
+            self._documents.pop(uri, None)
+            self._parsed.pop(uri, None)
+
+    def __contains__(self, uri: object) -> bool:
+        """Check whether a document is open.
+
+        Args:
+            uri: The URI identifying the document.
+
+        Returns:
+            bool: Whether the document is open.
+        """
+        with self._lock:
+            return uri in self._documents
+
+    def __len__(self) -> int:
+        """Get the number of open documents.
+
+        Returns:
+            int: The number of open documents.
+        """
+        with self._lock:
+            return len(self._documents)
+
+    def _track(self, uri: str, document: Document) -> None:
+        with self._lock:
+            if self._documents.get(uri) is not document:
+                return
+            self._parsed[uri] = None
+            self._parsed.move_to_end(uri)
+            if self.max_trees is None:
+                return
+            excess = len(self._parsed) - self.max_trees
+            if excess <= 0:
+                return
+            evicted_uris = []
+            for evicted_uri in self._parsed:
+                if evicted_uri != uri and self._documents[evicted_uri]._try_release_tree():  # noqa: SLF001
+                    evicted_uris.append(evicted_uri)
+                    if len(evicted_uris) == excess:
+                        break
+            for evicted_uri in evicted_uris:
+                del self._parsed[evicted_uri]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import mmap
+import os
+from typing import TYPE_CHECKING
+
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.pool import get_pooled_parser
+
+if TYPE_CHECKING:
+    from tree_sitter import Parser, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+
+def parse_file(
+    language_name: SupportedLanguage,
+    path: str | os.PathLike[str],
+    *,
+    parser: Parser | None = None,
+    old_tree: Tree | None = None,
+) -> Tree:
+    """Parse a file without reading it into a Python bytes object.
+
+    The file is memory-mapped read-only and the mapping is handed to the parser as a buffer, so the source is never
+    copied into the Python heap. The operating system pages it in as the parser advances and can drop the pages again
+    under memory pressure. Compared to ``parser.parse(path.read_bytes())`` this saves private memory of the size of the
+    file. Note that the tree itself is usually many times larger than its source.
+
+    The returned tree keeps a view of the mapping as its source, so ``Node.text`` reads from the mapped file. The
+    mapping stays open for as long as the tree is referenced and is closed when the tree is garbage collected. While it
+    is open, the file cannot be deleted on Windows, and changes to the file are visible through ``Node.text``.
+    Truncating the file while a tree of it is alive makes reading the text of nodes past the new end crash the
+    process on POSIX systems, so replace files by renaming a new file over them rather than rewriting them in place.
+
+    Args:
+        language_name: The name of the language.
+        path: The path of the file.
+        parser: The parser to use. Defaults to a parser checked out from the process-wide parser pool.
+        old_tree: The previous tree of the file, for incremental parsing after ``Tree.edit``.
+
+    Returns:
+        Tree: The parsed tree.
+    """
+    with open(path, "rb") as file:  # noqa: PTH123
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files cannot be memory-mapped
+            return _parse(language_name, b"", parser, old_tree)
+
+        # The mapping keeps its own handle of the file, so it outlives the file object
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    # The tree references the view as its source, and the view keeps the mapping open until both are collected
+    return _parse(language_name, memoryview(mapped), parser, old_tree)
+
+
+def _parse(
+    language_name: SupportedLanguage, source: bytes | memoryview, parser: Parser | None, old_tree: Tree | None
+) -> Tree:
+    if parser is None:
+        with get_pooled_parser(language_name) as pooled_parser:
+            return _parse(language_name, source, pooled_parser, old_tree)
+    return instrumented_parse(parser, language_name, source, old_tree)
@@ -0,0 +1,617 @@
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, NamedTuple, cast
+
+from tree_sitter import Point, QueryCursor, Range
+
+from tree_sitter_language_pack._core import available_languages
+from tree_sitter_language_pack._detection_index import EXTENSIONS, MODELINE_NAMES
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.document import Document, PositionEncoding
+from tree_sitter_language_pack.queries import available_queries, compile_query, get_query
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from concurrent.futures import Executor
+
+    from tree_sitter import Node, Query, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+    from tree_sitter_language_pack.pool import ParserPool
+
+INJECTIONS_QUERY_NAME = "injections"
+
+
+@dataclass(frozen=True, slots=True)
+class InjectionLayer:
+    """A tree of a layered document, parsed from the whole document or from the regions of an embedded language."""
+
+    language: SupportedLanguage
+    """The language of the layer."""
+    tree: Tree
+    """The tree of the layer. Nodes of injected layers only cover the ranges of the layer."""
+    ranges: tuple[Range, ...]
+    """The ranges of the document the layer was parsed from, or an empty tuple for the host layer."""
+    depth: int
+    """The nesting depth of the layer: 0 for the host layer, 1 for languages injected into it, and so on."""
+
+    def contains(self, byte_offset: int) -> bool:
+        """Check whether a byte offset is in one of the ranges of the layer.
+
+        Args:
+            byte_offset: The byte offset.
+
+        Returns:
+            bool: Whether the offset is covered by the layer. The host layer covers every offset.
+        """
+        if not self.ranges:
+            return True
+        index = bisect_right(self.ranges, byte_offset, key=lambda layer_range: layer_range.start_byte) - 1
+        return index >= 0 and byte_offset < self.ranges[index].end_byte
+
+
+class _Match(NamedTuple):
+    """An injection found by the injections query of a layer."""
+
+    pattern_index: int
+    language: SupportedLanguage
+    ranges: list[Range]
+    combined: bool
+    # The extent of the captured nodes, which decides whether an edit invalidates the match
+    start_byte: int
+    end_byte: int
+
+
+@dataclass(slots=True)
+class _StaleLayer:
+    """A layer of the previous parse, edited along with the document so that it can be reused by the next parse."""
+
+    language: SupportedLanguage
+    depth: int
+    start_byte: int
+    tree: Tree
+    matches: list[_Match] | None
+
+
+# A region to parse: its ranges, the layer of the previous parse it replaces, if any, and the language of the layer it
+# is injected into
+_Region = tuple[list[Range], "_StaleLayer | None", "SupportedLanguage"]
+
+
+class LayeredDocument(Document):
+    r"""A document whose embedded languages are parsed as separate layers, using the injection queries of the grammars.
+
+    The host language is parsed like in `Document`. Its tree is matched against the ``injections`` query of its grammar
+    to find regions of embedded languages, such as the scripts and styles of an HTML document, which are parsed with
+    ``included_ranges`` and, up to ``max_depth``, searched for further injections. Regions of patterns marked with
+    ``injection.combined`` are parsed together as one tree per language; other regions get a tree each. All regions of
+    a language at the same depth are parsed with a single parser.
+
+    Edits are applied to the trees of all layers. On re-parse, every injected region that still starts at the same
+    offset is re-parsed incrementally from its previous tree, and the injections query only runs again over the
+    top-level nodes of each layer that were edited or whose structure changed.
+
+    Languages that are not available in this build, or that the injection rules name but this package does not
+    support, are not parsed.
+
+    Example:
+        ```python
+        document = LayeredDocument("javascript", "const style = css`a { color: red }`;\n")
+        [layer.language for layer in document.layers]  # ["javascript", "css"]
+        document.edit((0, 29), (0, 32), "blue")
+        document.layer_at(30).tree  # the css layer, re-parsed incrementally
+        ```
+    """
+
+    __slots__ = (
+        "_dirty_spans",
+        "_executor",
+        "_injection_queries",
+        "_layer_matches",
+        "_layers",
+        "_query_sources",
+        "_stale_layers",
+        "max_depth",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        language_name: SupportedLanguage,
+        source: bytes | str = b"",
+        *,
+        position_encoding: PositionEncoding = "utf-16",
+        pool: ParserPool | None = None,
+        max_depth: int = 4,
+        injection_queries: Mapping[SupportedLanguage, str] | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Create a new layered document.
+
+        Args:
+            language_name: The name of the host language of the document.
+            source: The initial source of the document. Strings are encoded as UTF-8.
+            position_encoding: The unit of the columns of the line/column positions passed to `edit`.
+            pool: The parser pool to check parsers out of. Defaults to the process-wide parser pool.
+            max_depth: The maximum nesting depth of injected layers. 0 disables injections.
+            injection_queries: Injection query sources by language, overriding the queries bundled with the grammars,
+                e.g. for grammars that do not bundle one.
+            executor: An executor to parse the regions of different languages concurrently. By default they are
+                parsed in the calling thread. The tree-sitter Python bindings hold the GIL while parsing, so this mostly
+                helps on free-threaded Python builds.
+
+        Raises:
+            ValueError: If max_depth is negative.
+        """
+        if max_depth < 0:
+            raise ValueError("max_depth must not be negative")
+
+        super().__init__(language_name, source, position_encoding=position_encoding, pool=pool)
+        self.max_depth = max_depth
+        """The maximum nesting depth of injected layers."""
+        self._query_sources = dict(injection_queries or {})
+        self._injection_queries: dict[SupportedLanguage, Query | None] = {}
+        self._executor = executor
+        self._layers: tuple[InjectionLayer, ...] = ()
+        self._layer_matches: list[list[_Match] | None] = []
+        self._stale_layers: list[_StaleLayer] = []
+        # The byte ranges of the current source that were edited since the last parse
+        self._dirty_spans: list[tuple[int, int]] = []
+
+    @property
+    def layers(self) -> tuple[InjectionLayer, ...]:
+        """The layers of the current source, re-parsed first if the document was edited.
+
+        The host layer comes first, followed by the injected layers ordered by depth and start offset.
+        """
+        if self._dirty:
+            self.reparse()
+        return self._layers
+
+    def layer_at(self, byte_offset: int) -> InjectionLayer:
+        """Get the innermost layer covering a byte offset.
+
+        Args:
+            byte_offset: The byte offset.
+
+        Returns:
+            InjectionLayer: The deepest layer whose ranges contain the offset, or the host layer.
+        """
+        layers = self.layers
+        return next(layer for layer in reversed(layers) if layer.contains(byte_offset))
+
+    def edit_bytes(self, start_byte: int, end_byte: int, text: str | bytes) -> None:
+        """Replace the text between two byte offsets, in the trees of all layers.
+
+        Args:
+            start_byte: The byte offset of the start of the replaced text.
+            end_byte: The byte offset of the end of the replaced text.
+            text: The new text. Strings are encoded as UTF-8.
+        """
+        start_point = self.point(start_byte)
+        old_end_point = self.point(end_byte)
+        super().edit_bytes(start_byte, end_byte, text)
+        new_end_byte = start_byte + len(text.encode() if isinstance(text, str) else text)
+        new_end_point = self.point(new_end_byte)
+
+        if self._layers:
+            # Edit copies, so layers handed out before this edit stay consistent with their source
+            self._stale_layers = [
+                _StaleLayer(
+                    layer.language,
+                    layer.depth,
+                    layer.ranges[0].start_byte if layer.ranges else 0,
+                    layer.tree.copy(),
+                    matches,
+                )
+                for layer, matches in zip(self._layers, self._layer_matches, strict=True)
+            ]
+            self._layers = ()
+            self._layer_matches = []
+
+        edit = _Edit(start_byte, end_byte, new_end_byte, start_point, old_end_point, new_end_point)
+        stale_layers = []
+        for stale_layer in self._stale_layers:
+            stale_layer.tree.edit(
+                start_byte=start_byte,
+                old_end_byte=end_byte,
+                new_end_byte=new_end_byte,
+                start_point=start_point,
+                old_end_point=old_end_point,
+                new_end_point=new_end_point,
+            )
+            if stale_layer.matches is not None:
+                stale_layer.matches = edit.apply(stale_layer.matches)
+            # Injected regions that start inside the replaced text are parsed from scratch
+            if stale_layer.depth > 0 and stale_layer.start_byte > start_byte:
+                if stale_layer.start_byte < end_byte:
+                    continue
+                stale_layer.start_byte += new_end_byte - end_byte
+            stale_layers.append(stale_layer)
+        self._stale_layers = stale_layers
+        self._dirty_spans = [*map(edit.apply_to_span, self._dirty_spans), (start_byte, new_end_byte)]
+
+    def reparse(self) -> Tree:
+        """Re-parse the document and its injected layers if it was edited since the last parse.
+
+        Returns:
+            Tree: The tree of the host layer.
+        """
+        if not self._dirty:
+            return super().reparse()
+
+        tree = super().reparse()
+        stale_layers = {(layer.language, layer.depth, layer.start_byte): layer for layer in self._stale_layers}
+        dirty_spans = self._dirty_spans
+        self._stale_layers = []
+        self._dirty_spans = []
+
+        host_layer = InjectionLayer(self.language, tree, (), 0)
+        host_matches = (
+            self._find_matches(host_layer, self.language, stale_layers.get((self.language, 0, 0)), dirty_spans)
+            if self.max_depth
+            else None
+        )
+        layers = [host_layer]
+        layer_matches = [host_matches]
+        # The layers to search for injections, with the injections found in them
+        parent_layers: list[tuple[InjectionLayer, list[_Match] | None]] = [(host_layer, host_matches)]
+        for depth in range(1, self.max_depth + 1):
+            regions_by_language: dict[SupportedLanguage, list[_Region]] = {}
+            for parent_layer, matches in parent_layers:
+                for language_name, ranges in _group_matches(matches or []):
+                    stale_layer = stale_layers.pop((language_name, depth, ranges[0].start_byte), None)
+                    regions = regions_by_language.setdefault(language_name, [])
+                    regions.append((ranges, stale_layer, parent_layer.language))
+            if not regions_by_language:
+                break
+
+            if self._executor is None or len(regions_by_language) == 1:
+                parsed = [
+                    self._parse_regions(language_name, regions, depth, dirty_spans)
+                    for language_name, regions in regions_by_language.items()
+                ]
+            else:
+                futures = [
+                    self._executor.submit(self._parse_regions, language_name, regions, depth, dirty_spans)
+                    for language_name, regions in regions_by_language.items()
+                ]
+                parsed = [future.result() for future in futures]
+
+            parent_layers = sorted(
+                (layer for language_layers in parsed for layer in language_layers),
+                key=lambda layer: layer[0].ranges[0].start_byte,
+            )
+            layers.extend(layer for layer, _ in parent_layers)
+            layer_matches.extend(matches for _, matches in parent_layers)
+
+        self._layers = tuple(layers)
+        self._layer_matches = layer_matches
+        return tree
+
+    def _release_tree(self) -> None:
+        # Drops the trees of all layers
+        super()._release_tree()
+        self._layers = ()
+        self._layer_matches = []
+        self._stale_layers = []
+        self._dirty_spans = []
+
+    def _parse_regions(
+        self, language_name: SupportedLanguage, regions: list[_Region], depth: int, dirty_spans: list[tuple[int, int]]
+    ) -> list[tuple[InjectionLayer, list[_Match] | None]]:
+        layers = []
+        with self._pool.parser(language_name) as parser:
+            for ranges, previous_layer, parent_language in regions:
+                parser.included_ranges = ranges
+                # Incremental parsing can recover from syntax errors differently when ranges were added to or removed
+                # from a region, e.g. of a combined injection, so such regions are parsed from scratch
+                stale_layer = (
+                    previous_layer
+                    if previous_layer is not None and len(previous_layer.tree.included_ranges) == len(ranges)
+                    else None
+                )
+                tree = instrumented_parse(
+                    parser,
+                    language_name,
+                    self._source,
+                    None if stale_layer is None else stale_layer.tree,
+                    size=sum(layer_range.end_byte - layer_range.start_byte for layer_range in ranges),
+                )
+                layer = InjectionLayer(language_name, tree, tuple(ranges), depth)
+                # Layers at the maximum depth are not searched for injections
+                matches = (
+                    self._find_matches(layer, parent_language, stale_layer, dirty_spans)
+                    if depth < self.max_depth
+                    else None
+                )
+                layers.append((layer, matches))
+        return layers
+
+    def _get_injection_query(self, language_name: SupportedLanguage) -> Query | None:
+        if language_name not in self._injection_queries:
+            query_source = self._query_sources.get(language_name)
+            if query_source is not None:
+                self._injection_queries[language_name] = compile_query(language_name, query_source)
+            elif INJECTIONS_QUERY_NAME in available_queries(language_name):
+                self._injection_queries[language_name] = get_query(language_name, INJECTIONS_QUERY_NAME)
+            else:
+                self._injection_queries[language_name] = None
+        return self._injection_queries[language_name]
+
+    def _find_matches(
+        self,
+        layer: InjectionLayer,
+        parent_language: SupportedLanguage,
+        stale_layer: _StaleLayer | None,
+        dirty_spans: list[tuple[int, int]],
+    ) -> list[_Match]:
+        query = self._get_injection_query(layer.language)
+        if query is None:
+            return []
+        if stale_layer is None or stale_layer.matches is None:
+            return cast("list[_Match]", _query_matches(query, layer, parent_language, None))
+
+        # Only the top-level nodes that were edited or whose structure changed are searched again
+        changed_spans = [
+            (changed_range.start_byte, changed_range.end_byte)
+            for changed_range in stale_layer.tree.changed_ranges(layer.tree)
+        ]
+        intervals = _get_dirty_intervals(layer.tree.root_node, [*dirty_spans, *changed_spans])
+        matches = [match for match in stale_layer.matches if not _intersects(match, intervals)]
+        for interval in intervals:
+            interval_matches = _query_matches(query, layer, parent_language, interval)
+            if interval_matches is None:
+                # A match spans several top-level nodes, so the whole layer is searched again
+                return cast("list[_Match]", _query_matches(query, layer, parent_language, None))
+            matches.extend(interval_matches)
+        return matches
+
+
+class _Edit(NamedTuple):
+    """An edit of the source, to shift the injections found before it."""
+
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: Point
+    old_end_point: Point
+    new_end_point: Point
+
+    def apply(self, matches: list[_Match]) -> list[_Match]:
+        delta = self.new_end_byte - self.old_end_byte
+        old_end_row, old_end_column = self.old_end_point
+        new_end_row, new_end_column = self.new_end_point
+        row_delta = new_end_row - old_end_row
+
+        shifted_matches = []
+        for match in matches:
+            if match.end_byte <= self.start_byte:
+                shifted_matches.append(match)
+                continue
+            if match.start_byte < self.old_end_byte or match.start_byte == self.start_byte:
+                # The match overlaps the edit, so it is searched for again
+                continue
+
+            ranges = []
+            for content_range in match.ranges:
+                (start_row, start_column), (end_row, end_column) = content_range.start_point, content_range.end_point
+                ranges.append(
+                    Range(
+                        (start_row + row_delta, start_column)
+                        if start_row != old_end_row
+                        else (new_end_row, new_end_column + start_column - old_end_column),
+                        (end_row + row_delta, end_column)
+                        if end_row != old_end_row
+                        else (new_end_row, new_end_column + end_column - old_end_column),
+                        content_range.start_byte + delta,
+                        content_range.end_byte + delta,
+                    )
+                )
+            shifted_matches.append(
+                _Match(
+                    match.pattern_index,
+                    match.language,
+                    ranges,
+                    match.combined,
+                    match.start_byte + delta,
+                    match.end_byte + delta,
+                )
+            )
+        return shifted_matches
+
+    def apply_to_span(self, span: tuple[int, int]) -> tuple[int, int]:
+        start_byte, end_byte = span
+        delta = self.new_end_byte - self.old_end_byte
+        if end_byte < self.start_byte:
+            return span
+        if start_byte > self.old_end_byte:
+            return start_byte + delta, end_byte + delta
+        return min(start_byte, self.start_byte), max(end_byte + delta, self.new_end_byte)
+
+
+def _query_matches(
+    query: Query, layer: InjectionLayer, parent_language: SupportedLanguage, interval: tuple[int, int] | None
+) -> list[_Match] | None:
+    query_cursor = QueryCursor(query)
+    if interval is not None:
+        query_cursor.set_byte_range(*interval)
+
+    matches = []
+    for pattern_index, captures in query_cursor.matches(layer.tree.root_node):
+        start_byte = min(node.start_byte for nodes in captures.values() for node in nodes)
+        end_byte = max(node.end_byte for nodes in captures.values() for node in nodes)
+        if interval is not None and not interval[0] <= start_byte <= end_byte <= interval[1]:
+            return None
+
+        content_nodes = captures.get("injection.content")
+        if not content_nodes:
+            continue
+        settings = query.pattern_settings(pattern_index)
+        language_name = _get_injected_language(settings, captures, layer.language, parent_language)
+        if language_name is None:
+            continue
+
+        include_children = "injection.include-children" in settings
+        ranges = [
+            content_range
+            for node in content_nodes
+            for content_range in _get_content_ranges(node, include_children=include_children)
+        ]
+        if layer.ranges:
+            ranges = _intersect_ranges(ranges, layer.ranges)
+        matches.append(
+            _Match(pattern_index, language_name, ranges, "injection.combined" in settings, start_byte, end_byte)
+        )
+    return matches
+
+
+def _get_dirty_intervals(root_node: Node, spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    # Widen the spans to the top-level nodes they touch, so that matches within a top-level node are found completely
+    children = root_node.children
+    start_bytes = [child.start_byte for child in children]
+    end_bytes = [child.end_byte for child in children]
+    widened = []
+    for start_byte, end_byte in spans:
+        first = bisect_left(end_bytes, start_byte)
+        last = bisect_right(start_bytes, end_byte) - 1
+        widened.append(
+            (
+                min(start_byte, start_bytes[first]) if first <= last else start_byte,
+                max(end_byte, end_bytes[last]) if first <= last else end_byte,
+            )
+        )
+
+    intervals: list[tuple[int, int]] = []
+    for start_byte, end_byte in sorted(widened):
+        if intervals and start_byte <= intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], max(end_byte, intervals[-1][1]))
+        else:
+            intervals.append((start_byte, end_byte))
+    return intervals
+
+
+def _intersects(match: _Match, intervals: list[tuple[int, int]]) -> bool:
+    index = bisect_right(intervals, (match.end_byte, sys.maxsize)) - 1
+    return index >= 0 and intervals[index][1] >= match.start_byte
+
+
+def _group_matches(matches: list[_Match]) -> list[tuple[SupportedLanguage, list[Range]]]:
+    injections: list[tuple[SupportedLanguage, list[Range]]] = []
+    combined: dict[tuple[int, SupportedLanguage], list[Range]] = {}
+    for match in matches:
+        if match.combined:
+            combined.setdefault((match.pattern_index, match.language), []).extend(match.ranges)
+        elif ranges := _normalize_ranges(match.ranges):
+            injections.append((match.language, ranges))
+
+    for (_, language_name), ranges in combined.items():
+        if normalized_ranges := _normalize_ranges(ranges):
+            injections.append((language_name, normalized_ranges))
+    return injections
+
+
+def _get_injected_language(
+    settings: dict[str, str | None],
+    captures: dict[str, list[Node]],
+    language_name: SupportedLanguage,
+    parent_language: SupportedLanguage,
+) -> SupportedLanguage | None:
+    if "injection.self" in settings:
+        return language_name
+    if "injection.parent" in settings:
+        return parent_language
+
+    name = settings.get("injection.language")
+    if name is None and (language_nodes := captures.get("injection.language")):
+        name = (language_nodes[0].text or b"").decode("utf-8", "replace")
+    return _resolve_language_name(name) if name else None
+
+
+@cache
+def _resolve_language_name(name: str) -> SupportedLanguage | None:
+    # Injection rules name languages like code fences and modelines do, e.g. "js" or "JavaScript"
+    lowered = name.strip().lower()
+    language_name = MODELINE_NAMES.get(lowered) or EXTENSIONS.get(lowered)
+    if language_name is None or language_name not in available_languages():
+        return None
+    return language_name
+
+
+def _get_content_ranges(node: Node, *, include_children: bool) -> list[Range]:
+    if include_children or node.child_count == 0:
+        return [node.range]
+
+    # Without injection.include-children, the text of the children of the content node is not part of the injection
+    ranges = []
+    start_byte, start_point = node.start_byte, node.start_point
+    for child in node.children:
+        if child.start_byte > start_byte:
+            ranges.append(Range(start_point, child.start_point, start_byte, child.start_byte))
+        start_byte, start_point = child.end_byte, child.end_point
+    if node.end_byte > start_byte:
+        ranges.append(Range(start_point, node.end_point, start_byte, node.end_byte))
+    return ranges
+
+
+def _intersect_ranges(ranges: list[Range], parent_ranges: tuple[Range, ...]) -> list[Range]:
+    parent_end_bytes = [parent_range.end_byte for parent_range in parent_ranges]
+    intersection = []
+    for content_range in ranges:
+        for parent_range in parent_ranges[bisect_right(parent_end_bytes, content_range.start_byte) :]:
+            if parent_range.start_byte >= content_range.end_byte:
+                break
+            start: tuple[int, Point] = max(
+                (content_range.start_byte, content_range.start_point),
+                (parent_range.start_byte, parent_range.start_point),
+            )
+            end: tuple[int, Point] = min(
+                (content_range.end_byte, content_range.end_point), (parent_range.end_byte, parent_range.end_point)
+            )
+            intersection.append(Range(start[1], end[1], start[0], end[0]))
+    return intersection
+
+
+def _normalize_ranges(ranges: list[Range]) -> list[Range]:
+    # Included ranges must be sorted and must not overlap
+    normalized: list[Range] = []
+    for content_range in sorted(ranges, key=lambda content_range: content_range.start_byte):
+        if content_range.end_byte <= content_range.start_byte:
+            continue
+        if normalized and content_range.start_byte < normalized[-1].end_byte:
+            last_range = normalized[-1]
+            if content_range.end_byte > last_range.end_byte:
+                normalized[-1] = Range(
+                    last_range.start_point, content_range.end_point, last_range.start_byte, content_range.end_byte
+                )
+        else:
+            normalized.append(content_range)
+    return normalized
+
+
+def parse_layers(
+    language_name: SupportedLanguage,
+    source: bytes | str,
+    *,
+    max_depth: int = 4,
+    injection_queries: Mapping[SupportedLanguage, str] | None = None,
+    executor: Executor | None = None,
+) -> tuple[InjectionLayer, ...]:
+    """Parse a document and the regions of the languages embedded in it, see `LayeredDocument`.
+
+    Args:
+        language_name: The name of the host language of the document.
+        source: The source of the document. Strings are encoded as UTF-8.
+        max_depth: The maximum nesting depth of injected layers.
+        injection_queries: Injection query sources by language, overriding the queries bundled with the grammars.
+        executor: An executor to parse the regions of different languages concurrently.
+
+    Returns:
+        tuple[InjectionLayer, ...]: The host layer followed by the injected layers, ordered by depth and start offset.
+    """
+    return LayeredDocument(
+        language_name, source, max_depth=max_depth, injection_queries=injection_queries, executor=executor
+    ).layers
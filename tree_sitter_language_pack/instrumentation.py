@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import pairwise
+from typing import TYPE_CHECKING, Literal
+
+from tree_sitter_language_pack import _instrumentation
+from tree_sitter_language_pack._instrumentation import state as _state
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+DEFAULT_BUCKETS = _instrumentation.DEFAULT_BUCKETS
+"""The default upper bounds of the latency histogram buckets in seconds."""
+
+
+@dataclass(frozen=True, slots=True)
+class InstrumentationEvent:
+    """A grammar load or parse, as passed to the instrumentation hooks."""
+
+    kind: Literal["load", "parse"]
+    """Whether the event is a grammar load or a parse."""
+    language: SupportedLanguage
+    """The name of the language."""
+    started_at: float
+    """The wall clock time the operation started at, in seconds since the epoch."""
+    seconds: float
+    """The duration of the operation in seconds."""
+    size: int = 0
+    """The number of bytes parsed, or 0 for loads."""
+    incremental: bool = False
+    """Whether the parse reused an old tree."""
+    has_error: bool = False
+    """Whether the parsed tree contains syntax errors."""
+    error: BaseException | None = None
+    """The exception raised by the operation, or None if it succeeded."""
+
+
+@dataclass(frozen=True, slots=True)
+class Histogram:
+    """A snapshot of a latency histogram."""
+
+    buckets: tuple[tuple[float, int], ...]
+    """The upper bounds of the buckets in seconds, each with the number of observations less than or equal to it. The
+    last bucket has an infinite upper bound and counts all observations."""
+    count: int = 0
+    """The number of observations."""
+    seconds: float = 0.0
+    """The sum of the observations in seconds."""
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageMetrics:
+    """A snapshot of the counters and latency histograms of a language."""
+
+    loads: int
+    """The number of times the grammar was loaded."""
+    load_failures: int
+    """The number of failed attempts to load the grammar."""
+    load_seconds: Histogram
+    """The latency of loading the grammar, including failed attempts."""
+    cache_hits: int
+    """The number of `get_language` calls served from the language cache."""
+    parsers: int
+    """The number of parsers created with `get_parser`, including those created by the parser pool and batch
+    helpers."""
+    parses: int
+    """The number of parses by the parse helpers of the package, including failed ones."""
+    incremental_parses: int
+    """The number of parses that reused an old tree."""
+    parse_failures: int
+    """The number of parses that raised an exception."""
+    error_trees: int
+    """The number of parsed trees that contain syntax errors."""
+    bytes_parsed: int
+    """The number of bytes parsed."""
+    parse_seconds: Histogram
+    """The latency of the parses."""
+
+
+def enable_instrumentation(*, buckets: Sequence[float] | None = None) -> None:
+    """Start recording grammar loads and parses of the package.
+
+    Instrumentation is disabled by default. While it is disabled, the instrumented functions skip the timing and
+    counting entirely.
+
+    Args:
+        buckets: The upper bounds of the latency histogram buckets in seconds. Defaults to `DEFAULT_BUCKETS`.
+            Changing the buckets resets the recorded metrics.
+
+    Raises:
+        ValueError: If the buckets are empty or not strictly increasing.
+    """
+    bounds = DEFAULT_BUCKETS if buckets is None else tuple(float(bound) for bound in buckets)
+    if not bounds or any(lower >= upper for lower, upper in pairwise(bounds)):
+        raise ValueError("buckets must be a non-empty, strictly increasing sequence")
+
+    with _state.lock:
+        if bounds != _state.buckets:
+            _state.buckets = bounds
+            _state.metrics = {}
+        _state.enabled = True
+
+
+def disable_instrumentation() -> None:
+    """Stop recording grammar loads and parses. The metrics recorded so far are kept."""
+    _state.enabled = False
+
+
+def instrumentation_enabled() -> bool:
+    """Check whether grammar loads and parses are being recorded.
+
+    Returns:
+        bool: Whether instrumentation is enabled.
+    """
+    return _state.enabled
+
+
+def reset_metrics() -> None:
+    """Discard the recorded metrics of all languages."""
+    with _state.lock:
+        _state.metrics = {}
+
+
+def get_metrics() -> dict[SupportedLanguage, LanguageMetrics]:
+    """Get a snapshot of the recorded metrics.
+
+    Only loads, parsers and parses of the current process are recorded. Parses in the worker processes of
+    `parse_files` are not included.
+
+    Returns:
+        dict[SupportedLanguage, LanguageMetrics]: The metrics of each language that was used while instrumentation
+            was enabled, sorted by language name.
+    """
+    with _state.lock:
+        return {
+            language_name: _snapshot_metrics(_state.metrics[language_name], _state.buckets)
+            for language_name in sorted(_state.metrics)
+        }
+
+
+def _snapshot_metrics(metrics: _instrumentation.LanguageMetrics, bounds: tuple[float, ...]) -> LanguageMetrics:
+    return LanguageMetrics(
+        loads=metrics.loads,
+        load_failures=metrics.load_failures,
+        load_seconds=_snapshot_histogram(metrics.load_seconds, bounds),
+        cache_hits=metrics.cache_hits,
+        parsers=metrics.parsers,
+        parses=metrics.parses,
+        incremental_parses=metrics.incremental_parses,
+        parse_failures=metrics.parse_failures,
+        error_trees=metrics.error_trees,
+        bytes_parsed=metrics.bytes_parsed,
+        parse_seconds=_snapshot_histogram(metrics.parse_seconds, bounds),
+    )
+
+
+def _snapshot_histogram(histogram: _instrumentation.Histogram, bounds: tuple[float, ...]) -> Histogram:
+    buckets = []
+    count = 0
+    for bound, bucket_count in zip((*bounds, float("inf")), histogram.counts, strict=True):
+        count += bucket_count
+        buckets.append((bound, count))
+    return Histogram(buckets=tuple(buckets), count=count, seconds=histogram.seconds)
+
+
+def add_instrumentation_hook(hook: Callable[[InstrumentationEvent], None]) -> None:
+    """Register a function that is called with every grammar load and parse, e.g. to forward them to a tracer.
+
+    Hooks are only called while instrumentation is enabled. They are called on the thread that performed the
+    operation, after it finished, and exceptions raised by a hook propagate to the caller of the operation.
+
+    Args:
+        hook: The function to call with each event.
+    """
+    with _state.lock:
+        _state.hooks = (*_state.hooks, hook)
+
+
+def remove_instrumentation_hook(hook: Callable[[InstrumentationEvent], None]) -> None:
+    """Unregister a function registered with `add_instrumentation_hook`.
+
+    Args:
+        hook: The function to unregister.
+
+    Raises:
+        ValueError: If the function is not registered.
+    """
+    with _state.lock:
+        if hook not in _state.hooks:
+            raise ValueError("hook is not registered")
+        hooks = list(_state.hooks)
+        hooks.remove(hook)
+        _state.hooks = tuple(hooks)
+
+
+_COUNTERS = (
+    ("language_loads", "loads", "The number of times a grammar was loaded."),
+    ("language_load_failures", "load_failures", "The number of failed attempts to load a grammar."),
+    ("language_cache_hits", "cache_hits", "The number of languages served from the language cache."),
+    ("parsers_created", "parsers", "The number of parsers created."),
+    ("parses", "parses", "The number of parses, including failed ones."),
+    ("incremental_parses", "incremental_parses", "The number of parses that reused an old tree."),
+    ("parse_failures", "parse_failures", "The number of parses that raised an exception."),
+    ("parse_error_trees", "error_trees", "The number of parsed trees that contain syntax errors."),
+    ("parsed_bytes", "bytes_parsed", "The number of bytes parsed."),
+)
+_HISTOGRAMS = (
+    ("language_load_seconds", "load_seconds", "The latency of loading a grammar."),
+    ("parse_seconds", "parse_seconds", "The latency of parsing a source."),
+)
+
+
+def render_metrics(*, prefix: str = "tslp", openmetrics: bool = False) -> str:
+    """Render the recorded metrics in the Prometheus text exposition format.
+
+    Counters are named ``<prefix>_<name>_total`` and histograms ``<prefix>_<name>_seconds``, each labelled with the
+    language.
+
+    Args:
+        prefix: The prefix of the metric names.
+        openmetrics: Whether to render the OpenMetrics text format instead, which is served with the content type
+            ``application/openmetrics-text; version=1.0.0``.
+
+    Returns:
+        str: The metrics, ready to be served to a scraper.
+    """
+    metrics = get_metrics()
+    lines = []
+    for name, attribute, description in _COUNTERS:
+        family = f"{prefix}_{name}" if openmetrics else f"{prefix}_{name}_total"
+        lines.append(f"# HELP {family} {description}")
+        lines.append(f"# TYPE {family} counter")
+        lines.extend(
+            f'{prefix}_{name}_total{{language="{_escape(language_name)}"}} {getattr(language_metrics, attribute)}'
+            for language_name, language_metrics in metrics.items()
+        )
+
+    for name, attribute, description in _HISTOGRAMS:
+        family = f"{prefix}_{name}"
+        lines.append(f"# HELP {family} {description}")
+        lines.append(f"# TYPE {family} histogram")
+        if openmetrics:
+            lines.append(f"# UNIT {family} seconds")
+        for language_name, language_metrics in metrics.items():
+            histogram: Histogram = getattr(language_metrics, attribute)
+            label = f'language="{_escape(language_name)}"'
+            lines.extend(
+                f'{family}_bucket{{{label},le="{_format_bound(bound)}"}} {count}' for bound, count in histogram.buckets
+            )
+            lines.append(f"{family}_count{{{label}}} {histogram.count}")
+            lines.append(f"{family}_sum{{{label}}} {histogram.seconds!r}")
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _escape(label_value: str) -> str:
+    return label_value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
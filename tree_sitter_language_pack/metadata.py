@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from json import loads
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from tree_sitter_language_pack._core import _EXTERNAL_BINDINGS
+
+if TYPE_CHECKING:
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+language_index_path = Path(__file__).parent / "language_index.json"
+"""The metadata index of the grammars compiled into the package, written by the build."""
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageInfo:
+    """The metadata of a language, read from the index written at build time."""
+
+    name: SupportedLanguage
+    """The name of the language."""
+    repo: str | None = None
+    """The repository the grammar was vendored from."""
+    rev: str | None = None
+    """The revision of the grammar repository the package was built from."""
+    abi_version: int | None = None
+    """The tree-sitter ABI version of the generated parser."""
+    kind_names: tuple[str, ...] = ()
+    """The names of the node kinds indexed by kind id, like `get_kind_names`."""
+    field_names: tuple[str, ...] = ()
+    """The names of the fields indexed by field id. Field id 0 is unused and has an empty name."""
+    has_external_scanner: bool | None = None
+    """Whether the grammar has a hand-written external scanner in addition to its generated lexer."""
+    source_bytes: int | None = None
+    """The size of the C sources compiled into the extension of the grammar."""
+    package: str | None = None
+    """The third-party package providing the grammar, for grammars that are not compiled into this package. The
+    metadata of these grammars is not indexed, so only their name is set."""
+
+
+@cache
+def _read_index(path: Path) -> dict[str, LanguageInfo]:
+    languages = {
+        language_name: LanguageInfo(name=cast("SupportedLanguage", language_name), package=package)
+        for language_name, package in _EXTERNAL_BINDINGS.items()
+    }
+    if not path.is_file():
+        return languages
+
+    index: dict[str, dict[str, object]] = loads(path.read_bytes())
+    for language_name, entry in index.items():
+        languages[language_name] = LanguageInfo(
+            name=cast("SupportedLanguage", language_name),
+            repo=cast("str | None", entry["repo"]),
+            rev=cast("str | None", entry["rev"]),
+            abi_version=cast("int", entry["abi_version"]),
+            kind_names=tuple(cast("list[str]", entry["kind_names"])),
+            field_names=tuple(cast("list[str]", entry["field_names"])),
+            has_external_scanner=cast("bool", entry["has_external_scanner"]),
+            source_bytes=cast("int", entry["source_bytes"]),
+        )
+    return dict(sorted(languages.items()))
+
+
+def language_info(language_name: SupportedLanguage) -> LanguageInfo:
+    """Get the metadata of a language without loading its grammar.
+
+    Args:
+        language_name: The name of the language.
+
+    Raises:
+        LookupError: If the language is not part of this build of the package.
+
+    Returns:
+        LanguageInfo: The metadata of the language.
+    """
+    languages = _read_index(language_index_path)
+    info = languages.get(language_name)
+    if info is None:
+        raise LookupError(
+            f"No metadata found for {language_name}. Languages available in this build: {', '.join(languages)}"
+        )
+    return info
+
+
+def list_languages() -> list[LanguageInfo]:
+    """Get the metadata of all languages of this build of the package without loading their grammars.
+
+    Returns:
+        list[LanguageInfo]: The metadata of the languages, sorted by name.
+    """
+    return list(_read_index(language_index_path).values())
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from tree_sitter_language_pack._core import SupportedLanguage, get_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from tree_sitter import Parser
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """A snapshot of the counters of a parser pool."""
+
+    hits: int = 0
+    """The number of checkouts served by an idle pooled parser."""
+    misses: int = 0
+    """The number of checkouts that had to create a new parser."""
+    outstanding: int = 0
+    """The number of parsers currently checked out."""
+    idle: int = 0
+    """The number of parsers currently waiting in the pool."""
+    evicted: int = 0
+    """The number of parsers discarded because they were idle too long or the pool was full."""
+
+
+class _LanguagePool:
+    __slots__ = ("evicted", "hits", "idle", "misses", "outstanding")
+
+    def __init__(self) -> None:
+        self.idle: deque[tuple[Parser, float]] = deque()
+        self.hits = 0
+        self.misses = 0
+        self.outstanding = 0
+        self.evicted = 0
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            hits=self.hits,
+            misses=self.misses,
+            outstanding=self.outstanding,
+            idle=len(self.idle),
+            evicted=self.evicted,
+        )
+
+
+class ParserPool:
+    """A thread-safe pool of reusable tree-sitter parsers, kept per language.
+
+    Parsers are not safe to share between threads, but they can be reused sequentially. A pool hands out a parser
+    exclusively to one caller at a time and takes it back afterwards, so steady-state parsing does not allocate
+    new parsers.
+
+    Example:
+        ```python
+        pool = ParserPool(max_size=4)
+
+        with pool.parser("python") as parser:
+            tree = parser.parse(b"print('hello')")
+        ```
+    """
+
+    def __init__(self, *, max_size: int = 8, idle_timeout: float | None = 300.0) -> None:
+        """Create a new parser pool.
+
+        Args:
+            max_size: The maximum number of idle parsers retained per language. Parsers returned to a full pool are
+                discarded. The number of parsers checked out at the same time is not limited.
+            idle_timeout: The number of seconds an idle parser may stay in the pool before it is evicted, or None to
+                keep idle parsers indefinitely.
+
+        Raises:
+            ValueError: If max_size or idle_timeout are not positive.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be a positive number or None")
+
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._lock = Lock()
+        self._pools: dict[SupportedLanguage, _LanguagePool] = {}
+        self._checked_out: dict[int, SupportedLanguage] = {}
+
+    def acquire(self, language_name: SupportedLanguage) -> Parser:
+        """Check out a parser for the given language.
+
+        The parser must be handed back with `release` once the caller is done with it.
+
+        Args:
+            language_name: The name of the language.
+
+        Returns:
+            Parser: A parser for the language that is exclusively owned by the caller until released.
+        """
+        with self._lock:
+            pool = self._pools.get(language_name)
+            if pool is None:
+                pool = self._pools[language_name] = _LanguagePool()
+
+            self._evict_expired(pool, monotonic())
+            if pool.idle:
+                parser, _ = pool.idle.pop()
+                pool.hits += 1
+            else:
+                parser = None
+                pool.misses += 1
+            pool.outstanding += 1
+
+        if parser is None:
+            try:
+                parser = get_parser(language_name)
+            except BaseException:
+                with self._lock:
+                    pool.misses -= 1
+                    pool.outstanding -= 1
+                raise
+
+        with self._lock:
+            self._checked_out[id(parser)] = language_name
+        return parser
+
+    def release(self, parser: Parser) -> None:
+        """Return a parser that was checked out with `acquire` to the pool.
+
+        Args:
+            parser: The parser to return.
+
+        Raises:
+            ValueError: If the parser was not checked out from this pool.
+        """
+        with self._lock:
+            language_name = self._checked_out.pop(id(parser), None)
+            if language_name is None:
+                raise ValueError("parser was not checked out from this pool")
+
+            pool = self._pools[language_name]
+            pool.outstanding -= 1
+
+            now = monotonic()
+            self._evict_expired(pool, now)
+            if len(pool.idle) >= self.max_size:
+                pool.evicted += 1
+                return
+
+            parser.reset()
+            del parser.included_ranges
+            pool.idle.append((parser, now))
+
+    @contextmanager
+    def parser(self, language_name: SupportedLanguage) -> Iterator[Parser]:
+        """Check out a parser for the given language for the duration of a with block.
+
+        Args:
+            language_name: The name of the language.
+
+        Yields:
+            Parser: A parser for the language that is exclusively owned by the caller inside the block.
+        """
+        parser = self.acquire(language_name)
+        try:
+            yield parser
+        finally:
+            self.release(parser)
+
+    def stats(self, language_name: SupportedLanguage | None = None) -> PoolStats:
+        """Get the counters of the pool.
+
+        Args:
+            language_name: The name of a language to get the counters for. If not given, the counters of all
+                languages are summed up.
+
+        Returns:
+            PoolStats: A snapshot of the pool counters.
+        """
+        with self._lock:
+            if language_name is not None:
+                pool = self._pools.get(language_name)
+                return pool.stats() if pool is not None else PoolStats()
+            pools = list(self._pools.values())
+            return PoolStats(
+                hits=sum(pool.hits for pool in pools),
+                misses=sum(pool.misses for pool in pools),
+                outstanding=sum(pool.outstanding for pool in pools),
+                idle=sum(len(pool.idle) for pool in pools),
+                evicted=sum(pool.evicted for pool in pools),
+            )
+
+    def evict_idle(self) -> int:
+        """Discard all idle parsers that exceeded the idle timeout.
+
+        Expired parsers are also evicted lazily whenever a language's pool is used, so calling this is only needed
+        to release memory held by languages that are no longer in use.
+
+        Returns:
+            int: The number of evicted parsers.
+        """
+        now = monotonic()
+        with self._lock:
+            return sum(self._evict_expired(pool, now) for pool in self._pools.values())
+
+    def clear(self) -> None:
+        """Discard all idle parsers. Parsers that are checked out can still be released afterwards."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.evicted += len(pool.idle)
+                pool.idle.clear()
+
+    def _evict_expired(self, pool: _LanguagePool, now: float) -> int:
+        if self.idle_timeout is None:
+            return 0
+
+        evicted = 0
+        deadline = now - self.idle_timeout
+        while pool.idle and pool.idle[0][1] < deadline:
+            pool.idle.popleft()
+            evicted += 1
+        pool.evicted += evicted
+        return evicted
+
+
+_default_pool = ParserPool()
+
+
+def get_parser_pool() -> ParserPool:
+    """Get the process-wide parser pool used by `get_pooled_parser`.
+
+    Returns:
+        ParserPool: The default parser pool.
+    """
+    return _default_pool
+
+
+@contextmanager
+def get_pooled_parser(language_name: SupportedLanguage) -> Iterator[Parser]:
+    """Check out a parser for the given language from the process-wide parser pool.
+
+    Args:
+        language_name: The name of the language.
+
+    Yields:
+        Parser: A parser for the language that is exclusively owned by the caller inside the block.
+    """
+    with _default_pool.parser(language_name) as parser:
+        yield parser
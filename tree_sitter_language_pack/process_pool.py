@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+from concurrent import futures
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
+
+from tree_sitter import Parser
+
+from tree_sitter_language_pack._core import SupportedLanguage, get_language
+from tree_sitter_language_pack.batch import _iter_windowed
+from tree_sitter_language_pack.columnar import FlatTree, flatten_tree
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+    from multiprocessing.context import BaseContext
+
+    from tree_sitter import Tree
+
+_T = TypeVar("_T")
+
+_worker_parsers: dict[SupportedLanguage, Parser] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class FileResult(Generic[_T]):
+    """The outcome of parsing and extracting a single file in a worker process."""
+
+    index: int
+    """The position of the file in the input iterable."""
+    language: SupportedLanguage
+    """The language the file was parsed with."""
+    path: str
+    """The path of the file."""
+    value: _T | None = None
+    """The value returned by the extraction callback, or None if processing failed."""
+    error: Exception | None = None
+    """The exception raised while reading, parsing or extracting, or None if processing succeeded."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was processed successfully."""
+        return self.error is None
+
+
+def _get_worker_parser(language_name: SupportedLanguage) -> Parser:
+    parser = _worker_parsers.get(language_name)
+    if parser is None:
+        parser = _worker_parsers[language_name] = Parser(get_language(language_name))
+    return parser
+
+
+def _initialize_worker(language_names: tuple[SupportedLanguage, ...]) -> None:
+    for language_name in language_names:
+        _get_worker_parser(language_name)
+
+
+def _extract_flat_tree(tree: Tree, _: bytes) -> FlatTree:
+    return flatten_tree(tree)
+
+
+def _process_chunk(
+    extract: Callable[[Tree, bytes], Any], language_name: SupportedLanguage, chunk: list[tuple[int, str]]
+) -> list[FileResult[Any]]:
+    results: list[FileResult[Any]] = []
+    for index, path in chunk:
+        try:
+            source = Path(path).read_bytes()
+            value = extract(_get_worker_parser(language_name).parse(source), source)
+        except Exception as e:  # noqa: BLE001, PERF203
+            results.append(FileResult(index=index, language=language_name, path=path, error=e))
+        else:
+            results.append(FileResult(index=index, language=language_name, path=path, value=value))
+    return results
+
+
+@overload
+def parse_files(
+    files: Iterable[tuple[SupportedLanguage, str | os.PathLike[str]]],
+    extract: None = None,
+    *,
+    languages: Iterable[SupportedLanguage] = ...,
+    workers: int | None = ...,
+    ordered: bool = ...,
+    max_in_flight: int | None = ...,
+    chunk_size: int = ...,
+    mp_context: BaseContext | None = ...,
+) -> Iterator[FileResult[FlatTree]]: ...
+
+
+@overload
+def parse_files(
+    files: Iterable[tuple[SupportedLanguage, str | os.PathLike[str]]],
+    extract: Callable[[Tree, bytes], _T],
+    *,
+    languages: Iterable[SupportedLanguage] = ...,
+    workers: int | None = ...,
+    ordered: bool = ...,
+    max_in_flight: int | None = ...,
+    chunk_size: int = ...,
+    mp_context: BaseContext | None = ...,
+) -> Iterator[FileResult[_T]]: ...
+
+
+def parse_files(  # noqa: PLR0913
+    files: Iterable[tuple[SupportedLanguage, str | os.PathLike[str]]],
+    extract: Callable[[Tree, bytes], Any] | None = None,
+    *,
+    languages: Iterable[SupportedLanguage] = (),
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    chunk_size: int = 16,
+    mp_context: BaseContext | None = None,
+) -> Iterator[FileResult[Any]]:
+    """Parse files in a pool of worker processes and return compact, picklable extraction results.
+
+    Tree-sitter trees cannot be sent between processes, so each worker reads and parses the files itself and applies
+    ``extract`` to the tree. Only the file paths and the extracted values cross the process boundary. By default the
+    tree is flattened into a `FlatTree`.
+
+    Args:
+        files: The ``(language, path)`` pairs to process.
+        extract: A callable that receives the parsed tree and the source bytes and returns a picklable value. It must
+            be picklable itself, i.e. defined at the top level of a module. Defaults to flattening the tree.
+        languages: The languages each worker loads once when it starts. Other languages are loaded on first use.
+        workers: The number of worker processes. Defaults to the number of CPUs.
+        ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+        max_in_flight: The maximum number of files submitted but not yet yielded. Defaults to
+            ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of same-language files handed to a worker at once.
+        mp_context: The multiprocessing context used to start the workers. Defaults to the platform default.
+
+    Raises:
+        ValueError: If workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        FileResult: The result of each file.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = workers * chunk_size * 2
+    if workers < 1 or max_in_flight < 1 or chunk_size < 1:
+        raise ValueError("workers, max_in_flight and chunk_size must be positive integers")
+
+    # concurrent.futures loads its process pool (and multiprocessing) lazily on attribute access, which keeps it out
+    # of the import time of this package.
+    executor = futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_initialize_worker,
+        initargs=(tuple(languages),),
+    )
+
+    def submit_chunk(language_name: SupportedLanguage, chunk: list[tuple[int, str]]) -> Future[list[FileResult[Any]]]:
+        return executor.submit(_process_chunk, extract or _extract_flat_tree, language_name, chunk)
+
+    try:
+        yield from _iter_windowed(
+            ((language_name, os.fspath(path)) for language_name, path in files),
+            submit_chunk,
+            ordered=ordered,
+            max_in_flight=max_in_flight,
+            chunk_size=chunk_size,
+        )
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import cache
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from tree_sitter import Query
+
+from tree_sitter_language_pack._core import get_language
+
+if TYPE_CHECKING:
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+queries_directory = Path(__file__).parent / "query_files"
+"""The directory holding the query files bundled with the grammars, as ``<language>/<name>.scm``."""
+
+
+class _QueryCache:
+    """A thread-safe LRU cache of compiled queries keyed by language name and query source.
+
+    Queries are compiled outside the lock, so compiling a large query does not block lookups of other queries. Two
+    threads missing on the same query at the same time both compile it, and the first one to finish is cached.
+    """
+
+    def __init__(self, maxsize: int | None = 128) -> None:
+        self._lock = Lock()
+        self._queries: OrderedDict[tuple[SupportedLanguage, str], Query] = OrderedDict()
+        self._maxsize = maxsize
+
+    @property
+    def maxsize(self) -> int | None:
+        """The maximum number of cached queries, or None if the cache is unbounded."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int | None) -> None:
+        if value is not None and value < 1:
+            raise ValueError("maxsize must be a positive integer or None")
+
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, language_name: SupportedLanguage, source: str) -> Query:
+        """Get the compiled query for the given source, compiling and caching it on a miss.
+
+        Args:
+            language_name: The name of the language.
+            source: The source of the query.
+
+        Returns:
+            Query: The cached query.
+        """
+        key = (language_name, source)
+        with self._lock:
+            query = self._queries.get(key)
+            if query is not None:
+                self._queries.move_to_end(key)
+                return query
+
+        compiled_query = Query(get_language(language_name), source)
+        with self._lock:
+            query = self._queries.setdefault(key, compiled_query)
+            self._queries.move_to_end(key)
+            self._evict()
+            return query
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._queries)
+
+    def clear(self) -> None:
+        """Remove all cached queries."""
+        with self._lock:
+            self._queries.clear()
+
+    def _evict(self) -> None:
+        if self._maxsize is not None:
+            while len(self._queries) > self._maxsize:
+                self._queries.popitem(last=False)
+
+
+_query_cache = _QueryCache()
+
+
+def compile_query(language_name: SupportedLanguage, source: str) -> Query:
+    """Compile a query, or get it from the query cache if the same source was compiled for the language before.
+
+    Compiling the queries of large grammars takes tens of milliseconds, so repeated calls with the same source should
+    go through this function rather than constructing ``Query`` objects. The returned query is shared between all
+    callers and must not be modified, e.g. with ``Query.disable_pattern``.
+
+    Args:
+        language_name: The name of the language.
+        source: The source of the query.
+
+    Returns:
+        Query: The compiled query.
+    """
+    return _query_cache.get(language_name, source)
+
+
+def available_queries(language_name: SupportedLanguage) -> list[str]:
+    """Get the names of the queries bundled with the grammar of a language, such as ``highlights`` or ``tags``.
+
+    Args:
+        language_name: The name of the language.
+
+    Returns:
+        list[str]: The sorted query names, empty if the grammar does not bundle any queries.
+    """
+    language_directory = queries_directory / language_name
+    if not language_directory.is_dir():
+        return []
+    return sorted(path.stem for path in language_directory.glob("*.scm"))
+
+
+def get_query_source(language_name: SupportedLanguage, query_name: str) -> str:
+    """Get the source of a query bundled with the grammar of a language.
+
+    Args:
+        language_name: The name of the language.
+        query_name: The name of the query, such as ``highlights`` or ``tags``.
+
+    Raises:
+        LookupError: If the grammar does not bundle a query with this name.
+
+    Returns:
+        str: The source of the query.
+    """
+    try:
+        return _read_query_file(queries_directory / language_name / f"{query_name}.scm")
+    except FileNotFoundError as e:
+        raise LookupError(
+            f"No {query_name!r} query is bundled for {language_name}. "
+            f"Available queries: {', '.join(available_queries(language_name)) or 'none'}"
+        ) from e
+
+
+@cache
+def _read_query_file(path: Path) -> str:
+    # Returning the same string object on every call also lets the query cache reuse its cached hash
+    return path.read_text(encoding="utf-8")
+
+
+def get_query(language_name: SupportedLanguage, query_name: str) -> Query:
+    """Get a compiled query bundled with the grammar of a language.
+
+    The query is compiled on first use and cached, see `compile_query`.
+
+    Args:
+        language_name: The name of the language.
+        query_name: The name of the query, such as ``highlights`` or ``tags``.
+
+    Returns:
+        Query: The compiled query.
+    """
+    return compile_query(language_name, get_query_source(language_name, query_name))
+
+
+def clear_query_cache() -> None:
+    """Remove all compiled queries from the query cache."""
+    _query_cache.clear()
+
+
+def set_query_cache_size(maxsize: int | None) -> None:
+    """Set the maximum number of compiled queries held in the query cache, 128 by default.
+
+    Args:
+        maxsize: The maximum number of cached queries, or None for an unbounded cache.
+    """
+    _query_cache.maxsize = maxsize
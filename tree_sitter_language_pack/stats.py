@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.batch import _map_chunks, _WorkerParsers
+from tree_sitter_language_pack.columnar import ERROR_KIND_ID
+from tree_sitter_language_pack.pool import get_pooled_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from tree_sitter import Node, Parser, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+
+@dataclass(frozen=True, slots=True)
+class TreeStats:
+    """Aggregate metrics of a parsed tree."""
+
+    kind_counts: Counter[int]
+    """The number of nodes of each kind id, see `get_kind_names`. ``ERROR`` nodes are counted under `ERROR_KIND_ID`."""
+    node_count: int
+    """The number of nodes in the tree, including the root node."""
+    max_depth: int
+    """The depth of the deepest node, where the root node has depth 0."""
+    error_count: int
+    """The number of ``ERROR`` nodes, including ``ERROR`` nodes nested in other ``ERROR`` nodes."""
+    missing_count: int
+    """The number of nodes inserted by the parser to recover from a syntax error."""
+    error_bytes: int
+    """The number of bytes covered by ``ERROR`` nodes, counting nested ``ERROR`` nodes once."""
+    byte_count: int
+    """The number of bytes up to the end of the root node."""
+    parse_seconds: float | None = None
+    """The wall time spent parsing the source, or None if the tree was parsed elsewhere."""
+
+    @property
+    def error_coverage(self) -> float:
+        """The fraction of the bytes of the tree that are covered by ``ERROR`` nodes."""
+        return self.error_bytes / self.byte_count if self.byte_count else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class StatsResult:
+    """The outcome of computing the metrics of a single source in a batch."""
+
+    index: int
+    """The position of the source in the input iterable."""
+    language: SupportedLanguage
+    """The language the source was parsed with."""
+    stats: TreeStats | None = None
+    """The metrics of the source, or None if parsing failed."""
+    error: Exception | None = None
+    """The exception raised while parsing, or None if parsing succeeded."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the metrics were computed successfully."""
+        return self.error is None
+
+
+def tree_stats(tree: Tree, *, parse_seconds: float | None = None) -> TreeStats:
+    """Compute the node kind histogram, depth and error metrics of a parsed tree.
+
+    The metrics are collected in a single cursor traversal that reads little more than the kind id of each node, and
+    the histogram is counted in C. Missing nodes are only searched for in the subtrees that contain an error, which
+    tree-sitter tracks per node, so they cost nothing for trees without syntax errors.
+
+    Args:
+        tree: The tree.
+        parse_seconds: The time spent parsing the tree, to record in the result.
+
+    Returns:
+        TreeStats: The metrics of the tree.
+    """
+    root_node = tree.root_node
+    kind_ids: list[int] = []
+    append_kind_id = kind_ids.append
+    depth = max_depth = 0
+    # Nodes that start before the end of the last outermost ERROR node are nested in it
+    error_end = -1
+    error_bytes = 0
+    cursor = tree.walk()
+    while True:
+        node = cursor.node
+        if node is not None:
+            kind_id = node.kind_id
+            append_kind_id(kind_id)
+            if kind_id == ERROR_KIND_ID and node.start_byte >= error_end:
+                error_end = node.end_byte
+                error_bytes += error_end - node.start_byte
+
+        if cursor.goto_first_child():
+            depth += 1
+            # Calling max() for every node is measurably slower than comparing inline
+            if depth > max_depth:  # noqa: PLR1730
+                max_depth = depth
+            continue
+
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                kind_counts = Counter(kind_ids)
+                return TreeStats(
+                    kind_counts=kind_counts,
+                    node_count=len(kind_ids),
+                    max_depth=max_depth,
+                    error_count=kind_counts[ERROR_KIND_ID],
+                    missing_count=_count_missing(root_node),
+                    error_bytes=error_bytes,
+                    byte_count=root_node.end_byte,
+                    parse_seconds=parse_seconds,
+                )
+            depth -= 1
+
+
+def _count_missing(root_node: Node) -> int:
+    # The error cost of a missing node is added to all of its ancestors, so only subtrees with an error are searched.
+    # This does not hold for ERROR nodes, whose leaves can have no cost, so they are counted by the traversal instead.
+    missing_count = 0
+    stack = [root_node] if root_node.has_error else []
+    while stack:
+        node = stack.pop()
+        missing_count += node.is_missing
+        stack.extend(child for child in node.children if child.has_error)
+    return missing_count
+
+
+def parse_stats(language_name: SupportedLanguage, source: bytes, *, parser: Parser | None = None) -> TreeStats:
+    """Parse a source and compute the metrics of its tree, see `tree_stats`.
+
+    Args:
+        language_name: The name of the language.
+        source: The source to parse.
+        parser: The parser to parse the source with. Defaults to a parser checked out from the process-wide parser
+            pool.
+
+    Returns:
+        TreeStats: The metrics of the tree, including the parse time.
+    """
+    if parser is None:
+        with get_pooled_parser(language_name) as pooled_parser:
+            return _parse_and_measure(pooled_parser, language_name, source)
+    return _parse_and_measure(parser, language_name, source)
+
+
+def _parse_and_measure(parser: Parser, language_name: SupportedLanguage, source: bytes) -> TreeStats:
+    start = perf_counter()
+    tree = instrumented_parse(parser, language_name, source)
+    return tree_stats(tree, parse_seconds=perf_counter() - start)
+
+
+def _measure_chunk(
+    worker_parsers: _WorkerParsers, language_name: SupportedLanguage, chunk: list[tuple[int, bytes]]
+) -> list[StatsResult]:
+    try:
+        parser = worker_parsers.get(language_name)
+    except Exception as e:  # noqa: BLE001
+        return [StatsResult(index=index, language=language_name, error=e) for index, _ in chunk]
+
+    results: list[StatsResult] = []
+    for index, source in chunk:
+        try:
+            stats = _parse_and_measure(parser, language_name, source)
+        except Exception as e:  # noqa: BLE001, PERF203
+            results.append(StatsResult(index=index, language=language_name, error=e))
+        else:
+            results.append(StatsResult(index=index, language=language_name, stats=stats))
+    return results
+
+
+def parse_stats_many(
+    items: Iterable[tuple[SupportedLanguage, bytes]],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    chunk_size: int = 16,
+) -> Iterator[StatsResult]:
+    """Compute the metrics of many sources concurrently on a thread pool.
+
+    Sources are batched like in `parse_many`, and trees are dropped as soon as their metrics are computed, so
+    memory use stays bounded by the window rather than by the size of the corpus. Failures are reported as results
+    with an ``error`` instead of being raised.
+
+    Args:
+        items: The ``(language, source)`` pairs to measure.
+        workers: The number of worker threads. Defaults to the number of CPUs, capped at 32.
+        ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+        max_in_flight: The maximum number of sources read from ``items`` but not yet yielded, which bounds memory
+            use. Defaults to ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of same-language sources handed to a worker at once.
+
+    Raises:
+        ValueError: If workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        StatsResult: The result of each source.
+    """
+    yield from _map_chunks(
+        items,
+        _measure_chunk,
+        workers=workers,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+        chunk_size=chunk_size,
+        thread_name_prefix="tree-sitter-stats",
+    )
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple, cast
+
+from tree_sitter import Point, QueryCursor
+
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.batch import _map_chunks, _WorkerParsers
+from tree_sitter_language_pack.pool import get_pooled_parser
+from tree_sitter_language_pack.queries import available_queries, get_query
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from tree_sitter import Node, Parser, Query, Tree
+
+    from tree_sitter_language_pack._core import SupportedLanguage
+
+TAGS_QUERY_NAME = "tags"
+_TAG_KIND_PREFIXES = ("definition.", "reference.")
+_NEWLINE_RE = re.compile(b"\n")
+
+
+class Tag(NamedTuple):
+    """A single tag, materialized from a `Tags` result."""
+
+    kind: str
+    """The kind of the tag, e.g. ``definition.function`` or ``reference.call``."""
+    name: str
+    """The name of the defined or referenced symbol."""
+    start_byte: int
+    """The start byte offset of the definition or reference."""
+    end_byte: int
+    """The end byte offset of the definition or reference."""
+    name_start_byte: int
+    """The start byte offset of the name."""
+    name_end_byte: int
+    """The end byte offset of the name."""
+    name_start_point: Point
+    """The start line and byte column of the name."""
+    name_end_point: Point
+    """The end line and byte column of the name."""
+
+    @property
+    def is_definition(self) -> bool:
+        """Whether the tag is a definition rather than a reference."""
+        return self.kind.startswith("definition.")
+
+
+@dataclass(frozen=True, slots=True)
+class Tags:
+    """The tags of a source in parallel arrays, one entry per tag in match order.
+
+    Tags are stored column-wise instead of as one Python object per tag, so the tags of a large repository stay
+    compact and can be pickled, e.g. to return them from a worker process. Index the result or iterate over it to
+    materialize `Tag` tuples.
+    """
+
+    language: SupportedLanguage
+    """The language of the source."""
+    kinds: tuple[str, ...]
+    """The tag kinds that ``kind_ids`` index into, e.g. ``definition.function``."""
+    kind_ids: array[int]
+    """The index of the kind of each tag in ``kinds``."""
+    names: list[str]
+    """The name of each tag."""
+    start_bytes: array[int]
+    """The start byte offset of the definition or reference of each tag."""
+    end_bytes: array[int]
+    """The end byte offset of the definition or reference of each tag."""
+    name_start_bytes: array[int]
+    """The start byte offset of the name of each tag."""
+    name_end_bytes: array[int]
+    """The end byte offset of the name of each tag."""
+    name_start_rows: array[int]
+    """The line of the start of the name of each tag."""
+    name_start_columns: array[int]
+    """The byte column of the start of the name of each tag."""
+    name_end_rows: array[int]
+    """The line of the end of the name of each tag."""
+    name_end_columns: array[int]
+    """The byte column of the end of the name of each tag."""
+
+    def __len__(self) -> int:
+        """Get the number of tags.
+
+        Returns:
+            int: The number of tags.
+        """
+        return len(self.kind_ids)
+
+    def __getitem__(self, index: int) -> Tag:
+        """Materialize a single tag.
+
+        Args:
+            index: The index of the tag.
+
+        Returns:
+            Tag: The tag.
+        """
+        return Tag(
+            kind=self.kinds[self.kind_ids[index]],
+            name=self.names[index],
+            start_byte=self.start_bytes[index],
+            end_byte=self.end_bytes[index],
+            name_start_byte=self.name_start_bytes[index],
+            name_end_byte=self.name_end_bytes[index],
+            name_start_point=Point(self.name_start_rows[index], self.name_start_columns[index]),
+            name_end_point=Point(self.name_end_rows[index], self.name_end_columns[index]),
+        )
+
+    def __iter__(self) -> Iterator[Tag]:
+        """Materialize the tags one at a time.
+
+        Yields:
+            Tag: The tags in order.
+        """
+        for index in range(len(self)):
+            yield self[index]
+
+
+@dataclass(frozen=True, slots=True)
+class TagsResult:
+    """The outcome of extracting the tags of a single source in a batch."""
+
+    index: int
+    """The position of the source in the input iterable."""
+    language: SupportedLanguage
+    """The language the source was parsed with."""
+    tags: Tags | None = None
+    """The extracted tags, or None if parsing or extraction failed."""
+    error: Exception | None = None
+    """The exception raised while extracting the tags, or None if extraction succeeded."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the tags were extracted successfully."""
+        return self.error is None
+
+
+def has_tags(language_name: SupportedLanguage) -> bool:
+    """Check whether the grammar of a language bundles a tags query.
+
+    Args:
+        language_name: The name of the language.
+
+    Returns:
+        bool: Whether `extract_tags` supports the language.
+    """
+    return TAGS_QUERY_NAME in available_queries(language_name)
+
+
+def extract_tags(
+    language_name: SupportedLanguage, source: bytes, *, tree: Tree | None = None, parser: Parser | None = None
+) -> Tags:
+    """Extract the definitions and references in a source with the tags query bundled with its grammar.
+
+    Matches of the query without a ``definition.*`` or ``reference.*`` capture, such as documentation-only patterns,
+    are skipped, as are duplicate matches of the same kind and name. Documentation comments (``@doc``) are not
+    extracted.
+
+    Args:
+        language_name: The name of the language.
+        source: The source to extract the tags of.
+        tree: The tree of the source, if it was already parsed.
+        parser: The parser to parse the source with. Defaults to a parser checked out from the process-wide parser
+            pool. Ignored if a tree is given.
+
+    Raises:
+        LookupError: If the grammar of the language does not bundle a tags query.
+
+    Returns:
+        Tags: The tags of the source.
+    """
+    query = get_query(language_name, TAGS_QUERY_NAME)
+    if tree is None:
+        if parser is None:
+            with get_pooled_parser(language_name) as pooled_parser:
+                tree = instrumented_parse(pooled_parser, language_name, source)
+        else:
+            tree = instrumented_parse(parser, language_name, source)
+    return _collect_tags(language_name, query, source, tree.root_node)
+
+
+def _collect_tags(language_name: SupportedLanguage, query: Query, source: bytes, root_node: Node) -> Tags:
+    # The type stubs of py-tree-sitter declare capture_count as a method, but it is a property
+    capture_count = cast("int", query.capture_count)
+    kinds = tuple(
+        capture_name
+        for capture_name in map(query.capture_name, range(capture_count))
+        if capture_name.startswith(_TAG_KIND_PREFIXES)
+    )
+    kind_ids_by_name = {kind: kind_id for kind_id, kind in enumerate(kinds)}
+
+    kind_ids: array[int] = array("B")
+    names: list[str] = []
+    start_bytes: array[int] = array("I")
+    end_bytes: array[int] = array("I")
+    name_start_bytes: array[int] = array("I")
+    name_end_bytes: array[int] = array("I")
+    seen: set[tuple[int, int, int]] = set()
+
+    for _, captures in QueryCursor(query).matches(root_node):
+        name_nodes = captures.get("name")
+        if not name_nodes:
+            continue
+        for capture_name, nodes in captures.items():
+            kind_id = kind_ids_by_name.get(capture_name)
+            if kind_id is None:
+                continue
+
+            node = nodes[0]
+            name_node = name_nodes[0]
+            name_start_byte = name_node.start_byte
+            start_byte = node.start_byte
+            key = (kind_id, name_start_byte, start_byte)
+            if key not in seen:
+                seen.add(key)
+                name_end_byte = name_node.end_byte
+                kind_ids.append(kind_id)
+                names.append(source[name_start_byte:name_end_byte].decode("utf-8", "replace"))
+                start_bytes.append(start_byte)
+                end_bytes.append(node.end_byte)
+                name_start_bytes.append(name_start_byte)
+                name_end_bytes.append(name_end_byte)
+            break
+
+    # Deriving points from a line index is several times faster than creating a Point per node
+    line_starts = [0]
+    if kind_ids:
+        line_starts.extend(match.end() for match in _NEWLINE_RE.finditer(source))
+    name_start_rows, name_start_columns = _to_rows_and_columns(name_start_bytes, line_starts)
+    name_end_rows, name_end_columns = _to_rows_and_columns(name_end_bytes, line_starts)
+
+    return Tags(
+        language=language_name,
+        kinds=kinds,
+        kind_ids=kind_ids,
+        names=names,
+        start_bytes=start_bytes,
+        end_bytes=end_bytes,
+        name_start_bytes=name_start_bytes,
+        name_end_bytes=name_end_bytes,
+        name_start_rows=name_start_rows,
+        name_start_columns=name_start_columns,
+        name_end_rows=name_end_rows,
+        name_end_columns=name_end_columns,
+    )
+
+
+def _to_rows_and_columns(offsets: array[int], line_starts: list[int]) -> tuple[array[int], array[int]]:
+    rows: array[int] = array("I")
+    columns: array[int] = array("I")
+    for offset in offsets:
+        row = bisect_right(line_starts, offset) - 1
+        rows.append(row)
+        columns.append(offset - line_starts[row])
+    return rows, columns
+
+
+def _extract_chunk(
+    worker_parsers: _WorkerParsers, language_name: SupportedLanguage, chunk: list[tuple[int, bytes]]
+) -> list[TagsResult]:
+    try:
+        parser = worker_parsers.get(language_name)
+        query = get_query(language_name, TAGS_QUERY_NAME)
+    except Exception as e:  # noqa: BLE001
+        return [TagsResult(index=index, language=language_name, error=e) for index, _ in chunk]
+
+    results: list[TagsResult] = []
+    for index, source in chunk:
+        try:
+            tree = instrumented_parse(parser, language_name, source)
+            tags = _collect_tags(language_name, query, source, tree.root_node)
+        except Exception as e:  # noqa: BLE001, PERF203
+            results.append(TagsResult(index=index, language=language_name, error=e))
+        else:
+            results.append(TagsResult(index=index, language=language_name, tags=tags))
+    return results
+
+
+def extract_tags_many(
+    items: Iterable[tuple[SupportedLanguage, bytes]],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    max_in_flight: int | None = None,
+    chunk_size: int = 16,
+) -> Iterator[TagsResult]:
+    """Extract the tags of many sources concurrently on a thread pool.
+
+    Sources are batched like in `parse_many`: they are read lazily into a bounded window, grouped by language into
+    chunks and handled by worker threads that each keep one reusable parser per language. Trees are dropped as soon
+    as their tags are extracted. Failures, including languages without a tags query, are reported as results with an
+    ``error`` instead of being raised.
+
+    Args:
+        items: The ``(language, source)`` pairs to extract the tags of.
+        workers: The number of worker threads. Defaults to the number of CPUs, capped at 32.
+        ordered: Whether to yield results in input order. If False, results are yielded as soon as they complete.
+        max_in_flight: The maximum number of sources read from ``items`` but not yet yielded, which bounds memory
+            use. Defaults to ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of same-language sources handed to a worker at once.
+
+    Raises:
+        ValueError: If workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        TagsResult: The result of each source.
+    """
+    yield from _map_chunks(
+        items,
+        _extract_chunk,
+        workers=workers,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+        chunk_size=chunk_size,
+        thread_name_prefix="tree-sitter-tags",
+    )
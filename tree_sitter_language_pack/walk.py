@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import os
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple
+
+from tree_sitter_language_pack._core import SupportedLanguage, available_languages
+from tree_sitter_language_pack._instrumentation import instrumented_parse
+from tree_sitter_language_pack.batch import _iter_windowed, _WorkerParsers
+from tree_sitter_language_pack.detection import DETECTION_READ_SIZE, detect_language
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from tree_sitter import Tree
+
+DEFAULT_EXCLUDE = (".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", ".tox")
+"""The file and directory names `parse_tree` skips by default."""
+
+_BINARY_CHECK_SIZE = 8000
+
+
+class ParsedFile(NamedTuple):
+    """A file parsed by `parse_tree`."""
+
+    path: str
+    """The path of the file."""
+    language: SupportedLanguage
+    """The detected language of the file."""
+    tree: Tree
+    """The parsed tree."""
+
+
+@dataclass(slots=True)
+class TreeParseStats:
+    """Counters of a `parse_tree` run, updated while its results are consumed."""
+
+    files_parsed: int = 0
+    """The number of files parsed successfully."""
+    bytes_parsed: int = 0
+    """The total size of the files parsed successfully."""
+    skipped: Counter[str] = field(default_factory=Counter)
+    """The number of skipped entries by reason: ``excluded`` (files and directories), ``undetected``,
+    ``unavailable``, ``oversized`` or ``binary``."""
+    errors: dict[str, Exception] = field(default_factory=dict)
+    """The exceptions raised while reading or parsing files, by path."""
+    language_seconds: dict[SupportedLanguage, float] = field(default_factory=dict)
+    """The time spent reading and parsing files in worker threads, by language."""
+    started: float | None = None
+    """The ``time.perf_counter`` value at which the run started."""
+    finished: float | None = None
+    """The ``time.perf_counter`` value at which the run finished."""
+
+    @property
+    def elapsed(self) -> float:
+        """The number of seconds the run took so far."""
+        if self.started is None:
+            return 0.0
+        return (self.finished if self.finished is not None else perf_counter()) - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        """The number of files parsed per second."""
+        return self.files_parsed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """The number of bytes parsed per second."""
+        return self.bytes_parsed / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class _FileOutcome:
+    index: int
+    path: str
+    language: SupportedLanguage
+    tree: Tree | None = None
+    size: int = 0
+    seconds: float = 0.0
+    skipped: str | None = None
+    error: Exception | None = None
+
+
+def _matches(patterns: tuple[str, ...], relative_path: str, name: str) -> bool:
+    return any(fnmatch(relative_path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def _read_head(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as file:  # noqa: PTH123
+            return file.read(DETECTION_READ_SIZE)
+    except OSError:
+        return None
+
+
+def _walk(  # noqa: C901, PLR0913
+    root: str,
+    *,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    max_file_size: int,
+    languages: frozenset[SupportedLanguage],
+    stats: TreeParseStats,
+) -> Iterator[tuple[SupportedLanguage, str]]:
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        try:
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError as e:
+            stats.errors[directory] = e
+            continue
+
+        subdirectories: list[str] = []
+        for entry in entries:
+            relative_path = os.path.relpath(entry.path, root).replace(os.sep, "/")
+            if _matches(exclude, relative_path, entry.name):
+                stats.skipped["excluded"] += 1
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+                continue
+            if not entry.is_file(follow_symlinks=False) or (include and not _matches(include, relative_path, "")):
+                continue
+
+            language_name = detect_language(entry.name)
+            if language_name is None and "." not in entry.name:
+                # Only extensionless files, such as scripts, are worth reading for a shebang or modeline
+                language_name = detect_language(entry.name, _read_head(entry.path))
+            if language_name is None:
+                stats.skipped["undetected"] += 1
+            elif language_name not in languages:
+                stats.skipped["unavailable"] += 1
+            elif entry.stat(follow_symlinks=False).st_size > max_file_size:
+                stats.skipped["oversized"] += 1
+            else:
+                yield language_name, entry.path
+
+        # Visit the files of a directory before its subdirectories, each in name order
+        directories.extend(reversed(subdirectories))
+
+
+def _parse_file_chunk(
+    worker_parsers: _WorkerParsers, language_name: SupportedLanguage, chunk: list[tuple[int, str]], max_file_size: int
+) -> list[_FileOutcome]:
+    results: list[_FileOutcome] = []
+    for index, path in chunk:
+        start = perf_counter()
+        try:
+            with open(path, "rb") as file:  # noqa: PTH123
+                # The size was checked while walking, but the file may have grown since
+                source = file.read(max_file_size + 1)
+            if len(source) > max_file_size:
+                results.append(_FileOutcome(index=index, path=path, language=language_name, skipped="oversized"))
+            elif b"\0" in source[:_BINARY_CHECK_SIZE]:
+                results.append(_FileOutcome(index=index, path=path, language=language_name, skipped="binary"))
+            else:
+                tree = instrumented_parse(worker_parsers.get(language_name), language_name, source)
+                results.append(
+                    _FileOutcome(
+                        index=index,
+                        path=path,
+                        language=language_name,
+                        tree=tree,
+                        size=len(source),
+                        seconds=perf_counter() - start,
+                    )
+                )
+        except Exception as e:  # noqa: BLE001
+            results.append(_FileOutcome(index=index, path=path, language=language_name, error=e))
+    return results
+
+
+def parse_tree(  # noqa: PLR0913
+    root: str | os.PathLike[str],
+    *,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = DEFAULT_EXCLUDE,
+    workers: int | None = None,
+    max_file_size: int = 1024 * 1024,
+    max_in_flight: int | None = None,
+    chunk_size: int = 16,
+    ordered: bool = False,
+    stats: TreeParseStats | None = None,
+) -> Iterator[ParsedFile]:
+    """Walk a directory tree and parse every file of a detected language concurrently.
+
+    The tree is walked lazily with ``os.scandir``, and the language of each file is detected with `detect_language`.
+    Worker threads read and parse the files, each reusing one parser per language. At most ``max_in_flight`` files
+    are read ahead of the consumer, so memory use stays bounded however large the tree is.
+
+    Files are skipped if they match ``exclude``, do not match ``include``, have no detectable language, use a
+    language that is not available in this build, are larger than ``max_file_size`` or contain NUL bytes. Skipped
+    files and errors are counted in ``stats`` instead of being raised.
+
+    Example:
+        ```python
+        stats = TreeParseStats()
+        for path, language, tree in parse_tree("src", include=["*.py", "*.js"], workers=8, stats=stats):
+            ...
+        print(stats.files_per_second, stats.bytes_per_second, stats.skipped)
+        ```
+
+    Args:
+        root: The directory to walk.
+        include: Glob patterns matched against the paths relative to ``root``, using ``/`` as the separator. If
+            given, only matching files are parsed.
+        exclude: Glob patterns matched against the relative paths and the names of files and directories to skip.
+        workers: The number of worker threads. Defaults to the number of CPUs, capped at 32.
+        max_file_size: The size in bytes above which files are skipped.
+        max_in_flight: The maximum number of files found but not yet yielded. Defaults to ``workers * chunk_size * 2``.
+        chunk_size: The maximum number of same-language files handed to a worker at once.
+        ordered: Whether to yield files in walk order. If False, files are yielded as soon as they are parsed.
+        stats: Counters to update while the results are consumed.
+
+    Raises:
+        ValueError: If workers, max_in_flight or chunk_size are not positive.
+
+    Yields:
+        ParsedFile: The path, language and tree of each parsed file.
+    """
+    if workers is None:
+        workers = min(32, os.cpu_count() or 1)
+    if max_in_flight is None:
+        max_in_flight = workers * chunk_size * 2
+    if workers < 1 or max_in_flight < 1 or chunk_size < 1:
+        raise ValueError("workers, max_in_flight and chunk_size must be positive integers")
+
+    if stats is None:
+        stats = TreeParseStats()
+    stats.started = perf_counter()
+
+    files = _walk(
+        os.fspath(root),
+        include=tuple(include),
+        exclude=tuple(exclude),
+        max_file_size=max_file_size,
+        languages=frozenset(available_languages()),
+        stats=stats,
+    )
+    worker_parsers = _WorkerParsers()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tree-sitter-walk")
+
+    def submit_chunk(language_name: SupportedLanguage, chunk: list[tuple[int, str]]) -> Future[list[_FileOutcome]]:
+        return executor.submit(_parse_file_chunk, worker_parsers, language_name, chunk, max_file_size)
+
+    try:
+        for outcome in _iter_windowed(
+            files, submit_chunk, ordered=ordered, max_in_flight=max_in_flight, chunk_size=chunk_size
+        ):
+            if outcome.error is not None:
+                stats.errors[outcome.path] = outcome.error
+            elif outcome.skipped is not None:
+                stats.skipped[outcome.skipped] += 1
+            elif outcome.tree is not None:
+                stats.files_parsed += 1
+                stats.bytes_parsed += outcome.size
+                stats.language_seconds[outcome.language] = (
+                    stats.language_seconds.get(outcome.language, 0.0) + outcome.seconds
+                )
+                yield ParsedFile(outcome.path, outcome.language, outcome.tree)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        stats.finished = perf_counter()